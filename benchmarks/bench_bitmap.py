@@ -0,0 +1,76 @@
+"""
+file: benchmarks/bench_bitmap.py
+
+Throughput benchmark for the bitmap commands.
+
+Builds a random bitmap of N bits (10^8 by default, a 12.5 MB string) and times
+BITCOUNT, BITPOS, BITOP and SETBIT through the command classes, next to a per-bit
+Python loop over a small slice, extrapolated to the full bitmap, for reference.
+
+Usage:
+    python -m benchmarks.bench_bitmap [N]
+
+Created by Gizachew Bayness Kassa on 2025-04-30
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from src.commands.bitmap_commands import (
+    BitCountCommand,
+    BitOpCommand,
+    BitPosCommand,
+    SetBitCommand,
+)
+from src.data.storage import Storage
+
+
+async def timed(label: str, command, storage: Storage, *args, rounds: int = 10):
+    """Run a command several times and print its average latency."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = await command.execute(storage, *args)
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"{label:<32} {elapsed * 1000:>10.2f} ms   -> {result}")
+
+
+async def main():
+    total_bits = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10**8
+    size = total_bits // 8
+    storage = Storage()
+    storage.set("a", bytearray(os.urandom(size)))
+    storage.set("b", bytearray(os.urandom(size)))
+    storage.set("ones", bytearray(b"\xff" * size))
+    print(f"bitmap size: {total_bits} bits ({size / 1e6:.1f} MB)")
+
+    await timed("BITCOUNT a", BitCountCommand(), storage, "a")
+    await timed(
+        "BITCOUNT a 1000 -1000", BitCountCommand(), storage, "a", "1000", "-1000"
+    )
+    await timed(
+        "BITPOS ones 0 (scans everything)", BitPosCommand(), storage, "ones", "0"
+    )
+    await timed("BITOP AND dest a b", BitOpCommand(), storage, "AND", "dest", "a", "b")
+    await timed("BITOP XOR dest a b", BitOpCommand(), storage, "XOR", "dest", "a", "b")
+    await timed("BITOP NOT dest a", BitOpCommand(), storage, "NOT", "dest", "a")
+
+    rounds = 100000
+    command = SetBitCommand()
+    start = time.perf_counter()
+    for offset in range(0, total_bits, max(total_bits // rounds, 1)):
+        await command.execute(storage, "a", str(offset), "1")
+    elapsed = time.perf_counter() - start
+    print(f"{'SETBIT':<32} {rounds / elapsed:>10.0f} ops/s")
+
+    # Reference: counting bit by bit in Python
+    sample = storage.lookup("a")[: size // 100]
+    start = time.perf_counter()
+    sum((byte >> shift) & 1 for byte in sample for shift in range(8))
+    elapsed = (time.perf_counter() - start) * 100
+    print(f"{'per-bit loop (extrapolated)':<32} {elapsed * 1000:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
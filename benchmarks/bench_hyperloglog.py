@@ -0,0 +1,70 @@
+"""
+file: benchmarks/bench_hyperloglog.py
+
+Accuracy and throughput benchmark for the HyperLogLog value type.
+
+Adds N distinct elements (10^8 by default) in PFADD-sized batches and reports, at
+every power of ten, the insert throughput and the error of the estimate against the
+true count. Also times PFCOUNT with and without the cached cardinality, and the
+register merge used by PFMERGE and multi-key PFCOUNT.
+
+Usage:
+    python -m benchmarks.bench_hyperloglog [N] [BATCH]
+
+Created by Gizachew Bayness Kassa on 2025-04-28
+"""
+
+import sys
+import time
+
+from src.data.hyperloglog import HyperLogLog
+
+
+def main():
+    total = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10**8
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    hll = HyperLogLog()
+    checkpoint = 10
+    added = 0
+    start = time.perf_counter()
+    print(
+        f"{'elements':>12} {'estimate':>12} {'error':>8} {'adds/s':>12} {'encoding':>8}"
+    )
+    while added < total:
+        size = min(batch, total - added, checkpoint - added)
+        hll.add(*[str(i) for i in range(added, added + size)])
+        added += size
+        if added == checkpoint or added == total:
+            elapsed = time.perf_counter() - start
+            estimate = hll.count()
+            error = (estimate - added) / added
+            encoding = "sparse" if hll.sparse else "dense"
+            print(
+                f"{added:>12} {estimate:>12} {error:>+8.2%} "
+                f"{added / elapsed:>12.0f} {encoding:>8}"
+            )
+            checkpoint *= 10
+
+    # PFCOUNT after a change recomputes the estimate, otherwise it is cached
+    hll._cached_cardinality = None
+    start = time.perf_counter()
+    hll.count()
+    uncached = time.perf_counter() - start
+    start = time.perf_counter()
+    hll.count()
+    cached = time.perf_counter() - start
+    print(f"PFCOUNT: {uncached * 1e6:.1f} us uncached, {cached * 1e6:.2f} us cached")
+
+    other = HyperLogLog()
+    other.add(*[f"other:{i}" for i in range(100000)])
+    rounds = 100
+    start = time.perf_counter()
+    for _ in range(rounds):
+        HyperLogLog.union([hll, other])
+    merge = (time.perf_counter() - start) / rounds
+    print(f"PFMERGE of two dense HyperLogLogs: {merge * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+file: benchmarks/bench_stream.py
+
+Throughput and memory benchmark for the Stream value type.
+
+Appends N entries (10^7 by default) of two fields each to a Stream and to a plain
+list of {"id": ..., "fields": {...}} dicts, then times random COUNT 100 range seeks
+(a binary search over the entry IDs for the list) and trimming 1% of the entries from
+the head at a time. The memory column excludes the field value strings, which both
+layouts share.
+
+Usage:
+    python -m benchmarks.bench_stream [N]
+
+Created by Gizachew Bayness Kassa on 2025-05-04
+"""
+
+import random
+import sys
+import time
+from bisect import bisect_left
+
+from src.data.stream import MAX_ID, Stream, next_id
+
+SEEKS = 10000
+SEEK_COUNT = 100
+TRIM_STEPS = 10
+
+
+def report(label: str, operations: int, elapsed: float, memory: int = None):
+    """Print the throughput of a phase, and optionally the memory it retains."""
+    line = f"{label:<28} {operations / elapsed:>12.0f} ops/s"
+    if memory is not None:
+        line += f" {memory / 1e6:>10.1f} MB"
+    print(line)
+
+
+def stream_memory(stream: Stream) -> int:
+    """Approximate size of a stream's own structures."""
+    size = sys.getsizeof(stream.chunks) + sys.getsizeof(stream.first_ids)
+    for chunk, first_id in zip(stream.chunks, stream.first_ids):
+        size += sys.getsizeof(chunk) + sys.getsizeof(first_id)
+        size += sys.getsizeof(chunk.ms_deltas) + sys.getsizeof(chunk.seq_deltas)
+        size += sys.getsizeof(chunk.field_names) + sys.getsizeof(chunk.values)
+        size += sum(sys.getsizeof(values) for values in chunk.values)
+    return size
+
+
+def list_memory(entries: list) -> int:
+    """Approximate size of a list of dicts, ints included."""
+    size = sys.getsizeof(entries)
+    for entry in entries:
+        ms, seq = entry["id"]
+        size += sys.getsizeof(entry) + sys.getsizeof(entry["id"])
+        size += sys.getsizeof(ms) + sys.getsizeof(seq) + sys.getsizeof(entry["fields"])
+    return size
+
+
+def bench_stream(total: int, seeks: list):
+    stream = Stream()
+    start = time.perf_counter()
+    for i in range(total):
+        stream.add(["sensor", str(i % 1000), "value", str(i)])
+    report("Stream append", total, time.perf_counter() - start, stream_memory(stream))
+
+    ids = [entry_id for entry_id in stream.iter_ids()]
+    start = time.perf_counter()
+    for position in seeks:
+        stream.range(ids[position], MAX_ID, SEEK_COUNT)
+    report(f"Stream range COUNT {SEEK_COUNT}", len(seeks), time.perf_counter() - start)
+
+    step = total // 100
+    start = time.perf_counter()
+    for round_ in range(1, TRIM_STEPS + 1):
+        stream.trim_maxlen(total - step * round_, approximate=True)
+    report("Stream trim ~1%", TRIM_STEPS, time.perf_counter() - start)
+
+
+def bench_list(total: int, seeks: list):
+    entries = []
+    last_id = (0, 0)
+    start = time.perf_counter()
+    for i in range(total):
+        # Same ID generation as XADD *
+        now = int(time.time() * 1000)
+        last_id = (now, 0) if now > last_id[0] else next_id(last_id)
+        entries.append(
+            {"id": last_id, "fields": {"sensor": str(i % 1000), "value": str(i)}}
+        )
+    report("list append", total, time.perf_counter() - start, list_memory(entries))
+
+    ids = [entry["id"] for entry in entries]
+    start = time.perf_counter()
+    for position in seeks:
+        first = bisect_left(entries, ids[position], key=lambda entry: entry["id"])
+        [
+            (entry["id"], [item for pair in entry["fields"].items() for item in pair])
+            for entry in entries[first : first + SEEK_COUNT]
+        ]
+    report(f"list range COUNT {SEEK_COUNT}", len(seeks), time.perf_counter() - start)
+
+    step = total // 100
+    start = time.perf_counter()
+    for _ in range(TRIM_STEPS):
+        del entries[:step]
+    report("list trim 1%", TRIM_STEPS, time.perf_counter() - start)
+
+
+def main():
+    total = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10**7
+    seeks = [random.randrange(total) for _ in range(SEEKS)]
+    print(f"entries: {total}")
+    bench_stream(total, seeks)
+    bench_list(total, seeks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+"""
+file: bitmap_commands.py
+
+This module implements the bitmap commands for the Redis clone server. Bitmaps are
+string values; the ones written through these commands are stored as bytearray.
+
+Commands:
+- SETBIT key offset value - Sets or clears the bit at offset.
+- GETBIT key offset - Returns the bit at offset.
+- BITCOUNT key [start end [BYTE|BIT]] - Counts the set bits.
+- BITPOS key bit [start [end [BYTE|BIT]]] - Returns the first bit set or clear.
+- BITOP AND|OR|XOR|NOT destkey key [key ...] - Combines strings bit by bit.
+- BITFIELD key [GET type offset] [SET type offset value] [INCRBY type offset increment]
+  [OVERFLOW WRAP|SAT|FAIL] - Reads and writes integers of arbitrary width.
+
+Created By: Gizachew Bayness Kassa on 2025-04-30
+"""
+
+from typing import List
+
+from src.data import bitmap
+from src.data.storage import Storage
+
+from .base_command import BaseCommand
+from .reply import format_array
+
+WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+ERR_NOT_INTEGER = "ERR value is not an integer or out of range"
+ERR_BIT_OFFSET = "ERR bit offset is not an integer or out of range"
+ERR_BITFIELD_TYPE = (
+    "ERR Invalid bitfield type. Use something like i16 u8. "
+    "Note that u64 is not supported but i64 is."
+)
+
+
+def lookup_string(storage: Storage, key: str):
+    """
+    Look up a string value as bytes, or None if the key does not exist.
+
+    Raises:
+        TypeError: If the key holds a value that is not a string.
+    """
+    value = storage.lookup(key)
+    if value is None:
+        return None
+    if not isinstance(value, (str, bytes, bytearray)):
+        raise TypeError(WRONGTYPE)
+    return bitmap.as_bytes(value)
+
+
+def lookup_bitmap_for_write(storage: Storage, key: str, length: int):
+    """
+    Look up a string value as a bytearray of at least length bytes, creating it or
+    converting it to the mutable encoding when needed.
+
+    Returns:
+        (buffer, stored) where stored tells whether the buffer was newly stored, in
+        which case client tracking has already been notified.
+    Raises:
+        TypeError: If the key holds a value that is not a string.
+    """
+    value = storage.lookup(key)
+    if value is None:
+        buffer = bytearray(length)
+        storage.set(key, buffer)
+        return buffer, True
+    if isinstance(value, bytearray):
+        buffer = value
+    elif isinstance(value, (str, bytes)):
+        buffer = bytearray(bitmap.as_bytes(value))
+    else:
+        raise TypeError(WRONGTYPE)
+    buffer = bitmap.ensure_length(buffer, length)
+    if buffer is not value:
+        storage.update(key, buffer)
+        return buffer, True
+    return buffer, False
+
+
+def parse_bit_offset(offset_str: str) -> int:
+    """Parse a bit offset, raising ValueError with the error reply if invalid."""
+    try:
+        offset = int(offset_str)
+    except ValueError:
+        raise ValueError(ERR_BIT_OFFSET)
+    if offset < 0 or offset > bitmap.MAX_BIT_OFFSET:
+        raise ValueError(ERR_BIT_OFFSET)
+    return offset
+
+
+def parse_range(args, length: int):
+    """
+    Parse the optional "start end [BYTE|BIT]" arguments of BITCOUNT and BITPOS.
+
+    Returns:
+        (first_bit, last_bit) of the range, or None if it is empty.
+    Raises:
+        ValueError: With the error reply if the arguments are invalid.
+    """
+    try:
+        start = int(args[0])
+        end = int(args[1]) if len(args) > 1 else -1
+    except ValueError:
+        raise ValueError(ERR_NOT_INTEGER)
+    unit = args[2].upper() if len(args) > 2 else "BYTE"
+    if unit not in ("BYTE", "BIT"):
+        raise ValueError("ERR syntax error")
+
+    if unit == "BIT":
+        bits = bitmap.normalize_range(start, end, 8 * length)
+        return (bits.start, bits.stop - 1) if bits else None
+    byte_range = bitmap.normalize_range(start, end, length)
+    return (8 * byte_range.start, 8 * byte_range.stop - 1) if byte_range else None
+
+
+class SetBitCommand(BaseCommand):
+    """
+    SetBitCommand - A command class for the SETBIT command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the SETBIT command with the given arguments.
+
+        Usage:
+            SETBIT key offset value
+        Returns:
+            The previous value of the bit.
+        """
+        if len(args) != 3:
+            return "ERR wrong number of arguments for 'SETBIT' command"
+        key, offset_str, bit_str = args
+        try:
+            offset = parse_bit_offset(offset_str)
+        except ValueError as e:
+            return str(e)
+        if bit_str not in ("0", "1"):
+            return "ERR bit is not an integer or out of range"
+
+        try:
+            buffer, stored = lookup_bitmap_for_write(storage, key, (offset >> 3) + 1)
+        except TypeError as e:
+            return str(e)
+        old_bit = bitmap.setbit(buffer, offset, int(bit_str))
+        if not stored:
+            storage.signal_modified(key)  # The value was changed in place
+        return str(old_bit)
+
+
+class GetBitCommand(BaseCommand):
+    """
+    GetBitCommand - A command class for the GETBIT command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the GETBIT command with the given arguments.
+
+        Usage:
+            GETBIT key offset
+        """
+        if len(args) != 2:
+            return "ERR wrong number of arguments for 'GETBIT' command"
+        key, offset_str = args
+        try:
+            offset = parse_bit_offset(offset_str)
+            data = lookup_string(storage, key)
+        except (TypeError, ValueError) as e:
+            return str(e)
+        return str(bitmap.getbit(data or b"", offset))
+
+
+class BitCountCommand(BaseCommand):
+    """
+    BitCountCommand - A command class for the BITCOUNT command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the BITCOUNT command with the given arguments.
+
+        Usage:
+            BITCOUNT key [start end [BYTE|BIT]]
+        """
+        if len(args) < 1:
+            return "ERR wrong number of arguments for 'BITCOUNT' command"
+        if len(args) not in (1, 3, 4):
+            return "ERR syntax error"
+        try:
+            data = lookup_string(storage, args[0])
+            if not data:
+                return "0"
+            if len(args) == 1:
+                return str(bitmap.bitcount(data))
+            bits = parse_range(args[1:], len(data))
+        except (TypeError, ValueError) as e:
+            return str(e)
+        return str(bitmap.bitcount(data, *bits)) if bits else "0"
+
+
+class BitPosCommand(BaseCommand):
+    """
+    BitPosCommand - A command class for the BITPOS command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the BITPOS command with the given arguments.
+
+        Usage:
+            BITPOS key bit [start [end [BYTE|BIT]]]
+        Returns:
+            The offset of the first matching bit, or -1 if there is none. When looking
+            for a clear bit without an end, the bit right after the string is returned
+            since strings are zero-padded on the right.
+        """
+        if len(args) < 2 or len(args) > 5:
+            return "ERR wrong number of arguments for 'BITPOS' command"
+        if args[1] not in ("0", "1"):
+            return "ERR The bit argument must be 1 or 0."
+        bit = int(args[1])
+        try:
+            data = lookup_string(storage, args[0])
+            if not data:
+                return -1 if bit else 0
+            bits = parse_range(args[2:] or ["0"], len(data))
+        except (TypeError, ValueError) as e:
+            return str(e)
+        if bits is None:
+            return -1
+
+        position = bitmap.bitpos(data, bit, *bits)
+        if position == -1 and not bit and len(args) < 4:
+            return bits[1] + 1
+        return position
+
+
+class BitOpCommand(BaseCommand):
+    """
+    BitOpCommand - A command class for the BITOP command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the BITOP command with the given arguments.
+
+        Usage:
+            BITOP AND|OR|XOR|NOT destkey key [key ...]
+        Returns:
+            The length of the string stored at destkey.
+        """
+        if len(args) < 3:
+            return "ERR wrong number of arguments for 'BITOP' command"
+        operation, destkey, keys = args[0].upper(), args[1], args[2:]
+        if operation not in ("AND", "OR", "XOR", "NOT"):
+            return "ERR syntax error"
+        if operation == "NOT" and len(keys) != 1:
+            return "ERR BITOP NOT must be called with a single source key."
+        try:
+            sources = [lookup_string(storage, key) or b"" for key in keys]
+        except TypeError as e:
+            return str(e)
+
+        result = bitmap.bitop(operation, sources)
+        if not result:
+            storage.delete(destkey)
+            return "0"
+        storage.set(destkey, result)
+        return str(len(result))
+
+
+class BitFieldCommand(BaseCommand):
+    """
+    BitFieldCommand - A command class for the BITFIELD command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the BITFIELD command with the given arguments.
+
+        Usage:
+            BITFIELD key [GET type offset] [SET type offset value]
+                [INCRBY type offset increment] [OVERFLOW WRAP|SAT|FAIL] ...
+        Types are i1 to i64 and u1 to u63. An offset prefixed with # is multiplied by
+        the type width. Returns one result per GET, SET or INCRBY, or (nil) when FAIL
+        overflow handling skipped the operation.
+        """
+        if len(args) < 1:
+            return "ERR wrong number of arguments for 'BITFIELD' command"
+        try:
+            operations = self._parse(args[1:])
+        except ValueError as e:
+            return str(e)
+
+        # Only writes create or grow the string
+        write_length = max(
+            (
+                (offset + bits + 7) >> 3
+                for op, _, bits, offset, _, _ in operations
+                if op != "GET"
+            ),
+            default=0,
+        )
+        stored = False
+        try:
+            if write_length:
+                data, stored = lookup_bitmap_for_write(storage, args[0], write_length)
+            else:
+                data = lookup_string(storage, args[0]) or b""
+        except TypeError as e:
+            return str(e)
+
+        results = []
+        for op, signed, bits, offset, argument, overflow in operations:
+            old_value = bitmap.get_field(data, offset, bits, signed)
+            if op == "GET":
+                results.append(old_value)
+                continue
+            new_value = argument if op == "SET" else old_value + argument
+            new_value = bitmap.apply_overflow(new_value, bits, signed, overflow)
+            if new_value is None:
+                results.append(None)
+                continue
+            bitmap.set_field(data, offset, bits, new_value)
+            results.append(old_value if op == "SET" else new_value)
+        if write_length and not stored:
+            storage.signal_modified(args[0])  # The value was changed in place
+        return format_array(results)
+
+    @staticmethod
+    def _parse(args) -> list:
+        """Parse the subcommands into (op, signed, bits, offset, argument, overflow)."""
+        operations = []
+        overflow = "WRAP"
+        position = 0
+        while position < len(args):
+            op = args[position].upper()
+            if op == "OVERFLOW" and position + 1 < len(args):
+                overflow = args[position + 1].upper()
+                if overflow not in ("WRAP", "SAT", "FAIL"):
+                    raise ValueError("ERR Invalid OVERFLOW type specified")
+                position += 2
+                continue
+            arity = {"GET": 3, "SET": 4, "INCRBY": 4}.get(op)
+            if arity is None or position + arity > len(args):
+                raise ValueError("ERR syntax error")
+
+            type_str, offset_str = args[position + 1], args[position + 2]
+            signed = type_str[:1] in ("i", "I")
+            try:
+                bits = int(type_str[1:])
+            except ValueError:
+                raise ValueError(ERR_BITFIELD_TYPE)
+            if type_str[:1] not in ("i", "I", "u", "U") or not (
+                1 <= bits <= (64 if signed else 63)
+            ):
+                raise ValueError(ERR_BITFIELD_TYPE)
+            if offset_str.startswith("#"):
+                offset = parse_bit_offset(offset_str[1:]) * bits
+            else:
+                offset = parse_bit_offset(offset_str)
+            if offset + bits - 1 > bitmap.MAX_BIT_OFFSET:
+                raise ValueError(ERR_BIT_OFFSET)
+
+            argument = None
+            if arity == 4:
+                try:
+                    argument = int(args[position + 3])
+                except ValueError:
+                    raise ValueError(ERR_NOT_INTEGER)
+            operations.append((op, signed, bits, offset, argument, overflow))
+            position += arity
+        return operations
@@ -0,0 +1,103 @@
+"""
+file: client_commands.py
+
+This module implements the CLIENT command for the Redis clone server.
+
+Commands:
+- CLIENT ID - Returns the id of the current connection.
+- CLIENT TRACKING ON|OFF [BCAST] [PREFIX prefix ...] [OPTIN] [OPTOUT] - Enables or
+  disables server assisted client side caching.
+- CLIENT CACHING YES|NO - With OPTIN or OPTOUT, decides whether the keys read by the
+  next command are tracked.
+
+Created By: Gizachew Bayness Kassa on 2025-05-02
+"""
+
+from typing import List
+
+from src.data.storage import Storage
+from src.network.client_handler import ClientSession
+
+from .base_command import BaseCommand
+
+
+class ClientCommand(BaseCommand):
+    """
+    ClientCommand - A command class for the CLIENT command in the Redis clone server.
+    """
+
+    def __init__(self, session: ClientSession):
+        self.session = session
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the CLIENT command with the given subcommand.
+        """
+        if len(args) < 1:
+            return "ERR wrong number of arguments for 'CLIENT' command"
+        subcommand = args[0].upper()
+        if subcommand == "ID" and len(args) == 1:
+            return str(self.session.id)
+        if subcommand == "TRACKING" and len(args) >= 2:
+            return self._tracking(args[1:])
+        if subcommand == "CACHING" and len(args) == 2:
+            return self._caching(args[1])
+        return (
+            f"ERR unknown subcommand or wrong number of arguments for '{args[0]}'. "
+            "Try CLIENT HELP."
+        )
+
+    def _tracking(self, args) -> str:
+        """Handle CLIENT TRACKING ON|OFF [BCAST] [PREFIX prefix ...] [OPTIN] [OPTOUT]."""
+        mode = args[0].upper()
+        if mode == "OFF" and len(args) == 1:
+            self.session.tracking_table.disable(self.session)
+            return "OK"
+        if mode != "ON":
+            return "ERR syntax error"
+
+        bcast = optin = optout = False
+        prefixes = []
+        position = 1
+        while position < len(args):
+            option = args[position].upper()
+            if option == "BCAST":
+                bcast = True
+            elif option == "OPTIN":
+                optin = True
+            elif option == "OPTOUT":
+                optout = True
+            elif option == "PREFIX" and position + 1 < len(args):
+                position += 1
+                prefixes.append(args[position])
+            else:
+                return "ERR syntax error"
+            position += 1
+
+        if prefixes and not bcast:
+            return "ERR PREFIX option requires BCAST mode to be enabled"
+        if optin and optout:
+            return "ERR You can't use both OPTIN and OPTOUT"
+        if bcast and (optin or optout):
+            return "ERR OPTIN and OPTOUT are not compatible with BCAST"
+        self.session.tracking_table.enable(
+            self.session, bcast=bcast, prefixes=prefixes, optin=optin, optout=optout
+        )
+        return "OK"
+
+    def _caching(self, value: str) -> str:
+        """Handle CLIENT CACHING YES|NO."""
+        if not (self.session.tracking_optin or self.session.tracking_optout):
+            return (
+                "ERR CLIENT CACHING can be called only when the client is in tracking "
+                "mode with OPTIN or OPTOUT mode enabled"
+            )
+        value = value.upper()
+        if value not in ("YES", "NO"):
+            return "ERR syntax error"
+        if value == "YES" and not self.session.tracking_optin:
+            return "ERR CLIENT CACHING YES is only valid when tracking is enabled in OPTIN mode."
+        if value == "NO" and not self.session.tracking_optout:
+            return "ERR CLIENT CACHING NO is only valid when tracking is enabled in OPTOUT mode."
+        self.session.caching = value == "YES"
+        return "OK"
@@ -8,46 +8,184 @@ and executes them using the provided storage.
 Created by Gizachew Bayness Kassa on 2025-02-20
 """
 
+from typing import List, Union
+
 from src.data.storage import Storage
+from src.network.client_handler import ClientSession
 
-from .key_value import DeleteCommand, GetCommand, SetCommand
+from .bitmap_commands import (
+    BitCountCommand,
+    BitFieldCommand,
+    BitOpCommand,
+    BitPosCommand,
+    GetBitCommand,
+    SetBitCommand,
+)
+from .client_commands import ClientCommand
+from .database_commands import DbSizeCommand, MoveCommand, SelectCommand, SwapDbCommand
+from .debug_commands import DebugCommand
+from .hyperloglog_commands import PfAddCommand, PfCountCommand, PfMergeCommand
+from .key_value import (
+    DeleteCommand,
+    GetCommand,
+    MGetCommand,
+    SetCommand,
+    UnlinkCommand,
+)
 from .keys_command import KeysCommand
+from .server_commands import (
+    FlushAllCommand,
+    FlushDbCommand,
+    InfoCommand,
+    MemoryCommand,
+)
+from .stream_commands import (
+    XAckCommand,
+    XAddCommand,
+    XGroupCommand,
+    XLenCommand,
+    XPendingCommand,
+    XRangeCommand,
+    XReadCommand,
+    XReadGroupCommand,
+    XTrimCommand,
+)
 from .ttl_commands import ExpireCommand, TTLCommand
 
+# Read-only commands whose keys are remembered for CLIENT TRACKING, mapped to the
+# slice of their arguments that holds the keys
+TRACKED_READ_COMMANDS = {
+    "GET": slice(0, 1),
+    "MGET": slice(0, None),
+    "GETBIT": slice(0, 1),
+    "BITCOUNT": slice(0, 1),
+    "BITPOS": slice(0, 1),
+    "PFCOUNT": slice(0, None),
+    "XLEN": slice(0, 1),
+    "XRANGE": slice(0, 1),
+    "XREVRANGE": slice(0, 1),
+}
+
 
-async def process_command(command: str, storage: Storage) -> str:
+async def process_command(
+    command: Union[str, List[Union[str, bytearray]]],
+    storage: Storage,
+    session: ClientSession = None,
+) -> Union[str, bytearray]:
     """
     Parse the command string and execute the corresponding command.
 
     Args:
-        command (str): The command string received from the client.
+        command (str | list): The command string received from the client, or the
+            already framed command name and arguments of a multibulk request.
         storage: The storage instance to perform data operations.
+        session: The state of the client connection, needed by commands that work
+            across databases. Without it, storage is treated as the only database.
 
     Returns:
-        str: The response from the command execution.
+        str | bytearray: The response from the command execution. Large or binary
+            values are returned as bytes-like objects.
     """
-    parts = command.split(" ")
+    parts = command.split(" ") if isinstance(command, str) else command
     command_name = parts[0].upper()
     args = parts[1:]
+    databases = session.databases if session is not None else [storage]
+    # CLIENT CACHING only applies to the command that follows it
+    caching = None
+    if session is not None:
+        caching, session.caching = session.caching, None
 
     # Dispatch to the appropriate command handler
     if command_name == "SET":
         handler = SetCommand()
     elif command_name == "GET":
         handler = GetCommand()
+    elif command_name == "MGET":
+        handler = MGetCommand()
     elif command_name == "DEL":
         handler = DeleteCommand()
+    elif command_name == "UNLINK":
+        handler = UnlinkCommand()
     elif command_name == "KEYS":
         handler = KeysCommand()
     elif command_name == "EXPIRE":
         handler = ExpireCommand()
     elif command_name == "TTL":
         handler = TTLCommand()
+    elif command_name == "FLUSHALL":
+        handler = FlushAllCommand(databases)
+    elif command_name == "FLUSHDB":
+        handler = FlushDbCommand()
+    elif command_name == "INFO":
+        handler = InfoCommand(databases)
+    elif command_name == "MEMORY":
+        handler = MemoryCommand()
+    elif command_name == "DEBUG":
+        handler = DebugCommand(databases)
+    elif command_name == "SELECT":
+        if session is None:
+            return "ERR SELECT is not allowed without a client connection"
+        handler = SelectCommand(session)
+    elif command_name == "SWAPDB":
+        handler = SwapDbCommand(databases)
+    elif command_name == "MOVE":
+        handler = MoveCommand(databases)
+    elif command_name == "DBSIZE":
+        handler = DbSizeCommand()
+    elif command_name == "CLIENT":
+        if session is None:
+            return "ERR CLIENT is not allowed without a client connection"
+        handler = ClientCommand(session)
+    elif command_name == "PFADD":
+        handler = PfAddCommand()
+    elif command_name == "PFCOUNT":
+        handler = PfCountCommand()
+    elif command_name == "PFMERGE":
+        handler = PfMergeCommand()
+    elif command_name == "SETBIT":
+        handler = SetBitCommand()
+    elif command_name == "GETBIT":
+        handler = GetBitCommand()
+    elif command_name == "BITCOUNT":
+        handler = BitCountCommand()
+    elif command_name == "BITPOS":
+        handler = BitPosCommand()
+    elif command_name == "BITOP":
+        handler = BitOpCommand()
+    elif command_name == "BITFIELD":
+        handler = BitFieldCommand()
+    elif command_name == "XADD":
+        handler = XAddCommand()
+    elif command_name == "XLEN":
+        handler = XLenCommand()
+    elif command_name == "XRANGE":
+        handler = XRangeCommand()
+    elif command_name == "XREVRANGE":
+        handler = XRangeCommand(reverse=True)
+    elif command_name == "XTRIM":
+        handler = XTrimCommand()
+    elif command_name == "XREAD":
+        handler = XReadCommand(session)
+    elif command_name == "XGROUP":
+        handler = XGroupCommand()
+    elif command_name == "XREADGROUP":
+        handler = XReadGroupCommand(session)
+    elif command_name == "XACK":
+        handler = XAckCommand()
+    elif command_name == "XPENDING":
+        handler = XPendingCommand()
     else:
         return "Unknown command"
 
     # If the response integer, then return as redis like (integer) response
     response = await handler.execute(storage, *args)
+    if (
+        session is not None
+        and session.tracking
+        and command_name in TRACKED_READ_COMMANDS
+    ):
+        keys = args[TRACKED_READ_COMMANDS[command_name]]
+        session.tracking_table.remember(session, keys, caching)
     # Check the response type is string to use isdigit() method
     if (isinstance(response, str) and response.isdigit()) or isinstance(response, int):
         return f"(integer) {response}"
@@ -0,0 +1,142 @@
+"""
+file: database_commands.py
+
+This module implements the commands that work with the logical databases of the Redis
+clone server.
+
+Commands:
+- SELECT index - Selects the database used by the current connection.
+- SWAPDB index1 index2 - Swaps two databases.
+- MOVE key db - Moves a key from the current database to another one.
+- DBSIZE - Returns the number of keys in the current database.
+
+Created By: Gizachew Bayness Kassa on 2025-04-26
+"""
+
+from typing import List
+
+from src.data.storage import Storage
+from src.network.client_handler import ClientSession
+
+from .base_command import BaseCommand
+
+
+def parse_db_index(index_str: str, databases: List[Storage]) -> int:
+    """
+    Parse a database index argument.
+
+    Raises:
+        ValueError: With the error reply if the index is invalid or out of range.
+    """
+    try:
+        index = int(index_str)
+    except ValueError:
+        raise ValueError("ERR value is not an integer or out of range")
+    if index < 0 or index >= len(databases):
+        raise ValueError("ERR DB index is out of range")
+    return index
+
+
+class SelectCommand(BaseCommand):
+    """
+    SelectCommand - A command class for the SELECT command in the Redis clone server.
+    """
+
+    def __init__(self, session: ClientSession):
+        self.session = session
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the SELECT command with the given arguments.
+
+        Usage:
+            SELECT index
+        """
+        if len(args) != 1:
+            return "ERR wrong number of arguments for 'SELECT' command"
+        try:
+            self.session.db = parse_db_index(args[0], self.session.databases)
+        except ValueError as e:
+            return str(e)
+        return "OK"
+
+
+class SwapDbCommand(BaseCommand):
+    """
+    SwapDbCommand - A command class for the SWAPDB command in the Redis clone server.
+    """
+
+    def __init__(self, databases: List[Storage]):
+        self.databases = databases
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the SWAPDB command with the given arguments.
+
+        Usage:
+            SWAPDB index1 index2
+        Swapping only exchanges two entries of the databases list, so it is O(1) and
+        clients that selected either index see the other data set right away. Clients
+        blocked on either database are woken to read again from their new one.
+        """
+        if len(args) != 2:
+            return "ERR wrong number of arguments for 'SWAPDB' command"
+        try:
+            first = parse_db_index(args[0], self.databases)
+            second = parse_db_index(args[1], self.databases)
+        except ValueError as e:
+            return str(e)
+        self.databases[first], self.databases[second] = (
+            self.databases[second],
+            self.databases[first],
+        )
+        self.databases[first].signal_all_ready()
+        self.databases[second].signal_all_ready()
+        return "OK"
+
+
+class MoveCommand(BaseCommand):
+    """
+    MoveCommand - A command class for the MOVE command in the Redis clone server.
+    """
+
+    def __init__(self, databases: List[Storage]):
+        self.databases = databases
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the MOVE command with the given arguments.
+
+        Usage:
+            MOVE key db
+        Returns:
+            "1" if the key was moved, or "0" if it does not exist or already exists in
+            the target database.
+        """
+        if len(args) != 2:
+            return "ERR wrong number of arguments for 'MOVE' command"
+        key, db_str = args
+        try:
+            target = self.databases[parse_db_index(db_str, self.databases)]
+        except ValueError as e:
+            return str(e)
+        if target is storage:
+            return "ERR source and destination objects are the same"
+        return str(storage.move(key, target))
+
+
+class DbSizeCommand(BaseCommand):
+    """
+    DbSizeCommand - A command class for the DBSIZE command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the DBSIZE command.
+
+        Usage:
+            DBSIZE
+        """
+        if len(args) != 0:
+            return "ERR wrong number of arguments for 'DBSIZE' command"
+        return str(storage.dbsize())
@@ -0,0 +1,151 @@
+"""
+file: debug_commands.py
+
+This module implements the DEBUG command of the Redis clone server, used to diagnose
+latency and load issues.
+
+Commands:
+- DEBUG PROFILE START [interval-ms] - Starts sampling the commands being processed.
+- DEBUG PROFILE STOP - Stops sampling and writes the collapsed stacks to the profile
+  file configured on the server.
+- DEBUG HOTKEYS ON [k] | OFF - Starts or stops counting key accesses in every database.
+- DEBUG HOTKEYS [count] - Returns the most accessed keys of the current database.
+- DEBUG BIGKEYS [COUNT count] [SAMPLES samples] - Returns the largest of a random sample
+  of keys of the current database.
+- DEBUG POPULATE count [prefix] [size] - Creates count keys for load tests.
+
+None of these cost anything while they are off: the profiler has no hooks in the
+command path, and key accesses are only counted while a HotKeys tracker is attached.
+
+Created By: Gizachew Bayness Kassa on 2025-05-06
+"""
+
+from typing import List
+
+from src.data.hotkeys import DEFAULT_TOP_K, HotKeys
+from src.data.memory import memory_usage
+from src.data.storage import Storage
+from src.network.profiler import DEFAULT_PROFILE_INTERVAL_MS, SamplingProfiler, profiler
+
+from .base_command import BaseCommand
+from .reply import format_array
+
+ERR_NOT_INTEGER = "ERR value is not an integer or out of range"
+
+# Default number of keys sampled by DEBUG BIGKEYS
+DEFAULT_BIGKEYS_SAMPLES = 10000
+
+# Default number of keys returned by DEBUG BIGKEYS
+DEFAULT_BIGKEYS_COUNT = 10
+
+
+class DebugCommand(BaseCommand):
+    """
+    DebugCommand - A command class for the DEBUG command in the Redis clone server.
+    """
+
+    def __init__(
+        self, databases: List[Storage] = None, sampler: SamplingProfiler = profiler
+    ):
+        self.databases = databases  # Every database, or None for only storage
+        self.profiler = sampler
+
+    async def execute(self, storage: Storage, *args: List[str]):
+        """
+        Execute the DEBUG command with the given subcommand.
+        """
+        if len(args) < 1:
+            return "ERR wrong number of arguments for 'DEBUG' command"
+        subcommand = args[0].upper()
+        try:
+            if subcommand == "PROFILE" and len(args) in (2, 3):
+                return self._profile(args[1].upper(), args[2:])
+            if subcommand == "HOTKEYS" and len(args) <= 3:
+                return self._hotkeys(storage, args[1:])
+            if subcommand == "BIGKEYS":
+                return self._bigkeys(storage, args[1:])
+            if subcommand == "POPULATE" and 2 <= len(args) <= 4:
+                return self._populate(storage, args[1:])
+        except ValueError:
+            return ERR_NOT_INTEGER
+        return (
+            f"ERR unknown subcommand or wrong number of arguments for '{args[0]}'. "
+            "Try DEBUG HELP."
+        )
+
+    def _profile(self, action: str, args) -> str:
+        """Handle DEBUG PROFILE START [interval-ms] and DEBUG PROFILE STOP."""
+        if action == "START":
+            interval_ms = float(args[0]) if args else DEFAULT_PROFILE_INTERVAL_MS
+            if interval_ms <= 0:
+                return ERR_NOT_INTEGER
+            if not self.profiler.start(interval_ms):
+                return "ERR the profiler is already running"
+            return "OK"
+        if action == "STOP" and not args:
+            if not self.profiler.stop():
+                return "ERR the profiler is not running"
+            try:
+                samples = self.profiler.dump()
+            except OSError as e:
+                return f"ERR could not write the profile: {e}"
+            return f"OK {samples} samples written to {self.profiler.path}"
+        return "ERR syntax error"
+
+    def _hotkeys(self, storage: Storage, args):
+        """Handle DEBUG HOTKEYS ON [k], DEBUG HOTKEYS OFF and DEBUG HOTKEYS [count]."""
+        action = args[0].upper() if args else None
+        if action == "ON":
+            k = int(args[1]) if len(args) > 1 else DEFAULT_TOP_K
+            if k <= 0:
+                return ERR_NOT_INTEGER
+            for database in self.databases or [storage]:
+                database.hotkeys = HotKeys(k)
+            return "OK"
+        if action == "OFF" and len(args) == 1:
+            for database in self.databases or [storage]:
+                database.hotkeys = None
+            return "OK"
+        if len(args) > 1:
+            return "ERR syntax error"
+        if storage.hotkeys is None:
+            return "ERR hot keys tracking is off, use DEBUG HOTKEYS ON first"
+        count = int(args[0]) if args else None
+        if count is not None and count < 1:
+            return ERR_NOT_INTEGER
+        return format_array(
+            [[key, hits] for key, hits in storage.hotkeys.hottest(count)]
+        )
+
+    def _bigkeys(self, storage: Storage, args) -> str:
+        """Handle DEBUG BIGKEYS [COUNT count] [SAMPLES samples]."""
+        count, samples = DEFAULT_BIGKEYS_COUNT, DEFAULT_BIGKEYS_SAMPLES
+        if len(args) % 2:
+            return "ERR syntax error"
+        for option, value in zip(args[0::2], args[1::2]):
+            if option.upper() == "COUNT":
+                count = int(value)
+            elif option.upper() == "SAMPLES":
+                samples = int(value)
+            else:
+                return "ERR syntax error"
+        if count <= 0 or samples <= 0:
+            return ERR_NOT_INTEGER
+
+        sizes = []
+        for key in storage.sample_keys(samples):
+            value = storage.lookup(key, touch=False)
+            if value is not None:
+                sizes.append([key, memory_usage(key, value)])
+        sizes.sort(key=lambda item: item[1], reverse=True)
+        return format_array(sizes[:count])
+
+    def _populate(self, storage: Storage, args) -> str:
+        """Handle DEBUG POPULATE count [prefix] [size]."""
+        count = int(args[0])
+        prefix = args[1] if len(args) > 1 else "key"
+        size = int(args[2]) if len(args) > 2 else None
+        if count < 0 or (size is not None and size < 0):
+            return ERR_NOT_INTEGER
+        storage.populate(count, prefix, size)
+        return "OK"
@@ -0,0 +1,129 @@
+"""
+file: hyperloglog_commands.py
+
+This module implements the HyperLogLog commands for the Redis clone server.
+
+Commands:
+- PFADD key [element ...] - Adds elements to a HyperLogLog.
+- PFCOUNT key [key ...] - Returns the approximate number of distinct elements.
+- PFMERGE destkey [sourcekey ...] - Merges HyperLogLogs into destkey.
+
+Created By: Gizachew Bayness Kassa on 2025-04-28
+"""
+
+from typing import List
+
+from src.data.hyperloglog import HyperLogLog
+from src.data.storage import Storage
+
+from .base_command import BaseCommand
+
+WRONGTYPE_HLL = "WRONGTYPE Key is not a valid HyperLogLog string value."
+
+
+def lookup_hyperloglogs(storage: Storage, keys) -> List[HyperLogLog]:
+    """
+    Look up the HyperLogLogs stored at keys, skipping keys that do not exist.
+
+    Raises:
+        TypeError: If one of the keys holds a value of another type.
+    """
+    hlls = []
+    for key in keys:
+        value = storage.lookup(key)
+        if value is None:
+            continue
+        if not isinstance(value, HyperLogLog):
+            raise TypeError(WRONGTYPE_HLL)
+        hlls.append(value)
+    return hlls
+
+
+class PfAddCommand(BaseCommand):
+    """
+    PfAddCommand - A command class for the PFADD command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the PFADD command with the given arguments.
+
+        Usage:
+            PFADD key [element ...]
+        Returns:
+            "1" if the HyperLogLog was created or changed, "0" otherwise.
+        """
+        if len(args) < 1:
+            return "ERR wrong number of arguments for 'PFADD' command"
+        key, elements = args[0], args[1:]
+        try:
+            hlls = lookup_hyperloglogs(storage, [key])
+        except TypeError as e:
+            return str(e)
+
+        if not hlls:
+            hll = HyperLogLog()
+            hll.add(*elements)
+            storage.set(key, hll)
+            return "1"
+        # Existing HyperLogLogs are updated in place, keeping their TTL
+        if not hlls[0].add(*elements):
+            return "0"
+        storage.signal_modified(key)
+        return "1"
+
+
+class PfCountCommand(BaseCommand):
+    """
+    PfCountCommand - A command class for the PFCOUNT command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the PFCOUNT command with the given arguments.
+
+        Usage:
+            PFCOUNT key [key ...]
+        With several keys, the count of their union is returned.
+        """
+        if len(args) < 1:
+            return "ERR wrong number of arguments for 'PFCOUNT' command"
+        try:
+            hlls = lookup_hyperloglogs(storage, args)
+        except TypeError as e:
+            return str(e)
+
+        if not hlls:
+            return "0"
+        if len(hlls) == 1:
+            return str(hlls[0].count())  # Served from the cached cardinality
+        return str(HyperLogLog.union(hlls).count())
+
+
+class PfMergeCommand(BaseCommand):
+    """
+    PfMergeCommand - A command class for the PFMERGE command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the PFMERGE command with the given arguments.
+
+        Usage:
+            PFMERGE destkey [sourcekey ...]
+        """
+        if len(args) < 1:
+            return "ERR wrong number of arguments for 'PFMERGE' command"
+        destkey, sourcekeys = args[0], args[1:]
+        try:
+            destination = lookup_hyperloglogs(storage, [destkey])
+            sources = lookup_hyperloglogs(storage, sourcekeys)
+        except TypeError as e:
+            return str(e)
+
+        if destination:
+            destination[0].merge(*sources)
+            storage.signal_modified(destkey)  # The value was changed in place
+        else:
+            storage.set(destkey, HyperLogLog.union(sources))
+        return "OK"
@@ -7,7 +7,9 @@ It interacts with the in-memory storage to perform these operations.
 Commands:
 - SET key value [EX seconds] - Stores a value for a given key, optionally with an expiration.
 - GET key - Retrieves the value of a given key.
+- MGET key [key ...] - Retrieves the values of several keys.
 - DEL key - Deletes a key from storage.
+- UNLINK key [key ...] - Removes keys and frees their values in the background.
 - EXISTS key - Checks if a key exists in storage.
 - EXPIRE key seconds - Sets a time-to-live (TTL) for a key.
 
@@ -19,6 +21,7 @@ from typing import List
 from src.data.storage import Storage
 
 from .base_command import BaseCommand
+from .reply import format_array
 
 
 class SetCommand(BaseCommand):
@@ -52,7 +55,36 @@ class GetCommand(BaseCommand):
             return "ERR wrong number of arguments for 'GET' command"
 
         key = args[0]
-        return storage.get(key)
+        value = storage.get(key)
+        # Only string values can be read with GET
+        if not isinstance(value, (str, bytes, bytearray)):
+            return "WRONGTYPE Operation against a key holding the wrong kind of value"
+        return value
+
+
+class MGetCommand(BaseCommand):
+    """
+    MGetCommand - A command class for the MGET command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the MGET command with the given keys.
+
+        Usage:
+            MGET key [key ...]
+        Returns:
+            One value per key, or (nil) for keys that do not exist or do not hold a
+            string.
+        """
+        if len(args) < 1:
+            return "ERR wrong number of arguments for 'MGET' command"
+
+        values = []
+        for key in args:
+            value = storage.lookup(key)
+            values.append(value if isinstance(value, (str, bytes, bytearray)) else None)
+        return format_array(values)
 
 
 class DeleteCommand(BaseCommand):
@@ -73,3 +105,25 @@ class DeleteCommand(BaseCommand):
         # Delete the key and return 1 to indicate one key was deleted
         storage.delete(key)
         return "(integer) 1"
+
+
+class UnlinkCommand(BaseCommand):
+    """
+    UnlinkCommand - A command class for the UNLINK command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the UNLINK command with the given keys.
+
+        Usage:
+            UNLINK key [key ...]
+        Returns:
+            The number of keys that were removed.
+        """
+        if len(args) < 1:
+            return "ERR wrong number of arguments for 'UNLINK' command"
+
+        # The keys leave the keyspace now, their values are reclaimed later
+        removed = sum(storage.unlink(key) for key in args)
+        return f"(integer) {removed}"
@@ -0,0 +1,41 @@
+"""
+file: reply.py
+
+This module formats command results as the human-readable replies of the Redis clone
+server, following redis-cli's output.
+
+Created By: Gizachew Bayness Kassa on 2025-04-30
+"""
+
+
+def format_value(value) -> str:
+    """Format a single reply element: None as (nil), integers as (integer) N."""
+    if value is None:
+        return "(nil)"
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return f"(integer) {value}"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode(errors="backslashreplace")
+    return str(value)
+
+
+def format_array(items: list) -> str:
+    """
+    Format a list as a numbered array reply. Nested lists are indented under their
+    index, like redis-cli does.
+    """
+    if not items:
+        return "(empty array)"
+    width = len(str(len(items)))
+    result_lines = []
+    for index, item in enumerate(items, start=1):
+        prefix = f"{index:>{width}}) "
+        if isinstance(item, list):
+            lines = format_array(item).split("\n")
+        else:
+            lines = [format_value(item)]
+        result_lines.append(prefix + lines[0])
+        result_lines.extend(" " * len(prefix) + line for line in lines[1:])
+    return "\n".join(result_lines)
@@ -0,0 +1,164 @@
+"""
+file: server_commands.py
+
+This module implements server-wide commands for the Redis clone server.
+
+Commands:
+- FLUSHALL [ASYNC|SYNC] - Removes every key of every database.
+- FLUSHDB [ASYNC|SYNC] - Removes every key of the current database.
+- INFO [section] - Returns information and statistics about the server.
+- MEMORY USAGE key [SAMPLES count] - Estimates the memory used by a key.
+
+Created By: Gizachew Bayness Kassa on 2025-04-24
+"""
+
+from typing import List
+
+from src.data.memory import DEFAULT_SAMPLES, memory_usage
+from src.data.storage import Storage
+
+from .base_command import BaseCommand
+
+
+def parse_flush_mode(command_name: str, args) -> bool:
+    """
+    Parse the optional ASYNC|SYNC argument of FLUSHALL and FLUSHDB.
+
+    Returns:
+        True for ASYNC, False for SYNC (the default).
+    Raises:
+        ValueError: With the error reply if the arguments are invalid.
+    """
+    if len(args) > 1:
+        raise ValueError(f"ERR wrong number of arguments for '{command_name}' command")
+    if not args:
+        return False
+    mode = args[0].upper()
+    if mode not in ("ASYNC", "SYNC"):
+        raise ValueError("ERR syntax error")
+    return mode == "ASYNC"
+
+
+class FlushAllCommand(BaseCommand):
+    """
+    FlushAllCommand - A command class for the FLUSHALL command in the Redis clone server.
+    """
+
+    def __init__(self, databases: List[Storage] = None):
+        self.databases = databases  # Every database, or None to flush only storage
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the FLUSHALL command with the given arguments.
+
+        Usage:
+            FLUSHALL [ASYNC|SYNC]
+        """
+        try:
+            asynchronous = parse_flush_mode("FLUSHALL", args)
+        except ValueError as e:
+            return str(e)
+        for database in self.databases or [storage]:
+            database.flush(asynchronous=asynchronous)
+        return "OK"
+
+
+class FlushDbCommand(BaseCommand):
+    """
+    FlushDbCommand - A command class for the FLUSHDB command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the FLUSHDB command with the given arguments.
+
+        Usage:
+            FLUSHDB [ASYNC|SYNC]
+        """
+        try:
+            asynchronous = parse_flush_mode("FLUSHDB", args)
+        except ValueError as e:
+            return str(e)
+        return storage.flush(asynchronous=asynchronous)
+
+
+class InfoCommand(BaseCommand):
+    """
+    InfoCommand - A command class for the INFO command in the Redis clone server.
+    """
+
+    def __init__(self, databases: List[Storage] = None):
+        self.databases = databases  # Every database, or None to report only storage
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the INFO command with the given arguments.
+
+        Usage:
+            INFO [section]
+        Returns:
+            One "# Section" header per section followed by "field:value" lines.
+        """
+        if len(args) > 1:
+            return "ERR wrong number of arguments for 'INFO' command"
+
+        # Key and expire counts are maintained incrementally, so this never scans
+        keyspace = [
+            f"db{index}:keys={database.dbsize()},expires={database.expires}"
+            for index, database in enumerate(self.databases or [storage])
+            if database.dbsize()
+        ]
+        sections = {
+            "memory": [f"lazyfree_pending_objects:{storage.lazyfree.pending}"],
+            "keyspace": keyspace,
+        }
+        if args:
+            section = args[0].lower()
+            if section not in sections:
+                return ""
+            sections = {section: sections[section]}
+
+        result_lines = []
+        for name, fields in sections.items():
+            result_lines.append(f"# {name.capitalize()}")
+            result_lines.extend(fields)
+        return "\n".join(result_lines)
+
+
+class MemoryCommand(BaseCommand):
+    """
+    MemoryCommand - A command class for the MEMORY command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]):
+        """
+        Execute the MEMORY command with the given arguments.
+
+        Usage:
+            MEMORY USAGE key [SAMPLES count]
+        Returns:
+            The estimated number of bytes used by the key and its value, or (nil) if
+            the key does not exist. Only count nested elements of aggregate values are
+            measured (5 by default, 0 for all of them).
+        """
+        if not args or args[0].upper() != "USAGE":
+            return (
+                "ERR unknown subcommand or wrong number of arguments for "
+                f"'{args[0] if args else ''}'. Try MEMORY HELP."
+            )
+        if len(args) not in (2, 4):
+            return "ERR wrong number of arguments for 'MEMORY USAGE' command"
+        samples = DEFAULT_SAMPLES
+        if len(args) == 4:
+            if args[2].upper() != "SAMPLES":
+                return "ERR syntax error"
+            try:
+                samples = int(args[3])
+            except ValueError:
+                return "ERR value is not an integer or out of range"
+            if samples < 0:
+                return "ERR value is not an integer or out of range"
+        value = storage.lookup(args[1], touch=False)
+        if value is None:
+            return "(nil)"
+        return memory_usage(args[1], value, samples)
@@ -0,0 +1,747 @@
+"""
+file: stream_commands.py
+
+This module implements the stream commands for the Redis clone server.
+
+Commands:
+- XADD key [NOMKSTREAM] [MAXLEN|MINID [=|~] threshold] *|id field value [field value ...]
+  - Appends an entry to a stream.
+- XLEN key - Returns the number of entries in a stream.
+- XRANGE key start end [COUNT count] - Returns the entries within a range of IDs.
+- XREVRANGE key end start [COUNT count] - Same as XRANGE, newest entries first.
+- XTRIM key MAXLEN|MINID [=|~] threshold - Trims the oldest entries of a stream.
+- XREAD [COUNT count] [BLOCK milliseconds] STREAMS key [key ...] id [id ...]
+  - Reads entries newer than the given IDs, optionally waiting for them.
+- XGROUP CREATE key group id|$ [MKSTREAM] | DESTROY key group
+  | CREATECONSUMER key group consumer | DELCONSUMER key group consumer
+  - Manages consumer groups.
+- XREADGROUP GROUP group consumer [COUNT count] [BLOCK milliseconds] [NOACK]
+  STREAMS key [key ...] id [id ...] - Reads entries on behalf of a consumer group.
+- XACK key group id [id ...] - Removes entries from a group's pending entries list.
+- XPENDING key group [start end count [consumer]] - Inspects the pending entries list.
+
+Blocked XREAD and XREADGROUP calls do not poll: they wait on a future registered on the
+keys they read, which XADD resolves. Removing the key, flushing or swapping its database
+wakes them too; they then read again from the database their client has selected.
+
+Created By: Gizachew Bayness Kassa on 2025-05-04
+"""
+
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+from src.data.storage import Storage
+from src.data.stream import (
+    MAX_ID,
+    MIN_ID,
+    ConsumerGroup,
+    Stream,
+    StreamIDError,
+    format_id,
+    next_id,
+    parse_id,
+    previous_id,
+)
+from src.network.client_handler import ClientSession
+
+from .base_command import BaseCommand
+from .reply import format_array
+
+WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+ERR_SYNTAX = "ERR syntax error"
+ERR_NOT_INTEGER = "ERR value is not an integer or out of range"
+ERR_TIMEOUT = "ERR timeout is not an integer or out of range"
+ERR_UNBALANCED = (
+    "ERR Unbalanced '{command}' list of streams: for each stream key an ID or '$' "
+    "must be specified."
+)
+
+
+class BlockedReadError(Exception):
+    """
+    BlockedReadError - Raised by the read() of XREAD or XREADGROUP when a key it reads
+    changed so that it can never succeed, e.g. its consumer group was destroyed. The
+    message is the error reply.
+    """
+
+
+def lookup_stream(storage: Storage, key: str) -> Optional[Stream]:
+    """
+    Look up the stream stored at key, or None if the key does not exist.
+
+    Raises:
+        TypeError: If the key holds a value that is not a stream.
+    """
+    value = storage.lookup(key)
+    if value is not None and not isinstance(value, Stream):
+        raise TypeError(WRONGTYPE)
+    return value
+
+
+def lookup_read_stream(storage: Storage, key: str) -> Optional[Stream]:
+    """
+    Look up a stream from the read() of a blocking command.
+
+    Raises:
+        BlockedReadError: If the key holds a value that is not a stream.
+    """
+    try:
+        return lookup_stream(storage, key)
+    except TypeError as e:
+        raise BlockedReadError(str(e))
+
+
+def lookup_group(storage: Storage, key: str, group: str) -> Optional[ConsumerGroup]:
+    """
+    Look up a consumer group, or None if the key or the group does not exist.
+
+    Raises:
+        TypeError: If the key holds a value that is not a stream.
+    """
+    stream = lookup_stream(storage, key)
+    return stream.groups.get(group) if stream is not None else None
+
+
+def parse_range_id(id_str: str, is_start: bool):
+    """
+    Parse an XRANGE boundary: "-" and "+" for the smallest and greatest IDs, a bare
+    "<ms>" for the first or last sequence number, and a "(" prefix for an exclusive
+    boundary.
+
+    Raises:
+        StreamIDError: If the ID is malformed or an exclusive boundary is out of range.
+    """
+    if id_str == "-":
+        return MIN_ID
+    if id_str == "+":
+        return MAX_ID
+    exclusive = id_str.startswith("(")
+    if exclusive:
+        id_str = id_str[1:]
+    entry_id = parse_id(id_str, missing_seq=0 if is_start else MAX_ID[1])
+    if not exclusive:
+        return entry_id
+    if entry_id == (MAX_ID if is_start else MIN_ID):
+        raise StreamIDError("ERR invalid start ID for the interval")
+    return next_id(entry_id) if is_start else previous_id(entry_id)
+
+
+def parse_count(value: str) -> int:
+    """
+    Parse the argument of COUNT, clamping negative counts to zero.
+
+    Raises:
+        ValueError: If the count is not an integer.
+    """
+    return max(int(value), 0)
+
+
+def parse_trim(args, index: int):
+    """
+    Parse a "MAXLEN|MINID [=|~] threshold" trimming clause starting at args[index].
+
+    Returns:
+        (strategy, approximate, threshold, next index)
+    Raises:
+        ValueError: With the error reply, if the clause is malformed.
+    """
+    strategy = args[index].upper()
+    index += 1
+    approximate = False
+    if index < len(args) and args[index] in ("=", "~"):
+        approximate = args[index] == "~"
+        index += 1
+    if index >= len(args):
+        raise ValueError(ERR_SYNTAX)
+    if strategy == "MAXLEN":
+        try:
+            threshold = int(args[index])
+        except ValueError:
+            raise ValueError(ERR_NOT_INTEGER)
+        if threshold < 0:
+            raise ValueError("ERR The MAXLEN argument must be >= 0.")
+    else:
+        try:
+            threshold = parse_id(args[index])
+        except StreamIDError as e:
+            raise ValueError(str(e))
+    return strategy, approximate, threshold, index + 1
+
+
+def trim(stream: Stream, strategy: str, approximate: bool, threshold) -> int:
+    """Apply a parsed trimming clause. Returns the number of entries removed."""
+    if strategy == "MAXLEN":
+        return stream.trim_maxlen(threshold, approximate)
+    return stream.trim_minid(threshold, approximate)
+
+
+def format_entries(entries) -> list:
+    """Shape (id, fields) pairs as a nested reply; trimmed entries have nil fields."""
+    return [[format_id(entry_id), fields] for entry_id, fields in entries]
+
+
+async def wait_for_keys(storage: Storage, keys: List[str], timeout: float) -> bool:
+    """
+    Wait until XADD appends to one of keys.
+
+    Args:
+        timeout: Seconds to wait, or None to wait forever.
+    Returns:
+        False if the timeout expired first.
+    """
+    future = asyncio.get_running_loop().create_future()
+    for key in keys:
+        storage.add_waiter(key, future)
+    try:
+        await asyncio.wait_for(future, timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        for key in keys:
+            storage.remove_waiter(key, future)
+
+
+def parse_read_options(command: str, args, options=()):
+    """
+    Parse the common [COUNT count] [BLOCK milliseconds] ... STREAMS key... id... tail
+    of XREAD and XREADGROUP. Flags such as NOACK are looked up in options.
+
+    Returns:
+        (count, block milliseconds or None, flags set, keys, ids)
+    Raises:
+        ValueError: With the error reply, if the arguments are malformed.
+    """
+    count, block, flags = None, None, set()
+    index = 0
+    while index < len(args):
+        option = args[index].upper()
+        if option == "STREAMS":
+            break
+        if option in options:
+            flags.add(option)
+            index += 1
+            continue
+        if option not in ("COUNT", "BLOCK") or index + 1 >= len(args):
+            raise ValueError(ERR_SYNTAX)
+        try:
+            if option == "COUNT":
+                count = parse_count(args[index + 1]) or None  # 0: no limit
+            else:
+                block = int(args[index + 1])
+        except ValueError:
+            raise ValueError(ERR_NOT_INTEGER if option == "COUNT" else ERR_TIMEOUT)
+        if block is not None and block < 0:
+            raise ValueError("ERR timeout is negative")
+        index += 2
+    streams = args[index + 1 :]
+    if index >= len(args) or not streams:
+        raise ValueError(ERR_SYNTAX)
+    if len(streams) % 2:
+        raise ValueError(ERR_UNBALANCED.format(command=command))
+    half = len(streams) // 2
+    return count, block, flags, list(streams[:half]), list(streams[half:])
+
+
+async def read_blocking(
+    current: Callable[[], Storage], keys: List[str], block, read
+) -> str:
+    """
+    Run read() and, if it found nothing and block is set, wait for XADD on one of keys
+    and read again until entries arrive or the timeout expires.
+
+    Args:
+        current: Returns the storage to wait on, looked up again after every wake up
+            since SWAPDB may have replaced the client's database.
+        block: Milliseconds to wait, 0 to wait forever, or None not to wait.
+        read: Returns a nested reply, empty if nothing was read.
+    Raises:
+        BlockedReadError: From read(), with the error reply.
+    """
+    deadline = time.monotonic() + block / 1000 if block else None
+    while True:
+        result = read()
+        if result or block is None:
+            return format_array(result) if result else "(nil)"
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return "(nil)"
+        if not await wait_for_keys(current(), keys, timeout):
+            return "(nil)"
+
+
+class XAddCommand(BaseCommand):
+    """
+    XAddCommand - A command class for the XADD command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the XADD command with the given arguments.
+
+        Usage:
+            XADD key [NOMKSTREAM] [MAXLEN|MINID [=|~] threshold] *|id field value ...
+        Returns:
+            The ID of the new entry, or (nil) with NOMKSTREAM and a missing key.
+        """
+        if len(args) < 4:
+            return "ERR wrong number of arguments for 'XADD' command"
+        key = args[0]
+        nomkstream = False
+        trimming = None
+        index = 1
+        while index < len(args):
+            option = args[index].upper()
+            if option == "NOMKSTREAM":
+                nomkstream = True
+                index += 1
+            elif option in ("MAXLEN", "MINID"):
+                try:
+                    *trimming, index = parse_trim(args, index)
+                except ValueError as e:
+                    return str(e)
+            else:
+                break
+        fields = args[index + 1 :]
+        if not fields or len(fields) % 2:
+            return "ERR wrong number of arguments for 'XADD' command"
+
+        try:
+            stream = lookup_stream(storage, key)
+        except TypeError as e:
+            return str(e)
+        created = stream is None
+        if created:
+            if nomkstream:
+                return "(nil)"
+            stream = Stream()
+        try:
+            entry_id = stream.add(list(fields), args[index])
+        except StreamIDError as e:
+            return str(e)
+        if trimming is not None:
+            trim(stream, *trimming)
+
+        # Existing streams are appended to in place, keeping their TTL
+        if created:
+            storage.set(key, stream)
+        else:
+            storage.signal_modified(key)
+        storage.signal_ready(key)
+        return format_id(entry_id)
+
+
+class XLenCommand(BaseCommand):
+    """
+    XLenCommand - A command class for the XLEN command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]):
+        """
+        Execute the XLEN command with the given arguments.
+
+        Usage:
+            XLEN key
+        Returns:
+            The number of entries, 0 if the key does not exist.
+        """
+        if len(args) != 1:
+            return "ERR wrong number of arguments for 'XLEN' command"
+        try:
+            stream = lookup_stream(storage, args[0])
+        except TypeError as e:
+            return str(e)
+        return len(stream) if stream is not None else 0
+
+
+class XRangeCommand(BaseCommand):
+    """
+    XRangeCommand - A command class for the XRANGE and XREVRANGE commands in the Redis
+    clone server.
+    """
+
+    def __init__(self, reverse: bool = False):
+        self.reverse = reverse
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the XRANGE or XREVRANGE command with the given arguments.
+
+        Usage:
+            XRANGE key start end [COUNT count]
+            XREVRANGE key end start [COUNT count]
+        Returns:
+            The entries in the range, as an array of [id, [field, value, ...]].
+        """
+        name = "XREVRANGE" if self.reverse else "XRANGE"
+        if len(args) not in (3, 5):
+            return f"ERR wrong number of arguments for '{name}' command"
+        count = None
+        if len(args) == 5:
+            if args[3].upper() != "COUNT":
+                return ERR_SYNTAX
+            try:
+                count = parse_count(args[4])
+            except ValueError:
+                return ERR_NOT_INTEGER
+        first, last = (args[2], args[1]) if self.reverse else (args[1], args[2])
+        try:
+            start = parse_range_id(first, is_start=True)
+            end = parse_range_id(last, is_start=False)
+            stream = lookup_stream(storage, args[0])
+        except (StreamIDError, TypeError) as e:
+            return str(e)
+        if stream is None:
+            return format_array([])
+        if self.reverse:
+            entries = stream.rev_range(end, start, count)
+        else:
+            entries = stream.range(start, end, count)
+        return format_array(format_entries(entries))
+
+
+class XTrimCommand(BaseCommand):
+    """
+    XTrimCommand - A command class for the XTRIM command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]):
+        """
+        Execute the XTRIM command with the given arguments.
+
+        Usage:
+            XTRIM key MAXLEN|MINID [=|~] threshold
+        Returns:
+            The number of entries removed. With "~", only whole chunks are removed.
+        """
+        if len(args) < 3:
+            return "ERR wrong number of arguments for 'XTRIM' command"
+        if args[1].upper() not in ("MAXLEN", "MINID"):
+            return ERR_SYNTAX
+        try:
+            *trimming, index = parse_trim(args, 1)
+        except ValueError as e:
+            return str(e)
+        if index != len(args):
+            return ERR_SYNTAX
+        try:
+            stream = lookup_stream(storage, args[0])
+        except TypeError as e:
+            return str(e)
+        if stream is None:
+            return 0
+        removed = trim(stream, *trimming)
+        if removed:
+            storage.signal_modified(args[0])
+        return removed
+
+
+class XReadCommand(BaseCommand):
+    """
+    XReadCommand - A command class for the XREAD command in the Redis clone server.
+    """
+
+    def __init__(self, session: ClientSession = None):
+        self.session = session  # Its selected database is read again when woken
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the XREAD command with the given arguments.
+
+        Usage:
+            XREAD [COUNT count] [BLOCK milliseconds] STREAMS key [key ...] id [id ...]
+        Returns:
+            An array of [key, entries] for the streams with entries newer than their
+            ID ("$" for only entries added from now on), or (nil) if there are none
+            before the timeout.
+        """
+        try:
+            count, block, _, keys, ids = parse_read_options("XREAD", args)
+            after = []
+            for key, id_str in zip(keys, ids):
+                if id_str == "$":
+                    stream = lookup_stream(storage, key)
+                    after.append(stream.last_id if stream is not None else MIN_ID)
+                else:
+                    after.append(parse_id(id_str))
+        except (ValueError, TypeError) as e:
+            return str(e)
+
+        def current() -> Storage:
+            return self.session.storage if self.session is not None else storage
+
+        def read():
+            result = []
+            for key, last_id in zip(keys, after):
+                stream = lookup_read_stream(current(), key)
+                if stream is None or last_id >= MAX_ID:
+                    continue
+                entries = stream.range(next_id(last_id), MAX_ID, count)
+                if entries:
+                    result.append([key, format_entries(entries)])
+            return result
+
+        try:
+            return await read_blocking(current, keys, block, read)
+        except BlockedReadError as e:
+            return str(e)
+
+
+class XGroupCommand(BaseCommand):
+    """
+    XGroupCommand - A command class for the XGROUP command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]):
+        """
+        Execute the XGROUP command with the given arguments.
+
+        Usage:
+            XGROUP CREATE key group id|$ [MKSTREAM]
+            XGROUP DESTROY key group
+            XGROUP CREATECONSUMER key group consumer
+            XGROUP DELCONSUMER key group consumer
+        Returns:
+            OK for CREATE; 1 or 0 for DESTROY and CREATECONSUMER; the number of pending
+            entries the consumer had for DELCONSUMER.
+        """
+        if len(args) < 3:
+            return "ERR wrong number of arguments for 'XGROUP' command"
+        subcommand, key, name = args[0].upper(), args[1], args[2]
+        try:
+            stream = lookup_stream(storage, key)
+        except TypeError as e:
+            return str(e)
+
+        if subcommand == "CREATE":
+            if len(args) not in (4, 5) or (
+                len(args) == 5 and args[4].upper() != "MKSTREAM"
+            ):
+                return ERR_SYNTAX
+            if stream is None:
+                if len(args) != 5:
+                    return (
+                        "ERR The XGROUP subcommand requires the key to exist. Note that "
+                        "for CREATE you may want to use the MKSTREAM option to create "
+                        "an empty stream automatically."
+                    )
+                stream = Stream()
+                storage.set(key, stream)
+            if name in stream.groups:
+                return "BUSYGROUP Consumer Group name already exists"
+            try:
+                last_id = stream.last_id if args[3] == "$" else parse_id(args[3])
+            except StreamIDError as e:
+                return str(e)
+            stream.groups[name] = ConsumerGroup(last_id)
+            return "OK"
+
+        if subcommand == "DESTROY":
+            if len(args) != 3:
+                return "ERR wrong number of arguments for 'XGROUP DESTROY' command"
+            if stream is None or stream.groups.pop(name, None) is None:
+                return 0
+            storage.signal_ready(key)  # Clients blocked on the group get NOGROUP
+            return 1
+
+        if subcommand in ("CREATECONSUMER", "DELCONSUMER"):
+            if len(args) != 4:
+                return (
+                    f"ERR wrong number of arguments for 'XGROUP {subcommand}' command"
+                )
+            group = stream.groups.get(name) if stream is not None else None
+            if group is None:
+                return f"NOGROUP No such key '{key}' or consumer group '{name}'"
+            consumer = args[3]
+            if subcommand == "CREATECONSUMER":
+                if consumer in group.consumers:
+                    return 0
+                group.consumer(consumer)
+                return 1
+            pending = group.consumers.pop(consumer, {})
+            for entry_id in pending:
+                del group.pel[entry_id]
+            return len(pending)
+
+        return f"ERR unknown subcommand '{args[0]}'"
+
+
+class XReadGroupCommand(BaseCommand):
+    """
+    XReadGroupCommand - A command class for the XREADGROUP command in the Redis clone
+    server.
+    """
+
+    def __init__(self, session: ClientSession = None):
+        self.session = session  # Its selected database is read again when woken
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the XREADGROUP command with the given arguments.
+
+        Usage:
+            XREADGROUP GROUP group consumer [COUNT count] [BLOCK milliseconds]
+                [NOACK] STREAMS key [key ...] id [id ...]
+        Returns:
+            An array of [key, entries]. With ">", entries never delivered to the group
+            are returned and added to the pending entries list (unless NOACK), and the
+            call may block for them. With an ID, the consumer's pending entries after
+            it are returned again; entries since trimmed have nil fields.
+        """
+        if len(args) < 3 or args[0].upper() != "GROUP":
+            return ERR_SYNTAX
+        group_name, consumer = args[1], args[2]
+        try:
+            count, block, flags, keys, ids = parse_read_options(
+                "XREADGROUP", args[3:], ("NOACK",)
+            )
+            groups = []
+            for key, id_str in zip(keys, ids):
+                group = lookup_group(storage, key, group_name)
+                if group is None:
+                    return (
+                        f"NOGROUP No such key '{key}' or consumer group "
+                        f"'{group_name}' in XREADGROUP with GROUP option"
+                    )
+                groups.append((key, group, None if id_str == ">" else parse_id(id_str)))
+        except (ValueError, TypeError) as e:
+            return str(e)
+        noack = "NOACK" in flags
+        for _, group, _ in groups:
+            group.consumer(consumer)
+
+        def current() -> Storage:
+            return self.session.storage if self.session is not None else storage
+
+        def read():
+            result = []
+            for key, group, after in groups:
+                stream = lookup_read_stream(current(), key)
+                if stream is None or stream.groups.get(group_name) is not group:
+                    # The stream or the group was deleted while blocked
+                    raise BlockedReadError(
+                        "NOGROUP the consumer group this client was blocked on no "
+                        "longer exists"
+                    )
+                if after is None:
+                    entries = stream.range(next_id(group.last_id), MAX_ID, count)
+                    group.deliver(
+                        consumer, [entry_id for entry_id, _ in entries], noack
+                    )
+                    if entries:
+                        result.append([key, format_entries(entries)])
+                    continue
+                # History: the entries already delivered to this consumer
+                entries = []
+                for entry_id in group.pending_ids(consumer, after, count):
+                    pending = group.pel[entry_id]
+                    pending.delivery_time = time.time()
+                    pending.delivery_count += 1
+                    entries.append((entry_id, stream.entry(entry_id)))
+                result.append([key, format_entries(entries)])
+            return result
+
+        # Only reads of new entries wait for them
+        if any(after is not None for _, _, after in groups):
+            block = None
+        try:
+            return await read_blocking(current, keys, block, read)
+        except BlockedReadError as e:
+            return str(e)
+
+
+class XAckCommand(BaseCommand):
+    """
+    XAckCommand - A command class for the XACK command in the Redis clone server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]):
+        """
+        Execute the XACK command with the given arguments.
+
+        Usage:
+            XACK key group id [id ...]
+        Returns:
+            The number of entries removed from the pending entries list.
+        """
+        if len(args) < 3:
+            return "ERR wrong number of arguments for 'XACK' command"
+        try:
+            entry_ids = [parse_id(id_str) for id_str in args[2:]]
+            group = lookup_group(storage, args[0], args[1])
+        except (StreamIDError, TypeError) as e:
+            return str(e)
+        if group is None:
+            return 0
+        return sum(group.acknowledge(entry_id) for entry_id in entry_ids)
+
+
+class XPendingCommand(BaseCommand):
+    """
+    XPendingCommand - A command class for the XPENDING command in the Redis clone
+    server.
+    """
+
+    async def execute(self, storage: Storage, *args: List[str]) -> str:
+        """
+        Execute the XPENDING command with the given arguments.
+
+        Usage:
+            XPENDING key group [start end count [consumer]]
+        Returns:
+            Without a range, the number of pending entries, the smallest and greatest
+            pending IDs and the number of entries pending per consumer. With a range,
+            [id, consumer, idle milliseconds, delivery count] for each pending entry.
+        """
+        if len(args) not in (2, 5, 6):
+            return "ERR wrong number of arguments for 'XPENDING' command"
+        try:
+            group = lookup_group(storage, args[0], args[1])
+        except TypeError as e:
+            return str(e)
+        if group is None:
+            return f"NOGROUP No such key '{args[0]}' or consumer group '{args[1]}'"
+
+        if len(args) == 2:
+            if not group.pel:
+                return format_array([0, None, None, None])
+            entry_ids = sorted(group.pel)
+            consumers = [
+                [name, str(len(pending))]
+                for name, pending in group.consumers.items()
+                if pending
+            ]
+            return format_array(
+                [
+                    len(entry_ids),
+                    format_id(entry_ids[0]),
+                    format_id(entry_ids[-1]),
+                    consumers,
+                ]
+            )
+
+        try:
+            start = parse_range_id(args[2], is_start=True)
+            end = parse_range_id(args[3], is_start=False)
+            count = int(args[4])
+        except StreamIDError as e:
+            return str(e)
+        except ValueError:
+            return ERR_NOT_INTEGER
+        consumer = args[5] if len(args) == 6 else None
+        now = time.time()
+        entries = []
+        for entry_id in sorted(group.pel):
+            if len(entries) >= count or entry_id > end:
+                break
+            pending = group.pel[entry_id]
+            if entry_id < start or (consumer and pending.consumer != consumer):
+                continue
+            idle = int((now - pending.delivery_time) * 1000)
+            entries.append(
+                [format_id(entry_id), pending.consumer, idle, pending.delivery_count]
+            )
+        return format_array(entries)
@@ -0,0 +1,215 @@
+"""
+file: src/data/bitmap.py
+
+This file contains the bit-level operations behind the SETBIT, GETBIT, BITCOUNT, BITPOS,
+BITOP and BITFIELD commands of the Redis clone server.
+
+Bitmaps are plain string values. Strings that are written bit by bit are kept as a
+mutable bytearray, so SETBIT updates them in place instead of rebuilding an immutable
+str. Bits are numbered from the most significant bit of the first byte, as in Redis.
+
+Counting, searching and combining work on CHUNK_SIZE slices converted with
+int.from_bytes, so the per-bit work happens in C rather than in Python loops.
+
+Created by Gizachew Bayness Kassa on 2025-04-30
+"""
+
+from typing import List, Optional, Union
+
+# Number of bytes converted to a single integer at a time
+CHUNK_SIZE = 64 * 1024
+
+# Largest bit offset accepted by SETBIT and BITFIELD (a 512 MB string, like Redis)
+MAX_BIT_OFFSET = 8 * 512 * 1024 * 1024 - 1
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def as_bytes(value: Union[str, BytesLike]) -> BytesLike:
+    """Returns the bytes of a string value without copying bytes-like values."""
+    return value.encode(errors="surrogateescape") if isinstance(value, str) else value
+
+
+def ensure_length(buffer: bytearray, length: int) -> bytearray:
+    """
+    Zero-pad a bitmap to at least length bytes.
+
+    Returns:
+        The same bytearray, or a padded copy if it cannot be resized because a reply
+        still holds a memoryview of it.
+    """
+    if len(buffer) >= length:
+        return buffer
+    padding = bytes(length - len(buffer))
+    try:
+        buffer.extend(padding)
+    except BufferError:
+        buffer = bytearray(buffer)
+        buffer.extend(padding)
+    return buffer
+
+
+def getbit(data: BytesLike, offset: int) -> int:
+    """Returns the bit at offset, or 0 beyond the end of the string."""
+    byte_index = offset >> 3
+    if byte_index >= len(data):
+        return 0
+    return (data[byte_index] >> (7 - (offset & 7))) & 1
+
+
+def setbit(buffer: bytearray, offset: int, bit: int) -> int:
+    """Sets the bit at offset, which must be inside buffer. Returns the old bit."""
+    byte_index = offset >> 3
+    mask = 1 << (7 - (offset & 7))
+    old_bit = 1 if buffer[byte_index] & mask else 0
+    if bit:
+        buffer[byte_index] |= mask
+    else:
+        buffer[byte_index] &= ~mask & 0xFF
+    return old_bit
+
+
+def normalize_range(start: int, end: int, length: int) -> Optional[range]:
+    """
+    Resolve Redis-style inclusive start and end indexes, which may be negative.
+
+    Returns:
+        The resolved range, or None if it is empty.
+    """
+    if start < 0:
+        start = max(start + length, 0)
+    if end < 0:
+        end = max(end + length, 0)
+    end = min(end, length - 1)
+    if start > end:
+        return None
+    return range(start, end + 1)
+
+
+def _popcount(data: BytesLike) -> int:
+    """Count the set bits of a byte string, CHUNK_SIZE bytes at a time."""
+    view = memoryview(data)
+    return sum(
+        int.from_bytes(view[i : i + CHUNK_SIZE], "big").bit_count()
+        for i in range(0, len(view), CHUNK_SIZE)
+    )
+
+
+def bitcount(data: BytesLike, first_bit: int = None, last_bit: int = None) -> int:
+    """
+    Count the set bits of data, optionally only those between two bit offsets.
+    """
+    if first_bit is None:
+        return _popcount(data)
+    first_byte, last_byte = first_bit >> 3, last_bit >> 3
+    count = _popcount(memoryview(data)[first_byte : last_byte + 1])
+    # Remove the bits of the edge bytes that fall outside the range
+    count -= (data[first_byte] & (0xFF00 >> (first_bit & 7)) & 0xFF).bit_count()
+    count -= (data[last_byte] & (0xFF >> ((last_bit & 7) + 1))).bit_count()
+    return count
+
+
+def bitpos(data: BytesLike, bit: int, first_bit: int, last_bit: int) -> int:
+    """
+    Returns the offset of the first bit equal to bit between two bit offsets, or -1.
+    """
+    first_byte, last_byte = first_bit >> 3, last_bit >> 3
+    # Force the bits of the edge bytes outside the range to the value not searched for
+    head_outside = 0xFF00 >> (first_bit & 7) & 0xFF
+    tail_outside = 0xFF >> ((last_bit & 7) + 1)
+    if first_byte == last_byte:
+        head_outside |= tail_outside
+
+    def edge(byte: int, mask: int) -> bytes:
+        return bytes([byte & ~mask & 0xFF if bit else byte | mask])
+
+    view = memoryview(data)
+    segments = [(first_byte, edge(data[first_byte], head_outside))]
+    for i in range(first_byte + 1, last_byte, CHUNK_SIZE):
+        segments.append((i, view[i : min(i + CHUNK_SIZE, last_byte)]))
+    if last_byte != first_byte:
+        segments.append((last_byte, edge(data[last_byte], tail_outside)))
+
+    for byte_offset, segment in segments:
+        number = int.from_bytes(segment, "big")
+        width = 8 * len(segment)
+        if not bit:
+            number ^= (1 << width) - 1  # Look for a set bit in the complement
+        if number:
+            return 8 * byte_offset + width - number.bit_length()
+    return -1
+
+
+def bitop(operation: str, sources: List[BytesLike]) -> bytearray:
+    """
+    Combine strings with AND, OR, XOR or NOT. Shorter strings are zero-padded.
+    """
+    length = max((len(source) for source in sources), default=0)
+    result = bytearray(length)
+    views = [memoryview(source) for source in sources]
+    for offset in range(0, length, CHUNK_SIZE):
+        width = min(CHUNK_SIZE, length - offset)
+        numbers = []
+        for view in views:
+            chunk = view[offset : offset + width]
+            # Left-align short chunks so missing bytes read as zeros
+            numbers.append(int.from_bytes(chunk, "big") << (8 * (width - len(chunk))))
+        number = numbers[0]
+        if operation == "NOT":
+            number ^= (1 << (8 * width)) - 1
+        for other in numbers[1:]:
+            if operation == "AND":
+                number &= other
+            elif operation == "OR":
+                number |= other
+            else:
+                number ^= other
+        result[offset : offset + width] = number.to_bytes(width, "big")
+    return result
+
+
+def get_field(data: BytesLike, offset: int, bits: int, signed: bool) -> int:
+    """Read a bits-wide integer starting at a bit offset, zero beyond the end."""
+    first_byte, last_byte = offset >> 3, (offset + bits - 1) >> 3
+    chunk = bytes(data[first_byte : last_byte + 1])
+    width = last_byte - first_byte + 1
+    chunk += bytes(width - len(chunk))
+    shift = 8 * width - (offset & 7) - bits
+    value = (int.from_bytes(chunk, "big") >> shift) & ((1 << bits) - 1)
+    if signed and value >> (bits - 1):
+        value -= 1 << bits
+    return value
+
+
+def set_field(buffer: bytearray, offset: int, bits: int, value: int):
+    """Write a bits-wide integer starting at a bit offset, which must be inside buffer."""
+    first_byte, last_byte = offset >> 3, (offset + bits - 1) >> 3
+    width = last_byte - first_byte + 1
+    shift = 8 * width - (offset & 7) - bits
+    mask = ((1 << bits) - 1) << shift
+    number = int.from_bytes(buffer[first_byte : last_byte + 1], "big")
+    number = (number & ~mask) | ((value << shift) & mask)
+    buffer[first_byte : last_byte + 1] = number.to_bytes(width, "big")
+
+
+def apply_overflow(value: int, bits: int, signed: bool, mode: str) -> Optional[int]:
+    """
+    Fit value into a bits-wide field using the BITFIELD OVERFLOW mode.
+
+    Returns:
+        The value to store, or None if it overflows and mode is FAIL.
+    """
+    if signed:
+        lowest, highest = -(1 << (bits - 1)), (1 << (bits - 1)) - 1
+    else:
+        lowest, highest = 0, (1 << bits) - 1
+    if lowest <= value <= highest:
+        return value
+    if mode == "FAIL":
+        return None
+    if mode == "SAT":
+        return highest if value > highest else lowest
+    value &= (1 << bits) - 1  # WRAP
+    if signed and value > highest:
+        value -= 1 << bits
+    return value
@@ -0,0 +1,112 @@
+"""
+file: src/data/hotkeys.py
+
+This file contains the HotKeys tracker used by DEBUG HOTKEYS to find the most accessed
+keys of the Redis clone server.
+
+Key accesses are counted in a count-min sketch: a few rows of counters, each indexed
+by a different hash of the key. A key's count is the smallest of its counters, which
+may overestimate it when keys collide but never underestimates it, all in fixed memory
+however many keys there are. The keys with the highest counts seen so far are kept in
+a small top-k table. As with Redis's LFU counters, every count is halved periodically so
+that keys which were hot a while ago fade out.
+
+Created by Gizachew Bayness Kassa on 2025-05-06
+"""
+
+from array import array
+from typing import Dict, List, Tuple
+
+# Default sketch dimensions: 4 rows of 2048 counters (32 KB)
+DEFAULT_SKETCH_WIDTH = 2048
+DEFAULT_SKETCH_DEPTH = 4
+
+# Default number of keys reported
+DEFAULT_TOP_K = 16
+
+# Counts are halved after this many accesses
+DEFAULT_DECAY_INTERVAL = 1000000
+
+
+class CountMinSketch:
+    """
+    CountMinSketch - Approximate per-key counters in fixed memory.
+    """
+
+    def __init__(
+        self, width: int = DEFAULT_SKETCH_WIDTH, depth: int = DEFAULT_SKETCH_DEPTH
+    ):
+        self.width = width
+        self.rows = [array("L", [0]) * width for _ in range(depth)]
+
+    def add(self, key: str) -> int:
+        """Count one access to key. Returns the estimated count of key."""
+        digest = hash(key)
+        # Double hashing: row i uses h1 + i * h2
+        h1, h2 = digest & 0xFFFFFFFF, (digest >> 32) | 1
+        width = self.width
+        estimate = None
+        for row in self.rows:
+            index = h1 % width
+            count = row[index] + 1
+            row[index] = count
+            if estimate is None or count < estimate:
+                estimate = count
+            h1 += h2
+        return estimate
+
+    def decay(self):
+        """Halve every counter."""
+        for row in self.rows:
+            for index, count in enumerate(row):
+                if count:
+                    row[index] = count >> 1
+
+
+class HotKeys:
+    """
+    HotKeys - Tracks the k most accessed keys.
+    """
+
+    def __init__(
+        self,
+        k: int = DEFAULT_TOP_K,
+        width: int = DEFAULT_SKETCH_WIDTH,
+        depth: int = DEFAULT_SKETCH_DEPTH,
+        decay_interval: int = DEFAULT_DECAY_INTERVAL,
+    ):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.decay_interval = decay_interval
+        self.accesses = 0  # Accesses since the last decay
+        self.top: Dict[str, int] = {}  # Key -> estimated count, for the top k keys
+        self.min_count = 0  # Smallest count in top once it is full
+
+    def touch(self, key: str):
+        """Count an access to key."""
+        count = self.sketch.add(key)
+        top = self.top
+        if key in top or len(top) < self.k:
+            top[key] = count
+        elif count > self.min_count:
+            # Replace the coldest of the top keys
+            del top[min(top, key=top.get)]
+            top[key] = count
+        if len(top) >= self.k:
+            self.min_count = min(top.values())
+        self._tick()
+
+    def _tick(self):
+        """Decay every count once decay_interval accesses have been counted."""
+        self.accesses += 1
+        if self.accesses >= self.decay_interval:
+            self.accesses = 0
+            self.sketch.decay()
+            for key in self.top:
+                self.top[key] >>= 1
+            self.min_count >>= 1
+
+    def hottest(self, count: int = None) -> List[Tuple[str, int]]:
+        """Returns up to count (key, estimated accesses) pairs, hottest first."""
+        ranked = sorted(self.top.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:count] if count else ranked
@@ -0,0 +1,358 @@
+"""
+file: src/data/hyperloglog.py
+
+This file contains the HyperLogLog value type used by the PFADD, PFCOUNT and PFMERGE
+commands of the Redis clone server.
+
+The layout follows Redis: 16384 registers (14 index bits), each holding the length of
+the run of zeros seen in the remaining 50 hash bits, plus one. Small cardinalities use
+Redis's sparse run-length encoding:
+
+- ZERO   00xxxxxx           - a run of 1-64 zero registers
+- XZERO  01xxxxxx yyyyyyyy  - a run of 1-16384 zero registers
+- VAL    1vvvvvxx           - a run of 1-4 registers set to 1-32
+
+Once the sparse form grows past SPARSE_MAX_BYTES, or a register needs a value above
+32, it is promoted to the dense form. Dense registers are stored one per byte rather
+than packed six bits apiece, so merging can compare all registers at once as a single
+big integer instead of looping over them in Python.
+
+Created by Gizachew Bayness Kassa on 2025-04-28
+"""
+
+import math
+from hashlib import blake2b
+from typing import Dict, Iterator, List, Tuple, Union
+
+HLL_P = 14  # Number of hash bits used to select a register
+HLL_Q = 64 - HLL_P  # Number of hash bits used to count zeros
+HLL_REGISTERS = 1 << HLL_P  # 16384 registers
+HLL_P_MASK = HLL_REGISTERS - 1
+HLL_ALPHA_INF = 0.5 / math.log(2)
+
+# Sparse form is promoted to dense beyond this size (Redis's hll-sparse-max-bytes)
+SPARSE_MAX_BYTES = 3000
+SPARSE_VAL_MAX_VALUE = 32
+SPARSE_VAL_MAX_LEN = 4
+SPARSE_ZERO_MAX_LEN = 64
+SPARSE_XZERO_MAX_LEN = 16384
+# Larger batches of updates re-encode the sparse form once instead of splicing each
+SPARSE_SPLICE_MAX_UPDATES = 16
+
+# Top bit of every register, used to take the register-wise maximum of two arrays
+_HIGH_BITS = int.from_bytes(b"\x80" * HLL_REGISTERS, "little")
+
+
+def hash_element(element: Union[str, bytes, bytearray]) -> Tuple[int, int]:
+    """
+    Hash an element to its register index and count.
+
+    Returns:
+        (index, count) where count is the number of trailing zeros in the upper 50 bits
+        of the hash, plus one.
+    """
+    if isinstance(element, str):
+        # Binary elements were decoded with surrogateescape, hash their raw bytes
+        element = element.encode(errors="surrogateescape")
+    hash_value = int.from_bytes(blake2b(element, digest_size=8).digest(), "little")
+    index = hash_value & HLL_P_MASK
+    # The sentinel bit caps the count at HLL_Q + 1 when every bit is zero
+    hash_value = (hash_value >> HLL_P) | (1 << HLL_Q)
+    return index, (hash_value & -hash_value).bit_length()
+
+
+def _sigma(x: float) -> float:
+    """Helper of the Ertl cardinality estimator for the zero-register term."""
+    if x == 1.0:
+        return math.inf
+    y = 1.0
+    z = x
+    while True:
+        x *= x
+        z_prime = z
+        z += x * y
+        y += y
+        if z_prime == z:
+            return z
+
+
+def _tau(x: float) -> float:
+    """Helper of the Ertl cardinality estimator for the saturated-register term."""
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y = 1.0
+    z = 1 - x
+    while True:
+        x = math.sqrt(x)
+        z_prime = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z_prime == z:
+            return z / 3
+
+
+def _register_max(first: bytes, second: bytes) -> bytes:
+    """
+    Return the register-wise maximum of two dense register arrays.
+
+    Every register is below 128, so each byte has a free top bit. Setting it in one
+    operand before subtracting the other leaves it set exactly where that register is
+    the larger one, without borrowing across bytes (SIMD within a register).
+    """
+    a = int.from_bytes(first, "little")
+    b = int.from_bytes(second, "little")
+    greater_or_equal = ((a | _HIGH_BITS) - b) & _HIGH_BITS
+    mask = (greater_or_equal >> 7) * 0xFF
+    return (b ^ ((a ^ b) & mask)).to_bytes(HLL_REGISTERS, "little")
+
+
+class HyperLogLog:
+    """
+    HyperLogLog - A probabilistic counter of distinct elements.
+
+    The estimated cardinality is cached and only recomputed after a register changes.
+    """
+
+    def __init__(self):
+        self.sparse = True
+        # A new HyperLogLog is a single XZERO run covering every register
+        self.registers = self._encode_sparse({})
+        self._cached_cardinality = None
+
+    def add(self, *elements: Union[str, bytes, bytearray]) -> bool:
+        """
+        Add elements to the HyperLogLog.
+
+        Returns:
+            True if at least one register was updated.
+        """
+        updates = {}
+        for element in elements:
+            index, count = hash_element(element)
+            if count > updates.get(index, 0):
+                updates[index] = count
+        if not updates:
+            return False
+
+        if self.sparse:
+            changed = self._add_sparse(updates)
+        else:
+            changed = self._add_dense(updates)
+        if changed:
+            self._cached_cardinality = None
+        return changed
+
+    def count(self) -> int:
+        """Returns the estimated number of distinct elements added."""
+        if self._cached_cardinality is None:
+            self._cached_cardinality = self._estimate(self._histogram())
+        return self._cached_cardinality
+
+    def merge(self, *others: "HyperLogLog"):
+        """Merge other HyperLogLogs into this one, promoting it to the dense form."""
+        registers = self.dense_registers()
+        for other in others:
+            registers = _register_max(registers, other.dense_registers())
+        self.sparse = False
+        self.registers = bytearray(registers)
+        self._cached_cardinality = None
+
+    @classmethod
+    def union(cls, hlls: List["HyperLogLog"]) -> "HyperLogLog":
+        """Returns a new HyperLogLog holding the union of the given ones."""
+        result = cls()
+        result.merge(*hlls)
+        return result
+
+    def dense_registers(self) -> bytes:
+        """Returns the registers as one byte per register."""
+        if not self.sparse:
+            return self.registers
+        registers = bytearray(HLL_REGISTERS)
+        for index, value in self._decode_sparse().items():
+            registers[index] = value
+        return registers
+
+    def _add_dense(self, updates: Dict[int, int]) -> bool:
+        """Apply register updates to the dense form."""
+        registers = self.registers
+        changed = False
+        for index, count in updates.items():
+            if count > registers[index]:
+                registers[index] = count
+                changed = True
+        return changed
+
+    def _add_sparse(self, updates: Dict[int, int]) -> bool:
+        """Apply register updates to the sparse form, promoting it if needed."""
+        if len(updates) > SPARSE_SPLICE_MAX_UPDATES:
+            return self._rebuild_sparse(updates)
+
+        changed = False
+        for index, count in updates.items():
+            if self.sparse and count <= SPARSE_VAL_MAX_VALUE:
+                changed |= self._splice_sparse(index, count)
+                if len(self.registers) > SPARSE_MAX_BYTES:
+                    self._promote()
+                continue
+            if self.sparse:
+                self._promote()
+            if count > self.registers[index]:
+                self.registers[index] = count
+                changed = True
+        return changed
+
+    def _splice_sparse(self, index: int, count: int) -> bool:
+        """Raise one register in place by replacing the opcode that covers it."""
+        data = self.registers
+        position = first = 0
+        while True:
+            opcode = data[position]
+            if opcode & 0x80:  # VAL
+                value, run_length, size = (
+                    ((opcode >> 2) & 0x1F) + 1,
+                    (opcode & 0x03) + 1,
+                    1,
+                )
+            elif opcode & 0x40:  # XZERO
+                value, run_length, size = (
+                    0,
+                    (((opcode & 0x3F) << 8) | data[position + 1]) + 1,
+                    2,
+                )
+            else:  # ZERO
+                value, run_length, size = 0, (opcode & 0x3F) + 1, 1
+            if index < first + run_length:
+                break
+            first += run_length
+            position += size
+        if count <= value:
+            return False
+
+        # Split the run into the registers before, the register itself and those after
+        replacement = bytearray()
+        self._emit_run(replacement, value, index - first)
+        self._emit_run(replacement, count, 1)
+        self._emit_run(replacement, value, first + run_length - index - 1)
+        data[position : position + size] = replacement
+        return True
+
+    def _rebuild_sparse(self, updates: Dict[int, int]) -> bool:
+        """Apply many register updates at once by decoding and re-encoding."""
+        values = self._decode_sparse()
+        changed = False
+        for index, count in updates.items():
+            if count > values.get(index, 0):
+                values[index] = count
+                changed = True
+        if not changed:
+            return False
+
+        encoded = None
+        if max(values.values()) <= SPARSE_VAL_MAX_VALUE:
+            encoded = self._encode_sparse(values)
+        if encoded is None or len(encoded) > SPARSE_MAX_BYTES:
+            self._promote(values)
+        else:
+            self.registers = encoded
+        return True
+
+    def _promote(self, values: Dict[int, int] = None):
+        """Convert to the dense form, given the non-zero registers if already decoded."""
+        if values is None:
+            registers = self.dense_registers()
+        else:
+            registers = bytearray(HLL_REGISTERS)
+            for index, value in values.items():
+                registers[index] = value
+        self.sparse = False
+        self.registers = registers
+
+    def _sparse_runs(self) -> Iterator[Tuple[int, int]]:
+        """Yields the (value, run length) pairs of the sparse encoding."""
+        data = self.registers
+        position = 0
+        while position < len(data):
+            opcode = data[position]
+            if opcode & 0x80:  # VAL
+                yield ((opcode >> 2) & 0x1F) + 1, (opcode & 0x03) + 1
+                position += 1
+            elif opcode & 0x40:  # XZERO
+                yield 0, (((opcode & 0x3F) << 8) | data[position + 1]) + 1
+                position += 2
+            else:  # ZERO
+                yield 0, (opcode & 0x3F) + 1
+                position += 1
+
+    def _decode_sparse(self) -> Dict[int, int]:
+        """Returns the non-zero registers of the sparse encoding by index."""
+        values = {}
+        index = 0
+        for value, run_length in self._sparse_runs():
+            if value:
+                for offset in range(run_length):
+                    values[index + offset] = value
+            index += run_length
+        return values
+
+    @staticmethod
+    def _encode_sparse(values: Dict[int, int]) -> bytearray:
+        """Encode the non-zero registers, given by index, in the sparse format."""
+        encoded = bytearray()
+        position = 0  # First register not yet encoded, or start of the current run
+        run_value = run_length = 0
+        for index in sorted(values):
+            value = values[index]
+            if run_length and index == position + run_length and value == run_value:
+                run_length += 1
+                continue
+            if run_length:
+                HyperLogLog._emit_run(encoded, run_value, run_length)
+                position += run_length
+            HyperLogLog._emit_run(encoded, 0, index - position)
+            position = index
+            run_value, run_length = value, 1
+        if run_length:
+            HyperLogLog._emit_run(encoded, run_value, run_length)
+            position += run_length
+        HyperLogLog._emit_run(encoded, 0, HLL_REGISTERS - position)
+        return encoded
+
+    @staticmethod
+    def _emit_run(encoded: bytearray, value: int, run_length: int):
+        """Append the opcodes for a run of registers holding the same value."""
+        while run_length > 0:
+            if value:
+                chunk = min(run_length, SPARSE_VAL_MAX_LEN)
+                encoded.append(0x80 | ((value - 1) << 2) | (chunk - 1))
+            elif run_length <= SPARSE_ZERO_MAX_LEN:
+                chunk = run_length
+                encoded.append(chunk - 1)
+            else:
+                chunk = min(run_length, SPARSE_XZERO_MAX_LEN)
+                encoded.append(0x40 | ((chunk - 1) >> 8))
+                encoded.append((chunk - 1) & 0xFF)
+            run_length -= chunk
+
+    def _histogram(self) -> List[int]:
+        """Returns how many registers hold each possible value."""
+        histogram = [0] * (HLL_Q + 2)
+        if self.sparse:
+            for value, run_length in self._sparse_runs():
+                histogram[value] += run_length
+        else:
+            # bytearray.count scans in C, and only values up to the maximum can occur
+            for value in range(max(self.registers) + 1):
+                histogram[value] = self.registers.count(value)
+        return histogram
+
+    @staticmethod
+    def _estimate(histogram: List[int]) -> int:
+        """Ertl's improved raw estimator, as used by Redis."""
+        m = HLL_REGISTERS
+        z = m * _tau((m - histogram[HLL_Q + 1]) / m)
+        for j in range(HLL_Q, 0, -1):
+            z += histogram[j]
+            z *= 0.5
+        z += m * _sigma(histogram[0] / m)
+        return round(HLL_ALPHA_INF * m * m / z)
@@ -0,0 +1,140 @@
+"""
+file: src/data/lazyfree.py
+
+This file contains the LazyFree class, which reclaims deleted values in a background
+thread so that UNLINK, FLUSHALL ASYNC and FLUSHDB ASYNC do not stall the event loop.
+
+The background thread still needs the GIL to deallocate objects, and a single C call
+such as dict.clear() holds it until every element is gone: about 200 ms for a keyspace
+of 3M keys, during which the event loop cannot run. Large dicts, lists and streams are
+therefore torn down about LAZYFREE_BATCH elements at a time, and the GIL is released
+between batches. Large values found in a flushed keyspace are torn down the same way.
+
+Created by Gizachew Bayness Kassa on 2025-04-24
+"""
+
+import threading
+import time
+from queue import Queue
+
+from src.data.stream import STREAM_NODE_MAX_ENTRIES, Stream
+
+# Values whose free effort is at or below this are released inline, as in Redis
+LAZYFREE_THRESHOLD = 64
+
+# Number of elements released by the background thread before it yields the GIL
+LAZYFREE_BATCH = 1024
+
+
+def free_effort(value) -> int:
+    """
+    Estimate how much work releasing a value takes.
+
+    Strings are a single allocation no matter how long they are, while containers
+    cost roughly one deallocation per element.
+    """
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return 1
+    try:
+        return max(len(value), 1)
+    except TypeError:
+        return 1
+
+
+class LazyFree:
+    """
+    LazyFree - A background reclamation thread for detached values.
+
+    Values handed to ``free`` have already been removed from the keyspace; the worker
+    thread only drops the last references to them. The number of objects that are still
+    waiting to be released is exposed through ``pending`` for the INFO command.
+    """
+
+    def __init__(self):
+        self._queue = Queue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._thread = None
+
+    @property
+    def pending(self) -> int:
+        """Returns the number of objects waiting to be freed."""
+        return self._pending
+
+    def free(self, value, effort: int = None, objects: int = 1) -> bool:
+        """
+        Release a value, in the background if it is expensive to tear down.
+
+        Args:
+            effort: Cost of tearing the value down, estimated with free_effort if None.
+            objects: Number of objects the value counts for in pending, e.g. the number
+                of keys of a flushed keyspace.
+        Returns:
+            True if the value was queued for the background thread, False if it was
+            cheap enough to be released inline.
+        """
+        if effort is None:
+            effort = free_effort(value)
+        if effort <= LAZYFREE_THRESHOLD:
+            return False
+        with self._lock:
+            self._pending += objects
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="lazyfree", daemon=True
+                )
+                self._thread.start()
+        self._queue.put((value, objects))
+        return True
+
+    def drain(self):
+        """Blocks until every queued value has been freed."""
+        self._queue.join()
+
+    def _run(self):
+        """Worker loop: drop the references to queued values one at a time."""
+        while True:
+            value, objects = self._queue.get()
+            self._teardown(value)
+            del value
+            with self._lock:
+                self._pending -= objects
+            self._queue.task_done()
+
+    def _teardown(self, value):
+        """Empty a dict, list or stream in batches, yielding the GIL between batches.
+        Other values are left to be released by the caller in one go."""
+        if isinstance(value, Stream):
+            for group in value.groups.values():
+                self._teardown(group.pel)
+                for pending in group.consumers.values():
+                    self._teardown(pending)
+            # Each chunk holds up to STREAM_NODE_MAX_ENTRIES entries
+            self._teardown_list(
+                value.chunks, max(LAZYFREE_BATCH // STREAM_NODE_MAX_ENTRIES, 1)
+            )
+            self._teardown_list(value.first_ids, LAZYFREE_BATCH)
+        elif isinstance(value, dict):
+            popitem = value.popitem
+            while value:
+                for _ in range(min(len(value), LAZYFREE_BATCH)):
+                    _, item = popitem()
+                    # Keyspace entries are (value, expire_time) tuples
+                    if isinstance(item, tuple) and item:
+                        item = item[0]
+                    if free_effort(item) > LAZYFREE_THRESHOLD:
+                        self._teardown(item)
+                time.sleep(0)  # Let the event loop thread take the GIL
+        elif isinstance(value, list):
+            self._teardown_list(value, LAZYFREE_BATCH)
+
+    @staticmethod
+    def _teardown_list(value: list, batch: int):
+        """Empty a list batch items at a time from the end, yielding the GIL."""
+        while value:
+            del value[-batch:]
+            time.sleep(0)  # Let the event loop thread take the GIL
+
+
+# Shared reclamation thread used by every Storage instance, like Redis's bio thread
+lazyfree = LazyFree()
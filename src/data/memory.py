@@ -0,0 +1,78 @@
+"""
+file: src/data/memory.py
+
+This file estimates the memory used by keys of the Redis clone server, for MEMORY USAGE
+and DEBUG BIGKEYS.
+
+Strings and HyperLogLogs are measured exactly. For streams, like Redis does for
+aggregate types, only a few chunks are measured and their average size is multiplied
+by the number of chunks, so the estimate costs the same however long the stream is.
+
+Created by Gizachew Bayness Kassa on 2025-05-06
+"""
+
+import sys
+from itertools import islice
+
+from src.data.hyperloglog import HyperLogLog
+from src.data.stream import PendingEntry, Stream, StreamChunk
+
+# Default number of nested elements measured (same as Redis's MEMORY USAGE)
+DEFAULT_SAMPLES = 5
+
+# Size of the (value, expire_time) tuple of a key and of its slot in the keyspace dict
+ENTRY_OVERHEAD = sys.getsizeof((None, None)) + 3 * 8
+
+# Size of a pending entry, its ID and its slots in the PEL and consumer dicts
+PENDING_ENTRY_SIZE = sys.getsizeof(PendingEntry("")) + sys.getsizeof((0, 0)) + 2 * 3 * 8
+
+
+def memory_usage(key: str, value, samples: int = DEFAULT_SAMPLES) -> int:
+    """
+    Estimate the bytes used by a key and its value.
+
+    Args:
+        samples: Number of nested elements measured, or 0 to measure all of them.
+    """
+    return ENTRY_OVERHEAD + sys.getsizeof(key) + value_size(value, samples)
+
+
+def value_size(value, samples: int = DEFAULT_SAMPLES) -> int:
+    """Estimate the bytes used by a value."""
+    if isinstance(value, Stream):
+        return stream_size(value, samples)
+    if isinstance(value, HyperLogLog):
+        return (
+            sys.getsizeof(value)
+            + sys.getsizeof(vars(value))
+            + sys.getsizeof(value.registers)
+        )
+    return sys.getsizeof(value)
+
+
+def stream_size(stream: Stream, samples: int = DEFAULT_SAMPLES) -> int:
+    """Estimate the bytes used by a stream, measuring up to samples chunks."""
+    size = sys.getsizeof(stream) + sys.getsizeof(vars(stream))
+    size += sys.getsizeof(stream.chunks) + sys.getsizeof(stream.first_ids)
+    size += len(stream.first_ids) * sys.getsizeof(stream.last_id)
+    if stream.chunks:
+        sampled = list(islice(stream.chunks, samples or None))
+        sampled_size = sum(chunk_size(chunk) for chunk in sampled)
+        size += sampled_size * len(stream.chunks) // len(sampled)
+    for group in stream.groups.values():
+        size += sys.getsizeof(group) + sys.getsizeof(group.pel)
+        size += len(group.pel) * PENDING_ENTRY_SIZE
+    return size
+
+
+def chunk_size(chunk: StreamChunk) -> int:
+    """Measure the bytes used by a stream chunk and the entries it holds."""
+    size = sys.getsizeof(chunk) + sys.getsizeof(chunk.master_fields)
+    size += sum(map(sys.getsizeof, chunk.master_fields))
+    size += sys.getsizeof(chunk.ms_deltas) + sys.getsizeof(chunk.seq_deltas)
+    size += sys.getsizeof(chunk.field_names) + sys.getsizeof(chunk.values)
+    for names, values in zip(chunk.field_names, chunk.values):
+        if names is not None:
+            size += sys.getsizeof(names) + sum(map(sys.getsizeof, names))
+        size += sys.getsizeof(values) + sum(map(sys.getsizeof, values))
+    return size
@@ -6,7 +6,12 @@ This file contains the implementation of the Storage class for the Redis clone s
 Created by Gizachew Bayness Kassa on 2025-02-19
 """
 
+import math
+import random
 import time
+from itertools import islice
+
+from src.data.lazyfree import LazyFree, lazyfree
 
 
 class Storage:
@@ -14,30 +19,215 @@ class Storage:
     Storage - A simple key-value storage class for the Redis clone server.
 
     The Storage class provides methods to set, get, and delete key-value pairs.
+    Expensive values can be detached from the keyspace and reclaimed in the background
+    through a LazyFree instance (see unlink and flush). The number of keys with a TTL is
+    kept incrementally in ``expires`` so DBSIZE and INFO keyspace never scan the data.
     """
 
-    def __init__(self):
+    def __init__(
+        self, lazyfree: LazyFree = lazyfree, lazyfree_lazy_expire: bool = False
+    ):
         self.data = {}  # Initialize an empty dictionary to store key-value pairs
+        self.lazyfree = lazyfree  # Background reclamation for detached values
+        # Free expired keys in the background instead of on the event loop
+        self.lazyfree_lazy_expire = lazyfree_lazy_expire
+        self.expires = 0  # Number of keys that have an expiration time
+        # Client tracking table to notify of modified keys, while any client tracks
+        self.tracking = None
+        # Key -> futures of the clients blocked until the key is appended to (XREAD)
+        self.waiters = {}
+        # Access counters for DEBUG HOTKEYS, only while it is enabled
+        self.hotkeys = None
 
     def set(self, key: str, value: str, ttl: int = None) -> str:
         """Stores a key-value pair."""
         # Create expiration time if ttl is provided
         expire_time = ttl + time.time() if ttl is not None else None
+        if self.hotkeys is not None:
+            self.hotkeys.touch(key)
+        old_entry = self.data.get(key)
+        if old_entry is not None and old_entry[1] is not None:
+            self.expires -= 1
+        if expire_time is not None:
+            self.expires += 1
         self.data[key] = (value, expire_time)
+        self.signal_modified(key)
         return "OK"
 
     def get(self, key: str) -> str:
         """Retrieves the value of a key, or (nil) if not found."""
+        if self.hotkeys is not None:
+            self.hotkeys.touch(key)
         # Check if the key exists and has not expired
         value, expire_time = self.data.get(key, (None, None))
         if expire_time and expire_time < time.time():
-            self.delete(key)
+            self._delete_expired(key)
             return "(nil)"
         return value if value is not None else "(nil)"
 
+    def lookup(self, key: str, touch: bool = True):
+        """Retrieves the value of a key, or None if not found. Unlike get, values of
+        any type are returned as they are stored. With touch False, the access is not
+        counted by DEBUG HOTKEYS, e.g. when inspecting keys."""
+        if touch and self.hotkeys is not None:
+            self.hotkeys.touch(key)
+        entry = self._live_entry(key)
+        return entry[0] if entry is not None else None
+
+    def update(self, key: str, value) -> str:
+        """Replaces the value of a key, keeping its TTL if it already exists."""
+        entry = self._live_entry(key)
+        if entry is None:
+            return self.set(key, value)
+        self.data[key] = (value, entry[1])
+        self.signal_modified(key)
+        return "OK"
+
     def delete(self, key: str) -> str:
         """Deletes a key if it exists."""
-        return self.data.pop(key, "(nil)")
+        entry = self._remove(key)
+        return entry if entry is not None else "(nil)"
+
+    def unlink(self, key: str) -> int:
+        """Detaches a key from the keyspace and frees its value in the background.
+        Returns:
+            1 if the key was removed, or 0 if it does not exist.
+        """
+        entry = self._remove(key)
+        if entry is None:
+            return 0
+        value, expire_time = entry
+        self.lazyfree.free(value)
+        # A key that had already expired was not visible, so it does not count
+        return 0 if expire_time and expire_time < time.time() else 1
+
+    def flush(self, asynchronous: bool = False) -> str:
+        """Removes every key. With asynchronous, the old keyspace is freed in the background."""
+        old_data, self.data = self.data, {}
+        self.expires = 0
+        if old_data and self.tracking is not None:
+            self.tracking.invalidate_all()
+        if self.waiters:
+            self.signal_all_ready()
+        if not asynchronous or not old_data:
+            old_data.clear()
+        else:
+            # Always freed in the background, like Redis: even a few keys may hold
+            # huge values, which free_effort(old_data) would not see
+            self.lazyfree.free(old_data, effort=math.inf, objects=len(old_data))
+        return "OK"
+
+    def move(self, key: str, target: "Storage") -> int:
+        """Moves a key, along with its TTL, to another storage.
+        Returns:
+            1 if the key was moved, or 0 if it does not exist here or already exists
+            in the target.
+        """
+        if self._live_entry(key) is None or target._live_entry(key) is not None:
+            return 0
+        value, expire_time = self._remove(key)
+        target.data[key] = (value, expire_time)
+        if expire_time is not None:
+            target.expires += 1
+        target.signal_modified(key)
+        return 1
+
+    def signal_modified(self, key: str):
+        """Notifies client tracking that a key was written, deleted or expired, and wakes
+        the clients blocked on it so they can see it changed (e.g. XREADGROUP replies
+        NOGROUP once its stream is gone). Commands that modify a value in place must
+        call it themselves."""
+        if self.tracking is not None:
+            self.tracking.invalidate(key)
+        if self.waiters:
+            self.signal_ready(key)
+
+    def add_waiter(self, key: str, future):
+        """Registers a future to be resolved the next time key is signaled ready."""
+        self.waiters.setdefault(key, set()).add(future)
+
+    def remove_waiter(self, key: str, future):
+        """Unregisters a future, e.g. once its client timed out."""
+        futures = self.waiters.get(key)
+        if futures is not None:
+            futures.discard(future)
+            if not futures:
+                del self.waiters[key]
+
+    def signal_all_ready(self):
+        """Wakes up every blocked client, e.g. after a flush or SWAPDB replaced the keys
+        they were waiting on."""
+        for key in list(self.waiters):
+            self.signal_ready(key)
+
+    def signal_ready(self, key: str):
+        """Wakes up the clients blocked on a key, e.g. after XADD appended to it."""
+        for future in self.waiters.pop(key, ()):
+            if not future.done():
+                future.set_result(key)
+
+    def populate(self, count: int, prefix: str = "key", size: int = None) -> int:
+        """Creates the keys <prefix>:0 to <prefix>:<count - 1> for load tests, set to
+        "value:<n>", truncated or padded with NUL characters to size if given.
+        Existing keys are left untouched.
+        Returns:
+            The number of keys created.
+        """
+        data = self.data
+        created = 0
+        for index in range(count):
+            key = f"{prefix}:{index}"
+            if key in data:
+                continue
+            value = f"value:{index}"
+            if size is not None:
+                value = value[:size].ljust(size, "\0")
+            data[key] = (value, None)
+            created += 1
+            self.signal_modified(key)
+        return created
+
+    def sample_keys(self, count: int) -> list:
+        """Returns up to count distinct keys picked at random, possibly expired.
+        Random positions are drawn first and the keyspace is walked once up to the
+        last of them, so the keys are never copied into a full list."""
+        if len(self.data) <= count:
+            return list(self.data)
+        keys = iter(self.data)
+        sample = []
+        position = 0
+        for index in sorted(random.sample(range(len(self.data)), count)):
+            # Skip to index without creating the keys in between
+            sample.append(next(islice(keys, index - position, None)))
+            position = index + 1
+        return sample
+
+    def dbsize(self) -> int:
+        """Returns the number of keys, including expired keys not yet reclaimed."""
+        return len(self.data)
+
+    def _live_entry(self, key: str):
+        """Returns the (value, expire_time) entry of a key, or None if it is missing or expired."""
+        entry = self.data.get(key)
+        if entry is not None and entry[1] and entry[1] < time.time():
+            self._delete_expired(key)
+            return None
+        return entry
+
+    def _remove(self, key: str):
+        """Pops the entry of a key, keeping the expires count up to date."""
+        entry = self.data.pop(key, None)
+        if entry is not None:
+            if entry[1] is not None:
+                self.expires -= 1
+            self.signal_modified(key)
+        return entry
+
+    def _delete_expired(self, key: str):
+        """Removes an expired key, lazily if lazyfree_lazy_expire is enabled."""
+        value, _ = self._remove(key)
+        if self.lazyfree_lazy_expire:
+            self.lazyfree.free(value)
 
     def keys(self) -> str:
         """Returns a list of all keys in the storage."""
@@ -57,7 +247,10 @@ class Storage:
             return 0
         expire_time = ttl + time.time()
         _, old_expire_time = self.data[key]
+        if old_expire_time is None:
+            self.expires += 1
         self.data[key] = (self.data[key][0], expire_time)
+        self.signal_modified(key)
         return 1
 
     def ttl(self, key: str) -> int:
@@ -69,7 +262,7 @@ class Storage:
             return -1
         # check if the key has expired
         if expire_time < time.time():
-            self.delete(key)
+            self._delete_expired(key)
             return -2
         ttl = expire_time - time.time()
         return int(ttl)
@@ -0,0 +1,408 @@
+"""
+file: src/data/stream.py
+
+This file contains the Stream value type used by the XADD, XRANGE, XREAD, XREADGROUP,
+XACK and related commands of the Redis clone server.
+
+Entries are appended to fixed-size chunks, like the listpacks of a Redis radix tree
+node. Each chunk stores the IDs of its entries as deltas from the chunk's base ID in
+compact int64 arrays. It stores the field names once for all entries that share the
+field names of the chunk's first entry. Chunks are indexed by their first ID in a sorted
+list, so a range seek is a binary search over chunks followed by one over the IDs of a
+single chunk, O(log N). MAXLEN and MINID trimming drop whole chunks from the head, and
+only trim inside a chunk when an exact trim is requested.
+
+Created by Gizachew Bayness Kassa on 2025-05-04
+"""
+
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+StreamID = Tuple[int, int]  # (milliseconds, sequence number)
+
+# Maximum number of entries per chunk (same as Redis's stream-node-max-entries)
+STREAM_NODE_MAX_ENTRIES = 100
+
+MAX_SEQ = (1 << 64) - 1
+# Range of the int64 deltas stored in a chunk
+MAX_DELTA = (1 << 63) - 1
+MIN_ID: StreamID = (0, 0)
+MAX_ID: StreamID = ((1 << 64) - 1, MAX_SEQ)
+
+
+class StreamIDError(ValueError):
+    """
+    StreamIDError - Raised for malformed stream IDs or IDs that cannot be added.
+    """
+
+
+def format_id(entry_id: StreamID) -> str:
+    """Format a stream ID as "<ms>-<seq>"."""
+    return f"{entry_id[0]}-{entry_id[1]}"
+
+
+def parse_id(id_str: str, missing_seq: int = 0) -> StreamID:
+    """
+    Parse a "<ms>-<seq>" stream ID. A bare "<ms>" uses missing_seq as its sequence.
+
+    Raises:
+        StreamIDError: If the ID is malformed.
+    """
+    ms_str, _, seq_str = id_str.partition("-")
+    try:
+        ms = int(ms_str)
+        seq = int(seq_str) if seq_str else missing_seq
+    except ValueError:
+        raise StreamIDError(
+            "ERR Invalid stream ID specified as stream command argument"
+        )
+    if not (0 <= ms <= MAX_ID[0] and 0 <= seq <= MAX_SEQ) or ms_str.startswith("+"):
+        raise StreamIDError(
+            "ERR Invalid stream ID specified as stream command argument"
+        )
+    return ms, seq
+
+
+def next_id(entry_id: StreamID) -> StreamID:
+    """Returns the smallest ID greater than entry_id."""
+    ms, seq = entry_id
+    if seq < MAX_SEQ:
+        return ms, seq + 1
+    return ms + 1, 0
+
+
+def previous_id(entry_id: StreamID) -> StreamID:
+    """Returns the greatest ID smaller than entry_id."""
+    ms, seq = entry_id
+    if seq > 0:
+        return ms, seq - 1
+    return ms - 1, MAX_SEQ
+
+
+class StreamChunk:
+    """
+    StreamChunk - Up to STREAM_NODE_MAX_ENTRIES consecutive entries of a stream.
+    """
+
+    __slots__ = (
+        "base_ms",
+        "base_seq",
+        "ms_deltas",
+        "seq_deltas",
+        "master_fields",
+        "field_names",
+        "values",
+    )
+
+    def __init__(self, entry_id: StreamID, fields: Tuple[str, ...]):
+        self.base_ms, self.base_seq = entry_id
+        self.ms_deltas = array("q")
+        self.seq_deltas = array("q")
+        self.master_fields = fields  # Field names shared by most entries
+        self.field_names: List[Optional[Tuple[str, ...]]] = []  # None: master_fields
+        self.values: List[Tuple[str, ...]] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def accepts(self, entry_id: StreamID) -> bool:
+        """Tells whether the chunk has room for entry_id and can encode its deltas."""
+        return (
+            len(self.values) < STREAM_NODE_MAX_ENTRIES
+            and entry_id[0] - self.base_ms <= MAX_DELTA
+            and -MAX_DELTA <= entry_id[1] - self.base_seq <= MAX_DELTA
+        )
+
+    def append(self, entry_id: StreamID, fields: Tuple[str, ...], values: tuple):
+        """Append an entry, which must have a greater ID than every entry here."""
+        self.ms_deltas.append(entry_id[0] - self.base_ms)
+        self.seq_deltas.append(entry_id[1] - self.base_seq)
+        self.field_names.append(None if fields == self.master_fields else fields)
+        self.values.append(values)
+
+    def ids(self) -> List[StreamID]:
+        """Decode the IDs of the entries in this chunk."""
+        base_ms, base_seq = self.base_ms, self.base_seq
+        return [
+            (base_ms + ms_delta, base_seq + seq_delta)
+            for ms_delta, seq_delta in zip(self.ms_deltas, self.seq_deltas)
+        ]
+
+    def id(self, index: int) -> StreamID:
+        """Decode the ID of the entry at index."""
+        return (
+            self.base_ms + self.ms_deltas[index],
+            self.base_seq + self.seq_deltas[index],
+        )
+
+    def seek(self, entry_id: StreamID, inclusive: bool = True) -> int:
+        """
+        Returns the index of the first entry with an ID greater than (or, if inclusive,
+        equal to) entry_id, searching the delta arrays without decoding them.
+        """
+        ms_delta = entry_id[0] - self.base_ms
+        seq_delta = entry_id[1] - self.base_seq
+        ms_deltas, seq_deltas = self.ms_deltas, self.seq_deltas
+        index = bisect_left(ms_deltas, ms_delta)
+        # Entries sharing the millisecond are ordered by their sequence number
+        while (
+            index < len(ms_deltas)
+            and ms_deltas[index] == ms_delta
+            and (
+                seq_deltas[index] < seq_delta
+                if inclusive
+                else seq_deltas[index] <= seq_delta
+            )
+        ):
+            index += 1
+        return index
+
+    def first_id(self) -> StreamID:
+        return self.id(0)
+
+    def last_id(self) -> StreamID:
+        return self.id(-1)
+
+    def entries(self, first: int, stop: int) -> List[Tuple[StreamID, List[str]]]:
+        """Decode the entries from index first up to stop as (id, [field, value, ...])."""
+        base_ms, base_seq, master = self.base_ms, self.base_seq, self.master_fields
+        return [
+            (
+                (base_ms + ms_delta, base_seq + seq_delta),
+                [item for pair in zip(names or master, values) for item in pair],
+            )
+            for ms_delta, seq_delta, names, values in zip(
+                self.ms_deltas[first:stop],
+                self.seq_deltas[first:stop],
+                self.field_names[first:stop],
+                self.values[first:stop],
+            )
+        ]
+
+    def drop_head(self, count: int):
+        """Remove the first count entries. The base ID is kept for the deltas."""
+        del self.ms_deltas[:count]
+        del self.seq_deltas[:count]
+        del self.field_names[:count]
+        del self.values[:count]
+
+
+class PendingEntry:
+    """
+    PendingEntry - A message delivered to a consumer but not acknowledged yet.
+    """
+
+    __slots__ = ("consumer", "delivery_time", "delivery_count")
+
+    def __init__(self, consumer: str):
+        self.consumer = consumer
+        self.delivery_time = time.time()
+        self.delivery_count = 1
+
+
+class ConsumerGroup:
+    """
+    ConsumerGroup - Tracks what a group of consumers has read from a stream.
+
+    The pending entries list (PEL) maps the ID of every delivered, unacknowledged
+    message to its PendingEntry. Each consumer keeps the set of IDs pending for it.
+    """
+
+    def __init__(self, last_id: StreamID):
+        self.last_id = last_id  # ID of the last entry delivered to the group
+        self.pel: Dict[StreamID, PendingEntry] = {}
+        self.consumers: Dict[str, Dict[StreamID, None]] = {}  # Ordered sets of IDs
+
+    def consumer(self, name: str) -> Dict[StreamID, None]:
+        """Returns the pending IDs of a consumer, creating the consumer if needed."""
+        return self.consumers.setdefault(name, {})
+
+    def deliver(self, consumer: str, entry_ids: List[StreamID], noack: bool = False):
+        """Record new entries delivered to a consumer, advancing the group."""
+        if not entry_ids:
+            return
+        self.last_id = entry_ids[-1]
+        if noack:
+            return
+        pending = self.consumer(consumer)
+        for entry_id in entry_ids:
+            self.pel[entry_id] = PendingEntry(consumer)
+            pending[entry_id] = None
+
+    def acknowledge(self, entry_id: StreamID) -> bool:
+        """Remove an entry from the PEL. Returns True if it was pending."""
+        entry = self.pel.pop(entry_id, None)
+        if entry is None:
+            return False
+        self.consumers[entry.consumer].pop(entry_id, None)
+        return True
+
+    def pending_ids(self, consumer: str, after: StreamID, count: int = None):
+        """Returns the IDs pending for a consumer greater than after, in order."""
+        entry_ids = sorted(
+            entry_id for entry_id in self.consumer(consumer) if entry_id > after
+        )
+        return entry_ids[:count] if count else entry_ids
+
+
+class Stream:
+    """
+    Stream - An append-only log of entries with consumer groups.
+    """
+
+    def __init__(self):
+        self.chunks: List[StreamChunk] = []
+        self.first_ids: List[StreamID] = []  # First ID of each chunk, for seeks
+        self.length = 0
+        self.last_id: StreamID = MIN_ID
+        self.groups: Dict[str, ConsumerGroup] = {}
+
+    def __len__(self) -> int:
+        return self.length
+
+    def add(self, fields: List[str], id_str: str = "*") -> StreamID:
+        """
+        Append an entry given as a flat [field, value, ...] list.
+
+        Args:
+            id_str: "*" to generate the ID, "<ms>-*" to generate only the sequence
+                number, or an explicit "<ms>-<seq>".
+        Returns:
+            The ID of the new entry.
+        Raises:
+            StreamIDError: If the ID is malformed or not greater than the last ID.
+        """
+        entry_id = self._new_id(id_str)
+        names, values = tuple(fields[0::2]), tuple(fields[1::2])
+        if not self.chunks or not self.chunks[-1].accepts(entry_id):
+            self.chunks.append(StreamChunk(entry_id, names))
+            self.first_ids.append(entry_id)
+        self.chunks[-1].append(entry_id, names, values)
+        self.length += 1
+        self.last_id = entry_id
+        return entry_id
+
+    def _new_id(self, id_str: str) -> StreamID:
+        """Resolve the ID of a new entry."""
+        last_ms, last_seq = self.last_id
+        if id_str == "*":
+            now = int(time.time() * 1000)
+            return (now, 0) if now > last_ms else next_id(self.last_id)
+
+        if id_str.endswith("-*"):
+            ms, _ = parse_id(id_str[:-2])
+            if ms == last_ms and self.length:
+                if last_seq == MAX_SEQ:
+                    raise StreamIDError(
+                        "ERR The ID specified in XADD is equal or smaller than the "
+                        "target stream top item"
+                    )
+                entry_id = (ms, last_seq + 1)
+            else:
+                entry_id = (ms, 0 if ms else 1)
+        else:
+            entry_id = parse_id(id_str)
+
+        if entry_id == MIN_ID:
+            raise StreamIDError("ERR The ID specified in XADD must be greater than 0-0")
+        if entry_id <= self.last_id:
+            raise StreamIDError(
+                "ERR The ID specified in XADD is equal or smaller than the target "
+                "stream top item"
+            )
+        return entry_id
+
+    def range(
+        self, start: StreamID, end: StreamID, count: int = None
+    ) -> List[Tuple[StreamID, List[str]]]:
+        """Returns up to count entries with start <= ID <= end, oldest first."""
+        result = []
+        if count == 0 or start > end:
+            return result
+        chunk_index = max(bisect_right(self.first_ids, start) - 1, 0)
+        for chunk_index in range(chunk_index, len(self.chunks)):
+            chunk = self.chunks[chunk_index]
+            first = chunk.seek(start) if chunk.first_id() < start else 0
+            stop = len(chunk)
+            if chunk.last_id() > end:
+                stop = chunk.seek(end, inclusive=False)
+            if count:
+                stop = min(stop, first + count - len(result))
+            result.extend(chunk.entries(first, stop))
+            if stop < len(chunk):
+                break
+        return result
+
+    def rev_range(
+        self, end: StreamID, start: StreamID, count: int = None
+    ) -> List[Tuple[StreamID, List[str]]]:
+        """Returns up to count entries with start <= ID <= end, newest first."""
+        result = []
+        if count == 0 or start > end:
+            return result
+        chunk_index = bisect_right(self.first_ids, end) - 1
+        for chunk_index in range(chunk_index, -1, -1):
+            chunk = self.chunks[chunk_index]
+            stop = chunk.seek(end, inclusive=False)
+            first = chunk.seek(start) if chunk.first_id() < start else 0
+            if count:
+                first = max(first, stop - (count - len(result)))
+            result.extend(reversed(chunk.entries(first, stop)))
+            if first > 0:
+                break
+        return result
+
+    def entry(self, entry_id: StreamID) -> Optional[List[str]]:
+        """Returns the fields of an entry, or None if it was trimmed."""
+        entries = self.range(entry_id, entry_id, 1)
+        return entries[0][1] if entries else None
+
+    def trim_maxlen(self, maxlen: int, approximate: bool = False) -> int:
+        """Trim the oldest entries so that at most maxlen remain.
+
+        With approximate, only whole chunks are dropped, so a few more may remain.
+        Returns the number of entries removed.
+        """
+        removed = 0
+        while self.chunks and self.length - len(self.chunks[0]) >= maxlen:
+            removed += self._drop_first_chunk()
+        if not approximate and self.length > maxlen:
+            removed += self._drop_head(self.length - maxlen)
+        return removed
+
+    def trim_minid(self, min_id: StreamID, approximate: bool = False) -> int:
+        """Trim the entries with an ID lower than min_id.
+
+        With approximate, only whole chunks are dropped, so a few more may remain.
+        Returns the number of entries removed.
+        """
+        removed = 0
+        while self.chunks and self.chunks[0].last_id() < min_id:
+            removed += self._drop_first_chunk()
+        if not approximate and self.chunks:
+            removed += self._drop_head(self.chunks[0].seek(min_id))
+        return removed
+
+    def _drop_first_chunk(self) -> int:
+        """Remove the oldest chunk. Returns the number of entries removed."""
+        removed = len(self.chunks.pop(0))
+        self.first_ids.pop(0)
+        self.length -= removed
+        return removed
+
+    def _drop_head(self, count: int) -> int:
+        """Remove the first count entries of the oldest chunk."""
+        if count <= 0:
+            return 0
+        chunk = self.chunks[0]
+        chunk.drop_head(count)
+        self.first_ids[0] = chunk.first_id()
+        self.length -= count
+        return count
+
+    def iter_ids(self) -> Iterator[StreamID]:
+        """Yields every entry ID, oldest first."""
+        for chunk in self.chunks:
+            yield from chunk.ids()
@@ -0,0 +1,251 @@
+"""
+client.py - Redis Clone Client Library Module
+
+This module implements an asyncio client for the Redis clone server. Commands are sent
+as multibulk requests, so values may contain spaces, newlines or binary data.
+
+With client_cache enabled, the client turns on CLIENT TRACKING and keeps the values it
+reads with GET and MGET in a local LRU cache. The server pushes an invalidation message
+whenever one of those keys changes, and the client drops it from the cache, so repeated
+reads of hot keys are served without a round trip.
+
+Usage:
+    client = RedisCloneClient(port=6378, client_cache=True)
+    await client.connect()
+    await client.set("key", "value")
+    await client.get("key")  # Sent to the server
+    await client.get("key")  # Served from the local cache
+    await client.close()
+
+Created by Gizachew Bayness Kassa on 2025-05-02
+"""
+
+from asyncio import Lock, Queue, StreamReader, create_task, open_connection
+from collections import OrderedDict
+from typing import List, Optional, Union
+
+from src.network.protocol import BULK_DECODE_LIMIT, ENCODING_ERRORS, RedisProtocol
+
+# Invalidation messages pushed by the server: ">invalidate $<len>" followed by the key
+# on its own line, or ">invalidate" alone when every key was flushed
+INVALIDATE_PUSH = b">invalidate"
+
+Reply = Union[str, bytes]
+
+
+class RedisCloneClient:
+    """
+    RedisCloneClient - An asyncio client with optional client side caching.
+
+    A background task reads everything the server sends: invalidation messages are
+    applied to the cache as soon as they arrive, and replies are queued for the command
+    waiting on them.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        client_cache: bool = False,
+        cache_size: int = 10000,
+    ):
+        self.host = host
+        self.port = port
+        self.client_cache = client_cache
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # Key -> value, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self._inflight = {}  # Key -> token of the GET currently fetching it
+        self._replies = Queue()
+        self._lock = Lock()  # Keeps each request paired with its reply lines
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+
+    async def connect(self):
+        """Open the connection, enabling tracking if the local cache is used."""
+        self._reader, self._writer = await open_connection(self.host, self.port)
+        self._reader_task = create_task(self._read_loop(self._reader))
+        if self.client_cache:
+            reply = await self.execute("CLIENT", "TRACKING", "ON")
+            if reply != "OK":
+                raise ConnectionError(f"Could not enable client tracking: {reply}")
+
+    async def close(self):
+        """Close the connection and clear the local cache."""
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._reader_task.cancel()
+        self._flush_cache()
+
+    async def execute(self, *args) -> Reply:
+        """
+        Send a command and return its reply. Replies that span several lines, such as
+        KEYS, are returned as a single string.
+        """
+        async with self._lock:
+            self._writer.writelines(RedisProtocol.encode_command(*args))
+            await self._writer.drain()
+            return await self._next_reply()
+
+    async def get(self, key: Union[str, bytes]) -> Optional[Reply]:
+        """Get the value of key, from the local cache when possible."""
+        if not self.client_cache:
+            return self._nil_to_none(await self.execute("GET", key))
+        key = self._cache_key(key)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        self.misses += 1
+
+        # An invalidation arriving before the reply is handled cancels caching it
+        token = self._inflight[key] = object()
+        try:
+            value = await self.execute("GET", key)
+        finally:
+            cacheable = self._inflight.get(key) is token
+            if cacheable:
+                del self._inflight[key]
+        value = self._nil_to_none(value)
+        if cacheable:
+            self._store(key, value)
+        return value
+
+    async def mget(self, *keys: Union[str, bytes]) -> List[Optional[Reply]]:
+        """
+        Get the values of several keys, fetching only those not cached locally. The
+        missing keys are fetched with pipelined GETs, one round trip for all of them,
+        so each value arrives in its own reply.
+        """
+        if self.client_cache:
+            keys = [self._cache_key(key) for key in keys]
+        values = {}
+        missing = []
+        for key in keys:
+            if self.client_cache and key in self.cache:
+                self.hits += 1
+                self.cache.move_to_end(key)
+                values[key] = self.cache[key]
+            elif key not in missing:
+                self.misses += 1
+                missing.append(key)
+
+        if missing:
+            tokens = {key: object() for key in missing}
+            self._inflight.update(tokens)
+            try:
+                async with self._lock:
+                    for key in missing:
+                        self._writer.writelines(
+                            RedisProtocol.encode_command("GET", key)
+                        )
+                    await self._writer.drain()
+                    replies = [await self._next_reply() for _ in missing]
+            finally:
+                cacheable = {
+                    key for key in missing if self._inflight.get(key) is tokens[key]
+                }
+                for key in cacheable:
+                    del self._inflight[key]
+            for key, reply in zip(missing, replies):
+                values[key] = value = self._nil_to_none(reply)
+                if self.client_cache and key in cacheable:
+                    self._store(key, value)
+        return [values[key] for key in keys]
+
+    async def set(self, key: str, value: Union[str, bytes]) -> Reply:
+        """Set the value of key. The server invalidates it in every client cache."""
+        return await self.execute("SET", key, value)
+
+    async def delete(self, key: str) -> Reply:
+        """Delete key."""
+        return await self.execute("DEL", key)
+
+    @staticmethod
+    def _cache_key(key: Union[str, bytes]) -> str:
+        """Returns key as the server names it in invalidations, so that bytes and str
+        keys share one cache entry."""
+        if isinstance(key, (bytes, bytearray)):
+            return key.decode(errors=ENCODING_ERRORS)
+        return key
+
+    @staticmethod
+    def _nil_to_none(reply: Reply) -> Optional[Reply]:
+        """Map the (nil) reply of a missing key to None."""
+        return None if reply == "(nil)" else reply
+
+    def _store(self, key: str, value: Optional[Reply]):
+        """Add a value to the local cache, evicting the least recently used one."""
+        self.cache[key] = value
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def _invalidate(self, key: Optional[str]):
+        """Drop a key, or every key if None, from the local cache."""
+        if key is None:
+            self._flush_cache()
+            return
+        self.cache.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def _flush_cache(self):
+        """Drop every cached value and cancel caching of in-flight reads."""
+        self.cache.clear()
+        self._inflight.clear()
+
+    async def _next_reply(self) -> Reply:
+        """Wait for the next reply from the server."""
+        reply = await self._replies.get()
+        if isinstance(reply, Exception):
+            self._replies.put_nowait(reply)  # Every later command fails the same way
+            raise reply
+        return reply
+
+    @staticmethod
+    def _decode_bulk(value: bytes) -> Reply:
+        """Decode a bulk reply to str, keeping large or binary values as bytes."""
+        if len(value) > BULK_DECODE_LIMIT:
+            return value
+        try:
+            return value.decode()
+        except UnicodeDecodeError:
+            return value
+
+    async def _read_loop(self, reader: StreamReader):
+        """
+        Read replies and invalidation messages until the connection closes.
+
+        The server sends any value that contains a newline or starts with ">" or "$" as
+        a bulk string, so a line read here is never part of a value: lines starting
+        with ">" are pushes and lines starting with "$" are bulk headers. Bulk bodies
+        and invalidated keys are read by length and never inspected.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("Connection closed by the server")
+                line = line.rstrip(b"\r\n")
+                if line == INVALIDATE_PUSH:
+                    self._invalidate(None)
+                    continue
+                if line.startswith(INVALIDATE_PUSH + b" $"):
+                    length = line[len(INVALIDATE_PUSH) + 2 :]
+                    if not length.isdigit():
+                        raise ConnectionError(f"Malformed push message: {line!r}")
+                    key = (await reader.readexactly(int(length) + 1))[:-1]
+                    self._invalidate(key.decode(errors=ENCODING_ERRORS))
+                    continue
+                if line.startswith(b"$") and line[1:].isdigit():
+                    # Bulk reply: the value follows, then a newline
+                    value = await reader.readexactly(int(line[1:]) + 1)
+                    await self._replies.put(self._decode_bulk(value[:-1]))
+                    continue
+                await self._replies.put(line.decode())
+        except Exception as e:
+            # Wake up the command waiting for a reply
+            self._flush_cache()
+            self._replies.put_nowait(e)
@@ -0,0 +1,68 @@
+"""
+client_handler.py - Per-connection State Module
+
+This module holds the state the Redis clone server keeps for each connected client,
+such as the logical database it has selected and its client side caching options.
+
+Created by Gizachew Bayness Kassa on 2025-04-26
+"""
+
+from asyncio import StreamWriter
+from itertools import count
+from typing import List
+
+from src.data.storage import Storage
+from src.network.protocol import ENCODING_ERRORS
+
+# Source of unique client ids, as returned by CLIENT ID
+_client_ids = count(1)
+
+
+class ClientSession:
+    """
+    ClientSession - The state of a single client connection.
+
+    The session keeps the index of the selected database rather than the Storage itself,
+    so that SWAPDB, which swaps entries of the shared databases list, is immediately
+    visible to every connected client.
+    """
+
+    def __init__(
+        self,
+        databases: List[Storage],
+        tracking_table=None,
+        writer: StreamWriter = None,
+    ):
+        self.id = next(_client_ids)
+        self.databases = databases  # The server's logical databases
+        self.db = 0  # Index of the selected database
+        self.tracking_table = tracking_table  # The server's TrackingTable
+        self.writer = writer  # Where push messages are sent
+
+        # Client side caching options, set by CLIENT TRACKING
+        self.tracking = False
+        self.tracking_bcast = False
+        self.tracking_optin = False
+        self.tracking_optout = False
+        self.tracking_prefixes = []
+        self.caching = None  # CLIENT CACHING yes|no, applies to the next command only
+
+    @property
+    def storage(self) -> Storage:
+        """Returns the storage of the selected database."""
+        return self.databases[self.db]
+
+    def push(self, message: str, key: str = None):
+        """
+        Send an out-of-band message, such as a key invalidation, to the client.
+
+        The key, if any, is sent length-prefixed after the message, ``>message $<len>``
+        then the key on its own line, since keys may contain newlines.
+        """
+        if self.writer is None or self.writer.is_closing():
+            return
+        if key is None:
+            self.writer.write(f">{message}\n".encode())
+            return
+        key = key.encode(errors=ENCODING_ERRORS)
+        self.writer.write(b"".join([f">{message} ${len(key)}\n".encode(), key, b"\n"]))
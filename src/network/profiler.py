@@ -0,0 +1,130 @@
+"""
+profiler.py - Sampling Profiler Module
+
+This module implements the sampling profiler behind DEBUG PROFILE START|STOP. While it
+runs, a background thread wakes up every few milliseconds and records the stack of the
+thread serving clients. It keeps only samples taken while a command runs, i.e. with
+process_command on the stack. Each stack is attributed to the name of the command being
+processed, read from that frame's locals.
+
+Nothing is hooked into the command path: when the profiler is stopped there is no
+thread, and process_command runs exactly as without it. Results are written as
+collapsed stacks, one "root;caller;callee count" line per distinct stack, the input
+format of flamegraph.pl and speedscope:
+
+    GET;process_command (command_processor.py:62);execute (key_value.py:70) 42
+
+Created by Gizachew Bayness Kassa on 2025-05-06
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+
+# Default time between two samples, in milliseconds
+DEFAULT_PROFILE_INTERVAL_MS = 10
+
+# File the samples are written to by DEBUG PROFILE STOP
+DEFAULT_PROFILE_FILE = "redis-clone-profile.folded"
+
+# Name of the function whose frames mark a command being processed
+COMMAND_FUNCTION = "process_command"
+
+
+class SamplingProfiler:
+    """
+    SamplingProfiler - Periodically samples the stack of one thread.
+    """
+
+    def __init__(self, path: str = DEFAULT_PROFILE_FILE):
+        # Set by the server only: clients cannot choose where samples are written
+        self.path = path
+        self.samples = Counter()  # Collapsed stack -> number of samples
+        self.idle_samples = 0  # Samples taken while no command was running
+        self.interval = DEFAULT_PROFILE_INTERVAL_MS / 1000
+        self._thread_id = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, interval_ms: float = DEFAULT_PROFILE_INTERVAL_MS) -> bool:
+        """
+        Start sampling the calling thread, discarding previous results.
+
+        Returns:
+            False if the profiler was already running.
+        """
+        if self.running:
+            return False
+        self.samples = Counter()
+        self.idle_samples = 0
+        self.interval = interval_ms / 1000
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> bool:
+        """
+        Stop sampling. The results stay available in samples.
+
+        Returns:
+            False if the profiler was not running.
+        """
+        if not self.running:
+            return False
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        return True
+
+    def dump(self) -> int:
+        """
+        Write the samples to path as collapsed stacks, most sampled first.
+
+        Returns:
+            The number of samples written.
+        """
+        with open(self.path, "w") as file:
+            for stack, count in self.samples.most_common():
+                file.write(f"{stack} {count}\n")
+        return sum(self.samples.values())
+
+    def _run(self):
+        """Take a sample every interval until stopped."""
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                return  # The sampled thread has exited
+            stack = self._collapse(frame)
+            if stack is None:
+                self.idle_samples += 1
+            else:
+                self.samples[stack] += 1
+
+    @staticmethod
+    def _collapse(frame):
+        """Collapse the frames from process_command inwards into a single line, or
+        return None if no command is running."""
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            frames.append(
+                f"{code.co_name} "
+                f"({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            )
+            if code.co_name == COMMAND_FUNCTION:
+                command = frame.f_locals.get("command_name") or "?"
+                frames.append(command)
+                return ";".join(reversed(frames))
+            frame = frame.f_back
+        return None
+
+
+# Shared by every connection, like the server's single event loop thread
+profiler = SamplingProfiler()
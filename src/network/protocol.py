@@ -0,0 +1,183 @@
+"""
+protocol.py - Redis Clone Wire Protocol Module
+
+This module implements request framing and reply encoding for the Redis clone server.
+Two request formats are understood:
+
+- Inline commands: a single line such as ``SET key value`` terminated by a newline.
+- Multibulk commands (RESP): ``*<argc>\\r\\n`` followed by ``argc`` bulk strings, each
+  sent as ``$<len>\\r\\n<bytes>\\r\\n``. Bulk strings are length-prefixed, so values may be
+  arbitrarily large (up to ``proto_max_bulk_len``) and may contain spaces or newlines.
+
+Large bulk values are read straight into a single preallocated ``bytearray`` instead of
+being buffered as a line, decoded and split, and they are written back to clients with
+``writelines`` over a ``memoryview`` so the payload is never copied by the server.
+
+Small values that are not valid UTF-8 are decoded with ``surrogateescape``: they stay
+``str``, so they can be used as keys, and encode back to the exact bytes received.
+
+Created by Gizachew Bayness Kassa on 2025-04-22
+"""
+
+from asyncio import IncompleteReadError, LimitOverrunError, StreamReader
+from typing import List, Optional, Union
+
+# Default maximum size of a single bulk string (same as Redis's proto-max-bulk-len)
+DEFAULT_PROTO_MAX_BULK_LEN = 512 * 1024 * 1024
+
+# Maximum number of arguments accepted in a single multibulk request
+MAX_MULTIBULK_LEN = 1024 * 1024
+
+# Bulk strings larger than this are kept as bytearray instead of being decoded to str
+BULK_DECODE_LIMIT = 64 * 1024
+
+# Size of the reads used to fill a preallocated bulk buffer
+READ_CHUNK_SIZE = 64 * 1024
+
+# Encoding error handler that round trips the bytes of values that are not UTF-8
+ENCODING_ERRORS = "surrogateescape"
+
+
+class ProtocolError(Exception):
+    """
+    ProtocolError - Raised when a client sends a malformed request.
+    """
+
+
+class RedisProtocol:
+    """
+    RedisProtocol - Reads client requests and encodes server replies.
+
+    Replies that are ``str`` are sent as a single newline terminated line, exactly as the
+    server always did, unless the line framing cannot carry them: replies that span
+    several lines, that start like a bulk header (``$``) or a push message (``>``), or
+    that hold binary data. Those, and bytes-like replies (large or binary values), are
+    sent as a bulk string, ``$<len>\\n<bytes>\\n``, so clients can read them without
+    scanning for a terminator.
+    """
+
+    def __init__(self, proto_max_bulk_len: int = DEFAULT_PROTO_MAX_BULK_LEN):
+        self.proto_max_bulk_len = proto_max_bulk_len
+
+    async def read_command(
+        self, reader: StreamReader
+    ) -> Optional[List[Union[str, bytearray]]]:
+        """
+        Read the next command from the client.
+
+        Returns:
+            The command name followed by its arguments, or None once the client has
+            closed the connection.
+        Raises:
+            ProtocolError: If the request is malformed or exceeds a configured limit.
+        """
+        while True:
+            line = await self._read_line(reader)
+            if not line:
+                return None
+            if not line.startswith(b"*"):
+                # Inline command, split the same way process_command always has
+                return line.decode().strip().split(" ")
+
+            argc = self._parse_length(line, "multibulk")
+            if argc > MAX_MULTIBULK_LEN:
+                raise ProtocolError("invalid multibulk length")
+            if argc <= 0:
+                # Empty multibulk requests are ignored, like Redis does
+                continue
+            try:
+                return [await self._read_bulk(reader) for _ in range(argc)]
+            except IncompleteReadError:
+                return None
+
+    async def _read_line(self, reader: StreamReader) -> bytes:
+        """Read a single newline terminated line, enforcing the reader's limit."""
+        try:
+            return await reader.readline()
+        except (LimitOverrunError, ValueError):
+            raise ProtocolError("too big inline request")
+
+    def _parse_length(self, line: bytes, kind: str) -> int:
+        """Parse the length that follows a ``*`` or ``$`` type byte."""
+        try:
+            return int(line[1:].strip())
+        except ValueError:
+            raise ProtocolError(f"invalid {kind} length")
+
+    async def _read_bulk(self, reader: StreamReader) -> Union[str, bytearray]:
+        """Read one ``$<len>\\r\\n<bytes>\\r\\n`` bulk string."""
+        line = await self._read_line(reader)
+        if not line:
+            raise IncompleteReadError(line, None)
+        if not line.startswith(b"$"):
+            raise ProtocolError(
+                f"expected '$', got '{line[:1].decode(errors='replace')}'"
+            )
+        length = self._parse_length(line, "bulk")
+        if length < 0 or length > self.proto_max_bulk_len:
+            raise ProtocolError("invalid bulk length")
+
+        if length <= BULK_DECODE_LIMIT:
+            data = await reader.readexactly(length + 2)
+            if data[-2:] != b"\r\n":
+                raise ProtocolError("bulk string not terminated by CRLF")
+            return data[:-2].decode(errors=ENCODING_ERRORS)
+
+        # Large values are read into one preallocated buffer, chunk by chunk
+        buffer = bytearray(length)
+        with memoryview(buffer) as view:
+            position = 0
+            while position < length:
+                chunk = await reader.read(min(length - position, READ_CHUNK_SIZE))
+                if not chunk:
+                    raise IncompleteReadError(bytes(view[:position]), length)
+                view[position : position + len(chunk)] = chunk
+                position += len(chunk)
+        if await reader.readexactly(2) != b"\r\n":
+            raise ProtocolError("bulk string not terminated by CRLF")
+        return buffer
+
+    @staticmethod
+    def encode_response(response: Union[str, bytes, bytearray]) -> list:
+        """
+        Encode a reply as a list of buffers suitable for ``StreamWriter.writelines``.
+
+        Bytes-like replies are wrapped in a memoryview so the value is not copied.
+        """
+        if isinstance(response, (bytes, bytearray, memoryview)):
+            return [f"${len(response)}\n".encode(), memoryview(response), b"\n"]
+        response = str(response)
+        try:
+            encoded = response.encode()
+            line = not (
+                "\n" in response or "\r" in response or response.startswith(("$", ">"))
+            )
+        except UnicodeEncodeError:
+            # A binary value decoded with surrogateescape, send back its raw bytes
+            encoded = response.encode(errors=ENCODING_ERRORS)
+            line = False
+        if not line:
+            # Not representable as a single line, send it as a bulk string
+            return [f"${len(encoded)}\n".encode(), encoded, b"\n"]
+        return [encoded + b"\n"]
+
+    @staticmethod
+    def encode_command(*args: Union[str, bytes, bytearray]) -> list:
+        """
+        Encode a command as a multibulk request, as a list of buffers for ``writelines``.
+        """
+        buffers = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            if not isinstance(arg, (bytes, bytearray, memoryview)):
+                arg = str(arg).encode(errors=ENCODING_ERRORS)
+            buffers.append(f"${len(arg)}\r\n".encode())
+            buffers.append(memoryview(arg))
+            buffers.append(b"\r\n")
+        return buffers
+
+    @staticmethod
+    def describe(args: List[Union[str, bytearray]]) -> str:
+        """Return a printable summary of a command, eliding large binary values."""
+        return " ".join(
+            arg if isinstance(arg, str) else f"<{len(arg)} bytes>" for arg in args
+        )
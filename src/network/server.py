@@ -10,6 +10,9 @@ execute Redis-like commands.
 Key Features:
 - Listens on a configurable host and port (default: 127.0.0.1:6379)
 - Handles multiple client connections concurrently using asyncio
+- Accepts inline and multibulk (RESP) requests, streaming large bulk values up to
+  proto_max_bulk_len without buffering whole lines in memory
+- Notices clients that disconnect while blocked (XREAD BLOCK) and cancels their wait
 - Provides a foundation for integrating command parsing and further Redis functionalities
 
 Usage:
@@ -19,10 +22,30 @@ Usage:
 Created by Gizachew Bayness Kassa on 2025-02-19
 """
 
-from asyncio import StreamReader, StreamWriter, run, start_server
+from asyncio import (
+    FIRST_COMPLETED,
+    CancelledError,
+    StreamReader,
+    StreamWriter,
+    create_task,
+    run,
+    start_server,
+    wait,
+)
 
 from src.commands.command_processor import process_command
 from src.data.storage import Storage
+from src.network.client_handler import ClientSession
+from src.network.profiler import DEFAULT_PROFILE_FILE, profiler
+from src.network.protocol import (
+    DEFAULT_PROTO_MAX_BULK_LEN,
+    ProtocolError,
+    RedisProtocol,
+)
+from src.network.tracking import DEFAULT_TRACKING_TABLE_MAX_KEYS, TrackingTable
+
+# Commands that may block the client until another client writes to a key
+BLOCKING_COMMANDS = {"XREAD", "XREADGROUP"}
 
 
 class RedisCloneServer:
@@ -35,10 +58,28 @@ class RedisCloneServer:
     and can be extended to integrate a full Redis-like command parser and data store.
     """
 
-    def __init__(self, host: str = "127.0.0.1", port: int = 6379):
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        databases: int = 16,
+        proto_max_bulk_len: int = DEFAULT_PROTO_MAX_BULK_LEN,
+        lazyfree_lazy_expire: bool = False,
+        tracking_table_max_keys: int = DEFAULT_TRACKING_TABLE_MAX_KEYS,
+        profile_file: str = DEFAULT_PROFILE_FILE,
+    ):
         self.host = host
         self.port = port
-        self.storage = Storage()  # Initialize the storage for key-value pairs
+        # Initialize the logical databases, each with its own key-value storage
+        self.databases = [
+            Storage(lazyfree_lazy_expire=lazyfree_lazy_expire) for _ in range(databases)
+        ]
+        # Keys read by clients with CLIENT TRACKING enabled
+        self.tracking = TrackingTable(self.databases, max_keys=tracking_table_max_keys)
+        # Request framing, with the maximum accepted size of a single bulk value
+        self.protocol = RedisProtocol(proto_max_bulk_len=proto_max_bulk_len)
+        # File DEBUG PROFILE STOP writes to, never chosen by clients
+        profiler.path = profile_file
 
     async def handle_client(self, reader: StreamReader, writer: StreamWriter):
         """
@@ -49,31 +90,98 @@ class RedisCloneServer:
         """
         addr = writer.get_extra_info("peername")  # Client address
         print(f"New connection from {addr}")  # Log new connection
+        # Every connection starts on db 0
+        session = ClientSession(self.databases, self.tracking, writer)
+        read_ahead = None  # Next command, read while a blocking command was running
         try:
             while True:
-                # Read a line of data (message) from the client
-                data = await reader.readline()
-                # If no data is received, the client has closed the connection
-                if not data:
+                # Read the next inline or multibulk command from the client
+                try:
+                    if read_ahead is None:
+                        args = await self.protocol.read_command(reader)
+                    else:
+                        args = await read_ahead
+                        read_ahead = None
+                except ProtocolError as e:
+                    # Like Redis, reply with the error and drop the connection
+                    writer.write(f"ERR Protocol error: {e}\n".encode())
+                    await writer.drain()
+                    break
+                # If no command is received, the client has closed the connection
+                if args is None:
                     print(f"Connection closed from {addr}")
                     break
-                message = data.decode().strip()
-                # Log and echo the received message back to the client (for initial testing)
-                print(f"Received from {addr}: {message}")
+                # Log the received command, eliding large values
+                print(f"Received from {addr}: {self.protocol.describe(args)}")
 
                 # Process the command
-                response = await process_command(command=message, storage=self.storage)
-                writer.write(
-                    (response + "\n").encode()
-                )  # Send the response back to the client
+                if self._is_blocking(args):
+                    response, read_ahead = await self.process_blocking(
+                        args, session, reader
+                    )
+                    if read_ahead is None:
+                        print(f"Connection closed from {addr} while blocked")
+                        break
+                else:
+                    response = await process_command(
+                        command=args, storage=session.storage, session=session
+                    )
+                # Send the response back to the client without copying large values
+                writer.writelines(self.protocol.encode_response(response))
                 await writer.drain()  # Flush the write buffer
         except Exception as e:
             print(f"Error handling connection from {addr}: {e}")
         finally:
+            if read_ahead is not None:
+                read_ahead.cancel()
+            self.tracking.disable(session)  # Stop sending invalidations
             writer.close()  # Close the connection
             await writer.wait_closed()  # Wait for the connection to close
             print(f"Connection from {addr} has been closed.")  # Log connection closure
 
+    @staticmethod
+    def _is_blocking(args) -> bool:
+        """Returns True if the command may block until another client writes."""
+        return isinstance(args[0], str) and args[0].upper() in BLOCKING_COMMANDS
+
+    async def process_blocking(
+        self, args, session: ClientSession, reader: StreamReader
+    ):
+        """
+        Process a command that may block, while watching the connection for EOF.
+
+        A blocked client sends nothing until it gets its reply, so the next command is
+        read ahead while the command runs. If the client disconnects first, the command
+        is cancelled, which unregisters it from the keys it was waiting on.
+
+        Returns:
+            (response, read_ahead) where read_ahead is the task reading the next
+            command, or (None, None) if the connection was lost while blocked.
+        """
+        command = create_task(
+            process_command(command=args, storage=session.storage, session=session)
+        )
+        read_ahead = create_task(self.protocol.read_command(reader))
+        try:
+            await wait({command, read_ahead}, return_when=FIRST_COMPLETED)
+        except CancelledError:
+            # The server is shutting down
+            command.cancel()
+            read_ahead.cancel()
+            raise
+        if not command.done() and (
+            read_ahead.exception() is not None or read_ahead.result() is None
+        ):
+            # The client disconnected, or sent a request that drops the connection
+            command.cancel()
+            try:
+                await command
+            except CancelledError:
+                pass
+            return None, None
+        # The client is still there; a pipelined command waits for this reply
+        return await command, read_ahead
+
     async def start(self):
         """
         Start the TCP server and serve clients indefinitely.
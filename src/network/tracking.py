@@ -0,0 +1,137 @@
+"""
+tracking.py - Client Side Caching Module
+
+This module implements the server side of client side caching (CLIENT TRACKING). The
+server remembers which connections read which keys, and pushes an invalidation message
+to them as soon as one of those keys is modified, so that they can drop it from their
+local cache.
+
+Invalidation messages are sent on the tracking connection itself, as a line starting
+with ">" so that clients can tell them apart from command replies. Keys may contain
+newlines, so they are length-prefixed like bulk replies:
+
+    >invalidate $<len>
+    <key>
+    >invalidate          (every key was flushed)
+
+Two modes are supported, as in Redis:
+
+- Default mode: only keys the client read (GET, MGET, ...) are remembered, in a table
+  bounded by max_keys. When the table is full the oldest keys are evicted and their
+  clients are sent an invalidation, since they can no longer be notified of changes.
+- Broadcasting mode (BCAST): nothing is remembered; clients receive invalidations for
+  every modified key that starts with one of their prefixes.
+
+Created by Gizachew Bayness Kassa on 2025-05-02
+"""
+
+from typing import Dict, Iterable, List, Set
+
+from src.data.storage import Storage
+
+# Default maximum number of keys remembered (same as Redis's tracking-table-max-keys)
+DEFAULT_TRACKING_TABLE_MAX_KEYS = 1000000
+
+
+class TrackingTable:
+    """
+    TrackingTable - Remembers the keys read by tracking clients and invalidates them.
+
+    The table is only attached to the databases while at least one client has tracking
+    enabled, so modifying keys costs nothing otherwise.
+    """
+
+    def __init__(
+        self,
+        databases: List[Storage],
+        max_keys: int = DEFAULT_TRACKING_TABLE_MAX_KEYS,
+    ):
+        self.databases = databases
+        self.max_keys = max_keys
+        self.keys: Dict[str, Set[int]] = {}  # Key -> ids of the clients that read it
+        self.prefixes: Dict[str, Set[int]] = {}  # BCAST prefix -> client ids
+        self.clients = {}  # Client id -> ClientSession, for every tracking client
+
+    def enable(
+        self,
+        session,
+        bcast: bool = False,
+        prefixes: Iterable[str] = (),
+        optin: bool = False,
+        optout: bool = False,
+    ):
+        """Turn tracking on for a client, replacing its previous tracking options."""
+        self.disable(session)
+        session.tracking = True
+        session.tracking_bcast = bcast
+        session.tracking_optin = optin
+        session.tracking_optout = optout
+        session.tracking_prefixes = list(prefixes or [""]) if bcast else []
+        for prefix in session.tracking_prefixes:
+            self.prefixes.setdefault(prefix, set()).add(session.id)
+        self.clients[session.id] = session
+        self._attach()
+
+    def disable(self, session):
+        """Turn tracking off for a client. Keys it read are forgotten lazily."""
+        if self.clients.pop(session.id, None) is None:
+            return
+        for prefix in session.tracking_prefixes:
+            client_ids = self.prefixes.get(prefix)
+            if client_ids is not None:
+                client_ids.discard(session.id)
+                if not client_ids:
+                    del self.prefixes[prefix]
+        session.tracking = False
+        session.tracking_prefixes = []
+        if not self.clients:
+            self.keys.clear()
+            self._attach()
+
+    def remember(self, session, keys: Iterable[str], caching: bool = None):
+        """
+        Remember that a client read keys, honouring its OPTIN/OPTOUT mode.
+
+        Args:
+            caching: The value of the CLIENT CACHING call right before the read, if any.
+        """
+        if not session.tracking or session.tracking_bcast:
+            return
+        if session.tracking_optin and caching is not True:
+            return
+        if session.tracking_optout and caching is False:
+            return
+        for key in keys:
+            self.keys.setdefault(key, set()).add(session.id)
+        # Evict the oldest keys; their clients can no longer be told about changes
+        while len(self.keys) > self.max_keys:
+            evicted = next(iter(self.keys))
+            self._send(evicted, self.keys.pop(evicted))
+
+    def invalidate(self, key: str):
+        """Notify the clients that read key, or that watch a prefix of it."""
+        client_ids = self.keys.pop(key, None)
+        if client_ids:
+            self._send(key, client_ids)
+        for prefix, prefix_client_ids in self.prefixes.items():
+            if key.startswith(prefix):
+                self._send(key, prefix_client_ids)
+
+    def invalidate_all(self):
+        """Tell every tracking client to drop its whole cache, e.g. after FLUSHALL."""
+        self.keys.clear()
+        for session in self.clients.values():
+            session.push("invalidate")
+
+    def _send(self, key: str, client_ids: Iterable[int]):
+        """Push an invalidation message for key to the given clients."""
+        for client_id in client_ids:
+            session = self.clients.get(client_id)
+            if session is not None:
+                session.push("invalidate", key)
+
+    def _attach(self):
+        """Attach the table to the databases only while some client is tracking."""
+        tracking = self if self.clients else None
+        for database in self.databases:
+            database.tracking = tracking
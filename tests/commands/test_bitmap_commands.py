@@ -0,0 +1,156 @@
+"""
+file: test_bitmap_commands.py
+
+This module contains tests for the bitmap commands in the Redis clone server.
+
+Created by Gizachew Bayness Kassa on 2025-04-30
+"""
+
+import random
+
+import pytest
+
+from src.commands.bitmap_commands import (
+    BitCountCommand,
+    BitFieldCommand,
+    BitOpCommand,
+    BitPosCommand,
+    GetBitCommand,
+    SetBitCommand,
+)
+from src.commands.hyperloglog_commands import PfAddCommand
+from src.data import bitmap
+from src.data.storage import Storage
+
+
+@pytest.fixture
+def storage():
+    return Storage()
+
+
+# Test SETBIT returns the old bit and grows the string as a bytearray
+@pytest.mark.asyncio
+async def test_setbit_and_getbit(storage):
+    assert await SetBitCommand().execute(storage, "bits", "7", "1") == "0"
+    assert await SetBitCommand().execute(storage, "bits", "7", "1") == "1"
+    assert await SetBitCommand().execute(storage, "bits", "100", "1") == "0"
+    assert storage.lookup("bits") == bytearray(b"\x01" + bytes(11) + b"\x08")
+    assert await GetBitCommand().execute(storage, "bits", "7") == "1"
+    assert await GetBitCommand().execute(storage, "bits", "6") == "0"
+    assert await GetBitCommand().execute(storage, "bits", "100000") == "0"
+
+
+# Test SETBIT on an existing string keeps its TTL and converts it in place
+@pytest.mark.asyncio
+async def test_setbit_on_string(storage):
+    storage.set("key", "a", ttl=100)  # 0b01100001
+    assert await SetBitCommand().execute(storage, "key", "6", "1") == "0"
+    assert storage.lookup("key") == bytearray(b"c")
+    assert storage.ttl("key") > 0
+
+
+# Test SETBIT argument validation and type checking
+@pytest.mark.asyncio
+async def test_setbit_invalid_arguments(storage):
+    result = await SetBitCommand().execute(storage, "bits", "-1", "1")
+    assert result == "ERR bit offset is not an integer or out of range"
+    result = await SetBitCommand().execute(storage, "bits", "1", "2")
+    assert result == "ERR bit is not an integer or out of range"
+    await PfAddCommand().execute(storage, "hll", "a")
+    result = await SetBitCommand().execute(storage, "hll", "1", "1")
+    assert result == "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+
+# Test BITCOUNT with byte and bit ranges
+@pytest.mark.asyncio
+async def test_bitcount_command(storage):
+    storage.set("key", "foobar")
+    assert await BitCountCommand().execute(storage, "key") == "26"
+    assert await BitCountCommand().execute(storage, "key", "0", "0") == "4"
+    assert await BitCountCommand().execute(storage, "key", "1", "1") == "6"
+    assert await BitCountCommand().execute(storage, "key", "1", "1", "BYTE") == "6"
+    assert await BitCountCommand().execute(storage, "key", "5", "30", "BIT") == "17"
+    assert await BitCountCommand().execute(storage, "key", "-2", "-1") == "7"
+    assert await BitCountCommand().execute(storage, "missing") == "0"
+    assert await BitCountCommand().execute(storage, "key", "1") == "ERR syntax error"
+
+
+# Test BITPOS for set and clear bits
+@pytest.mark.asyncio
+async def test_bitpos_command(storage):
+    storage.set("key", bytearray(b"\xff\xf0\x00"))
+    assert await BitPosCommand().execute(storage, "key", "0") == 12
+    assert await BitPosCommand().execute(storage, "key", "1", "2") == -1
+    assert await BitPosCommand().execute(storage, "key", "1", "7", "15", "BIT") == 7
+    storage.set("ones", bytearray(b"\xff\xff"))
+    assert await BitPosCommand().execute(storage, "ones", "0") == 16
+    assert await BitPosCommand().execute(storage, "ones", "0", "0", "-1") == -1
+    assert await BitPosCommand().execute(storage, "missing", "0") == 0
+    assert await BitPosCommand().execute(storage, "missing", "1") == -1
+
+
+# Test BITOP with strings of different lengths
+@pytest.mark.asyncio
+async def test_bitop_command(storage):
+    storage.set("a", bytearray(b"\x0f\xff"))
+    storage.set("b", bytearray(b"\xf0"))
+    assert await BitOpCommand().execute(storage, "AND", "dest", "a", "b") == "2"
+    assert storage.lookup("dest") == bytearray(b"\x00\x00")
+    assert await BitOpCommand().execute(storage, "OR", "dest", "a", "b") == "2"
+    assert storage.lookup("dest") == bytearray(b"\xff\xff")
+    assert await BitOpCommand().execute(storage, "XOR", "dest", "a", "b") == "2"
+    assert storage.lookup("dest") == bytearray(b"\xff\xff")
+    assert await BitOpCommand().execute(storage, "NOT", "dest", "b") == "1"
+    assert storage.lookup("dest") == bytearray(b"\x0f")
+    result = await BitOpCommand().execute(storage, "NOT", "dest", "a", "b")
+    assert result == "ERR BITOP NOT must be called with a single source key."
+
+
+# Test BITFIELD GET, SET and INCRBY with overflow handling
+@pytest.mark.asyncio
+async def test_bitfield_command(storage):
+    result = await BitFieldCommand().execute(
+        storage, "bf", "SET", "u8", "#1", "255", "GET", "u8", "8", "GET", "i8", "8"
+    )
+    assert result == "1) (integer) 0\n2) (integer) 255\n3) (integer) -1"
+    result = await BitFieldCommand().execute(
+        storage,
+        "bf",
+        "INCRBY",
+        "u8",
+        "8",
+        "10",
+        "OVERFLOW",
+        "SAT",
+        "INCRBY",
+        "u8",
+        "8",
+        "300",
+        "OVERFLOW",
+        "FAIL",
+        "INCRBY",
+        "u8",
+        "8",
+        "1",
+    )
+    assert result == "1) (integer) 9\n2) (integer) 255\n3) (nil)"
+    result = await BitFieldCommand().execute(storage, "bf", "GET", "u64", "0")
+    assert result.startswith("ERR Invalid bitfield type")
+
+
+# Test the chunked operations against per-bit reference implementations
+def test_bitmap_operations_match_reference():
+    rng = random.Random(42)
+    data = bytes(rng.getrandbits(8) for _ in range(3000))
+    bits = "".join(f"{byte:08b}" for byte in data)
+    for _ in range(50):
+        first = rng.randrange(len(bits))
+        last = rng.randrange(first, len(bits))
+        assert bitmap.bitcount(data, first, last) == bits[first : last + 1].count("1")
+        for bit in "01":
+            expected = bits.find(bit, first, last + 1)
+            assert bitmap.bitpos(data, int(bit), first, last) == expected
+        width = rng.randint(1, 64)
+        offset = rng.randrange(len(bits) - width)
+        value = int(bits[offset : offset + width], 2)
+        assert bitmap.get_field(data, offset, width, False) == value
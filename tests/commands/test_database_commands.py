@@ -0,0 +1,89 @@
+"""
+file: test_database_commands.py
+
+This module contains tests for the SELECT, SWAPDB, MOVE and DBSIZE commands in the
+Redis clone server.
+
+Created by Gizachew Bayness Kassa on 2025-04-26
+"""
+
+import pytest
+
+from src.commands.database_commands import (
+    DbSizeCommand,
+    MoveCommand,
+    SelectCommand,
+    SwapDbCommand,
+)
+from src.commands.server_commands import InfoCommand
+from src.data.storage import Storage
+from src.network.client_handler import ClientSession
+
+
+@pytest.fixture
+def session():
+    return ClientSession([Storage() for _ in range(4)])
+
+
+# Test SELECT switches the storage used by the session
+@pytest.mark.asyncio
+async def test_select_command(session):
+    assert await SelectCommand(session).execute(session.storage, "2") == "OK"
+    assert session.storage is session.databases[2]
+
+
+# Test SELECT with an out of range or invalid index
+@pytest.mark.asyncio
+async def test_select_invalid_index(session):
+    result = await SelectCommand(session).execute(session.storage, "4")
+    assert result == "ERR DB index is out of range"
+    result = await SelectCommand(session).execute(session.storage, "one")
+    assert result == "ERR value is not an integer or out of range"
+    assert session.db == 0
+
+
+# Test SWAPDB swaps the data seen through a selected index
+@pytest.mark.asyncio
+async def test_swapdb_command(session):
+    session.databases[1].set("key1", "value1")
+    assert (
+        await SwapDbCommand(session.databases).execute(session.storage, "0", "1")
+        == "OK"
+    )
+    assert session.storage.get("key1") == "value1"
+    assert session.databases[1].get("key1") == "(nil)"
+
+
+# Test MOVE moves a key and keeps its TTL
+@pytest.mark.asyncio
+async def test_move_command(session):
+    session.storage.set("key1", "value1", ttl=100)
+    result = await MoveCommand(session.databases).execute(session.storage, "key1", "3")
+    assert result == "1"
+    assert session.storage.get("key1") == "(nil)"
+    assert session.databases[3].get("key1") == "value1"
+    assert session.databases[3].ttl("key1") > 0
+    assert session.storage.expires == 0
+    assert session.databases[3].expires == 1
+
+
+# Test MOVE does not overwrite a key that exists in the target database
+@pytest.mark.asyncio
+async def test_move_existing_key(session):
+    session.storage.set("key1", "value1")
+    session.databases[1].set("key1", "other")
+    result = await MoveCommand(session.databases).execute(session.storage, "key1", "1")
+    assert result == "0"
+    result = await MoveCommand(session.databases).execute(session.storage, "key1", "0")
+    assert result == "ERR source and destination objects are the same"
+
+
+# Test DBSIZE and INFO keyspace counts
+@pytest.mark.asyncio
+async def test_dbsize_and_info_keyspace(session):
+    session.storage.set("key1", "value1")
+    session.storage.set("key2", "value2", ttl=100)
+    session.databases[2].set("key3", "value3")
+    assert await DbSizeCommand().execute(session.storage) == "2"
+    result = await InfoCommand(session.databases).execute(session.storage, "keyspace")
+    assert result == "# Keyspace\ndb0:keys=2,expires=1\ndb2:keys=1,expires=0"
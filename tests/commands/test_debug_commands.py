@@ -0,0 +1,128 @@
+"""
+file: test_debug_commands.py
+
+This module contains tests for the DEBUG command (PROFILE, HOTKEYS, BIGKEYS and
+POPULATE) in the Redis clone server.
+
+Created by Gizachew Bayness Kassa on 2025-05-06
+"""
+
+import time
+
+import pytest
+
+from src.commands.command_processor import process_command
+from src.commands.debug_commands import DebugCommand
+from src.data.hotkeys import HotKeys
+from src.data.storage import Storage
+from src.network.profiler import SamplingProfiler
+
+
+@pytest.fixture
+def storage():
+    return Storage()
+
+
+# Test DEBUG POPULATE creates keys, padding values to size and keeping existing keys
+@pytest.mark.asyncio
+async def test_debug_populate(storage):
+    storage.set("key:1", "mine")
+    assert await DebugCommand().execute(storage, "POPULATE", "100") == "OK"
+    assert storage.dbsize() == 100
+    assert storage.get("key:0") == "value:0"
+    assert storage.get("key:1") == "mine"
+    assert await DebugCommand().execute(storage, "POPULATE", "2", "pad", "10") == "OK"
+    assert storage.get("pad:1") == "value:1\0\0\0"
+    assert await DebugCommand().execute(storage, "POPULATE", "1", "cut", "3") == "OK"
+    assert storage.get("cut:0") == "val"
+    assert await DebugCommand().execute(storage, "POPULATE", "many") == (
+        "ERR value is not an integer or out of range"
+    )
+
+
+# Test DEBUG HOTKEYS reports the most accessed keys only while enabled
+@pytest.mark.asyncio
+async def test_debug_hotkeys(storage):
+    databases = [storage, Storage()]
+    debug = DebugCommand(databases)
+    assert (await debug.execute(storage, "HOTKEYS")).startswith("ERR hot keys")
+    storage.populate(100)
+    storage.get("key:0")
+    assert storage.hotkeys is None
+
+    assert await debug.execute(storage, "HOTKEYS", "ON", "2") == "OK"
+    assert all(database.hotkeys is not None for database in databases)
+    for i in range(1000):
+        storage.get(f"key:{i % 100}")
+        storage.get("hot")
+        if i % 2:
+            storage.set("warm", "value")
+    assert await debug.execute(storage, "HOTKEYS") == "\n".join(
+        [
+            "1) 1) hot",
+            "   2) (integer) 1000",
+            "2) 1) warm",
+            "   2) (integer) 500",
+        ]
+    )
+    assert (await debug.execute(storage, "HOTKEYS", "1")).count("\n") == 1
+    for count in ["0", "-1"]:
+        result = await debug.execute(storage, "HOTKEYS", count)
+        assert result == "ERR value is not an integer or out of range"
+
+    assert await debug.execute(storage, "HOTKEYS", "OFF") == "OK"
+    assert all(database.hotkeys is None for database in databases)
+
+
+# Test the count-min sketch decays counts so past hot keys fade out
+def test_hotkeys_decay():
+    hotkeys = HotKeys(k=2, decay_interval=100)
+    for _ in range(99):
+        hotkeys.touch("old")
+    hotkeys.touch("new")
+    assert hotkeys.hottest() == [("old", 49), ("new", 0)]
+    for _ in range(60):
+        hotkeys.touch("new")
+    assert hotkeys.hottest(1) == [("new", 60)]
+
+
+# Test DEBUG BIGKEYS returns the largest sampled keys, largest first
+@pytest.mark.asyncio
+async def test_debug_bigkeys(storage):
+    storage.populate(50)
+    storage.set("big", "x" * 10000)
+    storage.set("bigger", "x" * 20000)
+    result = await DebugCommand().execute(storage, "BIGKEYS", "COUNT", "2")
+    lines = result.split("\n")
+    assert lines[0] == "1) 1) bigger" and lines[2] == "2) 1) big"
+    result = await DebugCommand().execute(storage, "BIGKEYS", "SAMPLES", "5")
+    assert result.count(") 1) ") == 5
+    sample = storage.sample_keys(20)
+    assert len(set(sample)) == 20 and all(key in storage.data for key in sample)
+    assert sorted(storage.sample_keys(100)) == sorted(storage.data)
+    assert await DebugCommand().execute(storage, "BIGKEYS", "COUNT") == (
+        "ERR syntax error"
+    )
+
+
+# Test DEBUG PROFILE samples running commands and writes collapsed stacks
+@pytest.mark.asyncio
+async def test_debug_profile(storage, tmp_path):
+    path = tmp_path / "profile.folded"
+    debug = DebugCommand(sampler=SamplingProfiler(str(path)))
+    assert (await debug.execute(storage, "PROFILE", "STOP")).startswith("ERR")
+    assert await debug.execute(storage, "PROFILE", "START", "1") == "OK"
+    assert (await debug.execute(storage, "PROFILE", "START")).startswith("ERR")
+    deadline = time.monotonic() + 0.3
+    while time.monotonic() < deadline:
+        await process_command("DEBUG POPULATE 2000", storage)
+        storage.flush()
+    result = await debug.execute(storage, "PROFILE", "STOP", "/tmp/elsewhere")
+    assert result == "ERR syntax error"
+    result = await debug.execute(storage, "PROFILE", "STOP")
+    assert result.startswith("OK ") and result.endswith(f"samples written to {path}")
+    assert int(result.split(" ")[1]) > 0
+    lines = path.read_text().splitlines()
+    assert lines and all(line.startswith("DEBUG;process_command") for line in lines)
+    assert any("populate (storage.py" in line for line in lines)
+    assert not debug.profiler.running
@@ -0,0 +1,92 @@
+"""
+file: test_hyperloglog_commands.py
+
+This module contains tests for the PFADD, PFCOUNT and PFMERGE commands in the Redis
+clone server.
+
+Created by Gizachew Bayness Kassa on 2025-04-28
+"""
+
+import pytest
+
+from src.commands.hyperloglog_commands import (
+    PfAddCommand,
+    PfCountCommand,
+    PfMergeCommand,
+)
+from src.commands.key_value import GetCommand
+from src.data.hyperloglog import SPARSE_MAX_BYTES, HyperLogLog
+from src.data.storage import Storage
+
+
+@pytest.fixture
+def storage():
+    return Storage()
+
+
+# Test PFADD creates a key and reports whether registers changed
+@pytest.mark.asyncio
+async def test_pfadd_command(storage):
+    assert await PfAddCommand().execute(storage, "hll", "a", "b", "c") == "1"
+    assert await PfAddCommand().execute(storage, "hll", "a", "b") == "0"
+    assert await PfAddCommand().execute(storage, "empty") == "1"
+    assert await PfAddCommand().execute(storage, "empty") == "0"
+
+
+# Test PFCOUNT on one, several and missing keys
+@pytest.mark.asyncio
+async def test_pfcount_command(storage):
+    await PfAddCommand().execute(storage, "hll1", "a", "b", "c")
+    await PfAddCommand().execute(storage, "hll2", "c", "d")
+    assert await PfCountCommand().execute(storage, "hll1") == "3"
+    assert await PfCountCommand().execute(storage, "hll1", "hll2", "missing") == "4"
+    assert await PfCountCommand().execute(storage, "missing") == "0"
+
+
+# Test PFMERGE into a new and an existing key
+@pytest.mark.asyncio
+async def test_pfmerge_command(storage):
+    await PfAddCommand().execute(storage, "hll1", "a", "b")
+    await PfAddCommand().execute(storage, "hll2", "b", "c")
+    assert await PfMergeCommand().execute(storage, "merged", "hll1", "hll2") == "OK"
+    assert await PfCountCommand().execute(storage, "merged") == "3"
+    assert await PfMergeCommand().execute(storage, "hll1", "hll2") == "OK"
+    assert await PfCountCommand().execute(storage, "hll1") == "3"
+
+
+# Test HyperLogLog commands against a key holding another type, and GET on a HyperLogLog
+@pytest.mark.asyncio
+async def test_hyperloglog_wrong_type(storage):
+    storage.set("string", "value")
+    result = await PfAddCommand().execute(storage, "string", "a")
+    assert result == "WRONGTYPE Key is not a valid HyperLogLog string value."
+    await PfAddCommand().execute(storage, "hll", "a")
+    result = await GetCommand().execute(storage, "hll")
+    assert result == "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+
+# Test the sparse encoding is promoted to dense as it grows, without losing registers
+def test_sparse_promotion():
+    hll = HyperLogLog()
+    for i in range(200):
+        hll.add(f"element:{i}")
+    assert hll.sparse
+    assert len(hll.registers) <= SPARSE_MAX_BYTES
+    sparse_registers = bytes(hll.dense_registers())
+
+    for i in range(200, 20000):
+        hll.add(f"element:{i}")
+    assert not hll.sparse
+    assert len(hll.registers) == 16384
+    # Registers never decrease, so everything recorded while sparse is still there
+    assert all(d >= s for s, d in zip(sparse_registers, hll.registers))
+
+
+# Test the estimate stays within a few standard errors (0.81%) of the true count
+def test_cardinality_accuracy():
+    hll = HyperLogLog()
+    hll.add(*[str(i) for i in range(100000)])
+    assert abs(hll.count() - 100000) / 100000 < 0.03
+    other = HyperLogLog()
+    other.add(*[str(i) for i in range(50000, 150000)])
+    assert abs(HyperLogLog.union([hll, other]).count() - 150000) / 150000 < 0.03
@@ -0,0 +1,55 @@
+"""
+file: test_key_value.py
+
+This module contains tests for the key-value commands in the Redis clone server.
+
+Created by Gizachew Bayness Kassa on 2025-04-24
+"""
+
+import pytest
+
+from src.commands.key_value import MGetCommand, UnlinkCommand
+from src.data.lazyfree import LazyFree
+from src.data.storage import Storage
+
+
+@pytest.fixture
+def storage():
+    return Storage(lazyfree=LazyFree())
+
+
+# Test UNLINK removes existing keys and counts them
+@pytest.mark.asyncio
+async def test_unlink_command(storage):
+    storage.set("key1", "value1")
+    storage.set("key2", {str(i): i for i in range(1000)})
+    result = await UnlinkCommand().execute(storage, "key1", "key2", "missing")
+    assert result == "(integer) 2"
+    assert storage.keys() == []
+    storage.lazyfree.drain()
+    assert storage.lazyfree.pending == 0
+
+
+# Test UNLINK with the wrong number of arguments
+@pytest.mark.asyncio
+async def test_unlink_wrong_number_of_arguments(storage):
+    result = await UnlinkCommand().execute(storage)
+    assert result == "ERR wrong number of arguments for 'UNLINK' command"
+
+
+# Test expired keys are freed lazily when lazyfree_lazy_expire is enabled
+def test_lazy_expire(storage):
+    storage.lazyfree_lazy_expire = True
+    storage.set("key1", "value1", ttl=-1)
+    assert storage.get("key1") == "(nil)"
+    assert "key1" not in storage.data
+
+
+# Test MGET returns (nil) for missing keys and non-string values
+@pytest.mark.asyncio
+async def test_mget_command(storage):
+    storage.set("key1", "value1")
+    storage.set("key2", bytearray(b"value2"))
+    storage.set("dict", {"a": 1})
+    result = await MGetCommand().execute(storage, "key1", "missing", "key2", "dict")
+    assert result == "1) value1\n2) (nil)\n3) value2\n4) (nil)"
@@ -0,0 +1,182 @@
+"""
+file: test_server_commands.py
+
+This module contains tests for the FLUSHALL, FLUSHDB, INFO and MEMORY commands in the
+Redis clone server.
+
+Created by Gizachew Bayness Kassa on 2025-04-24
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.commands.key_value import UnlinkCommand
+from src.commands.server_commands import (
+    FlushAllCommand,
+    FlushDbCommand,
+    InfoCommand,
+    MemoryCommand,
+)
+from src.data.lazyfree import LazyFree
+from src.data.storage import Storage
+from src.data.stream import Stream
+
+
+@pytest.fixture
+def storage():
+    return Storage(lazyfree=LazyFree())
+
+
+# Test FLUSHDB removes every key synchronously
+@pytest.mark.asyncio
+async def test_flushdb_sync(storage):
+    storage.set("key1", "value1")
+    storage.set("key2", "value2")
+    assert await FlushDbCommand().execute(storage) == "OK"
+    assert storage.keys() == []
+
+
+# Test FLUSHALL ASYNC detaches the keyspace and frees it in the background
+@pytest.mark.asyncio
+async def test_flushall_async(storage):
+    for i in range(1000):
+        storage.set(f"key{i}", f"value{i}")
+    old_data = storage.data
+    assert await FlushAllCommand().execute(storage, "async") == "OK"
+    assert storage.keys() == []
+    storage.lazyfree.drain()
+    assert storage.lazyfree.pending == 0
+    assert old_data == {}
+
+
+async def longest_gap(storage, command) -> float:
+    """Helper function returning the longest time the event loop was stalled while
+    command ran and its lazy-free work completed in the background."""
+    gaps = []
+    done = asyncio.Event()
+
+    async def ticker():
+        last = time.perf_counter()
+        while not done.is_set() or storage.lazyfree.pending:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    await command()
+    done.set()
+    await task
+    return max(gaps)
+
+
+# Test freeing a large flushed keyspace never stalls the event loop for long
+@pytest.mark.asyncio
+async def test_flushall_async_latency(storage):
+    storage.populate(1000000)
+    gap = await longest_gap(
+        storage, lambda: FlushAllCommand().execute(storage, "ASYNC")
+    )
+    # dict.clear() in the background thread held the GIL for about 60 ms here
+    assert gap < 0.025
+
+
+# Test freeing a large unlinked stream never stalls the event loop for long
+@pytest.mark.asyncio
+async def test_unlink_stream_latency(storage):
+    stream = Stream()
+    names = [f"field{i}" for i in range(10)]
+    for n in range(200000):
+        stream.add([x for i, name in enumerate(names) for x in (name, f"{n}:{i}")])
+    storage.set("stream", stream)
+    del stream
+    gap = await longest_gap(storage, lambda: UnlinkCommand().execute(storage, "stream"))
+    # Dropping the whole stream in the background thread held the GIL for about 30 ms
+    assert gap < 0.015
+
+
+# Test flush commands with invalid arguments
+@pytest.mark.asyncio
+async def test_flush_invalid_arguments(storage):
+    assert await FlushAllCommand().execute(storage, "LATER") == "ERR syntax error"
+    result = await FlushDbCommand().execute(storage, "ASYNC", "SYNC")
+    assert result == "ERR wrong number of arguments for 'FLUSHDB' command"
+
+
+# Test INFO reports the pending lazy-free objects
+@pytest.mark.asyncio
+async def test_info_memory(storage):
+    result = await InfoCommand().execute(storage, "memory")
+    assert result == "# Memory\nlazyfree_pending_objects:0"
+
+
+class SlowToFree:
+    """Helper value whose release blocks the lazy-free thread until it is allowed."""
+
+    def __init__(self, release: threading.Event):
+        self.release = release
+
+    def __len__(self):
+        return 1000
+
+    def __del__(self):
+        self.release.wait(5)
+
+
+# Test pending lazy-free objects count one per unlinked value and one per flushed key
+@pytest.mark.asyncio
+async def test_info_pending_objects(storage):
+    release = threading.Event()
+    storage.set("slow", SlowToFree(release))
+    storage.set("list", list(range(1000)))
+    storage.unlink("slow")
+    storage.unlink("list")
+    for i in range(100):
+        storage.set(f"key{i}", f"value{i}")
+    await FlushAllCommand().execute(storage, "ASYNC")
+    result = await InfoCommand().execute(storage, "memory")
+    assert result == "# Memory\nlazyfree_pending_objects:102"
+    release.set()
+    storage.lazyfree.drain()
+    assert storage.lazyfree.pending == 0
+
+
+# Test INFO with an unknown section
+@pytest.mark.asyncio
+async def test_info_unknown_section(storage):
+    assert await InfoCommand().execute(storage, "nosuchsection") == ""
+
+
+# Test MEMORY USAGE grows with the value and is nil for missing keys
+@pytest.mark.asyncio
+async def test_memory_usage(storage):
+    storage.set("small", "x")
+    storage.set("large", "x" * 100000)
+    small = await MemoryCommand().execute(storage, "USAGE", "small")
+    large = await MemoryCommand().execute(storage, "USAGE", "large")
+    assert 0 < small < 1000
+    assert 100000 < large < 101000
+    assert await MemoryCommand().execute(storage, "USAGE", "missing") == "(nil)"
+    assert await MemoryCommand().execute(storage, "USAGE", "small", "SAMPLES") == (
+        "ERR wrong number of arguments for 'MEMORY USAGE' command"
+    )
+    assert (await MemoryCommand().execute(storage, "DOCTOR")).startswith(
+        "ERR unknown subcommand"
+    )
+
+
+# Test MEMORY USAGE SAMPLES estimates streams from a few chunks
+@pytest.mark.asyncio
+async def test_memory_usage_samples(storage):
+    stream = Stream()
+    for i in range(1000):
+        stream.add(["field", "x" * 50])
+    storage.set("stream", stream)
+    exact = await MemoryCommand().execute(storage, "USAGE", "stream", "SAMPLES", "0")
+    sampled = await MemoryCommand().execute(storage, "USAGE", "stream")
+    assert exact > 1000 * 50
+    assert abs(sampled - exact) < exact * 0.05
@@ -0,0 +1,245 @@
+"""
+file: test_stream_commands.py
+
+This module contains tests for the stream commands (XADD, XRANGE, XREAD, XREADGROUP,
+XACK, ...) in the Redis clone server.
+
+Created by Gizachew Bayness Kassa on 2025-05-04
+"""
+
+import asyncio
+
+import pytest
+
+from src.commands.command_processor import process_command
+from src.data.storage import Storage
+from src.data.stream import STREAM_NODE_MAX_ENTRIES, Stream
+from src.network.client_handler import ClientSession
+
+
+@pytest.fixture
+def storage():
+    return Storage()
+
+
+async def run(storage, command: str):
+    return await process_command(command.split(" "), storage)
+
+
+# Test XADD generates increasing IDs and rejects IDs that are not greater
+@pytest.mark.asyncio
+async def test_xadd_ids(storage):
+    assert await run(storage, "XADD s 5-1 a 1") == "5-1"
+    assert await run(storage, "XADD s 5-* a 2") == "5-2"
+    assert await run(storage, "XADD s 7 a 3") == "7-0"
+    generated = await run(storage, "XADD s * a 4")
+    assert int(generated.split("-")[0]) > 7
+    assert (await run(storage, "XADD s 6-0 a 5")).startswith("ERR The ID specified")
+    assert (await run(storage, "XADD t 0-0 a 1")).startswith("ERR The ID specified")
+    assert await run(storage, "XADD s 8-0 a") == (
+        "ERR wrong number of arguments for 'XADD' command"
+    )
+    assert await run(storage, "XADD u NOMKSTREAM * a 1") == "(nil)"
+    assert await run(storage, "XLEN s") == "(integer) 4"
+    assert await run(storage, "XLEN u") == "(integer) 0"
+
+
+# Test XRANGE and XREVRANGE boundaries, exclusive IDs and COUNT
+@pytest.mark.asyncio
+async def test_xrange(storage):
+    for seq in range(1, 4):
+        await run(storage, f"XADD s 1-{seq} n {seq}")
+    await run(storage, "XADD s 2-0 other x")
+    assert await run(storage, "XRANGE s 1 1") == "\n".join(
+        [
+            "1) 1) 1-1",
+            "   2) 1) n",
+            "      2) 1",
+            "2) 1) 1-2",
+            "   2) 1) n",
+            "      2) 2",
+            "3) 1) 1-3",
+            "   2) 1) n",
+            "      2) 3",
+        ]
+    )
+    assert await run(storage, "XRANGE s (1-3 + COUNT 5") == "\n".join(
+        ["1) 1) 2-0", "   2) 1) other", "      2) x"]
+    )
+    assert (await run(storage, "XREVRANGE s + - COUNT 1")).startswith("1) 1) 2-0")
+    assert await run(storage, "XRANGE s - + COUNT 0") == "(empty array)"
+    assert await run(storage, "XRANGE missing - +") == "(empty array)"
+    assert (await run(storage, "XRANGE s x +")).startswith("ERR Invalid stream ID")
+
+
+# Test range seeks and trimming across chunk boundaries
+def test_stream_chunks_and_trimming():
+    stream = Stream()
+    total = STREAM_NODE_MAX_ENTRIES * 5 + 10
+    for seq in range(1, total + 1):
+        stream.add(["field", str(seq)], f"{seq // 7}-{seq % 7}")
+    assert len(stream.chunks) == 6
+    ids = list(stream.iter_ids())
+    assert ids == sorted(ids) and len(ids) == total
+    middle = stream.range(ids[250], ids[260])
+    assert [entry_id for entry_id, _ in middle] == ids[250:261]
+    assert middle[0][1] == ["field", "251"]
+    assert [entry_id for entry_id, _ in stream.rev_range(ids[105], ids[95])] == (
+        ids[95:106][::-1]
+    )
+
+    # Approximate trimming only drops whole chunks
+    assert stream.trim_maxlen(250, approximate=True) == 200
+    assert len(stream) == total - 200
+    assert stream.trim_maxlen(250) == total - 450
+    assert list(stream.iter_ids()) == ids[-250:]
+    assert stream.trim_minid(ids[-100], approximate=True) == 140
+    assert stream.trim_minid(ids[-100]) == 10
+    assert list(stream.iter_ids()) == ids[-100:]
+    assert stream.range(ids[0], ids[-101]) == []
+
+
+# Test XADD and XTRIM trimming options
+@pytest.mark.asyncio
+async def test_xadd_xtrim_trimming(storage):
+    for seq in range(1, 11):
+        await run(storage, f"XADD s MAXLEN 5 1-{seq} n {seq}")
+    assert await run(storage, "XLEN s") == "(integer) 5"
+    assert (await run(storage, "XRANGE s - + COUNT 1")).startswith("1) 1) 1-6")
+    assert await run(storage, "XTRIM s MINID = 1-8") == "(integer) 2"
+    assert await run(storage, "XTRIM s MAXLEN ~ 1") == "(integer) 0"
+    assert await run(storage, "XTRIM s MAXLEN -1") == (
+        "ERR The MAXLEN argument must be >= 0."
+    )
+    assert await run(storage, "XLEN s") == "(integer) 3"
+
+
+# Test stream commands against keys of another type
+@pytest.mark.asyncio
+async def test_stream_wrongtype(storage):
+    storage.set("str", "value")
+    await run(storage, "XADD s * a 1")
+    wrongtype = "WRONGTYPE Operation against a key holding the wrong kind of value"
+    assert await run(storage, "XADD str * a 1") == wrongtype
+    assert await run(storage, "XRANGE str - +") == wrongtype
+    assert await run(storage, "XREAD STREAMS str 0") == wrongtype
+    assert await run(storage, "GET s") == wrongtype
+
+
+# Test a TypeError raised by a bug in the read path is not turned into a reply
+@pytest.mark.asyncio
+async def test_xread_type_error_propagates(storage, monkeypatch):
+    await run(storage, "XADD s 1-1 a 1")
+
+    def broken_range(*args):
+        raise TypeError("bug")
+
+    monkeypatch.setattr(Stream, "range", broken_range)
+    with pytest.raises(TypeError):
+        await run(storage, "XREAD STREAMS s 0")
+
+
+# Test XREAD returns newer entries and blocks until XADD without polling
+@pytest.mark.asyncio
+async def test_xread_blocking(storage):
+    await run(storage, "XADD s 1-1 a 1")
+    assert await run(storage, "XREAD STREAMS s 1-1") == "(nil)"
+    assert (await run(storage, "XREAD COUNT 1 STREAMS s 0")).startswith("1) 1) s")
+    assert await run(storage, "XREAD STREAMS s") == (
+        "ERR Unbalanced 'XREAD' list of streams: for each stream key an ID or '$' "
+        "must be specified."
+    )
+    assert await run(storage, "XREAD BLOCK 10 STREAMS s $") == "(nil)"
+    assert not storage.waiters
+
+    blocked = asyncio.create_task(run(storage, "XREAD BLOCK 0 STREAMS other s $ $"))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert set(storage.waiters) == {"other", "s"}
+    await run(storage, "XADD s 2-0 b 2")
+    assert await asyncio.wait_for(blocked, 1) == "\n".join(
+        ["1) 1) s", "   2) 1) 1) 2-0", "         2) 1) b", "            2) 2"]
+    )
+    assert not storage.waiters
+
+
+# Test consumer groups: delivery, pending entries, history and XACK
+@pytest.mark.asyncio
+async def test_xreadgroup_and_xack(storage):
+    assert (await run(storage, "XGROUP CREATE s g $")).startswith("ERR The XGROUP")
+    assert await run(storage, "XGROUP CREATE s g $ MKSTREAM") == "OK"
+    assert await run(storage, "XGROUP CREATE s g 0") == (
+        "BUSYGROUP Consumer Group name already exists"
+    )
+    for seq in range(1, 4):
+        await run(storage, f"XADD s 1-{seq} n {seq}")
+
+    reply = await run(storage, "XREADGROUP GROUP g alice COUNT 2 STREAMS s >")
+    assert "1-1" in reply and "1-2" in reply and "1-3" not in reply
+    reply = await run(storage, "XREADGROUP GROUP g bob NOACK STREAMS s >")
+    assert "1-3" in reply
+    assert await run(storage, "XREADGROUP GROUP g bob STREAMS s >") == "(nil)"
+    assert await run(storage, "XPENDING s g") == "\n".join(
+        ["1) (integer) 2", "2) 1-1", "3) 1-2", "4) 1) 1) alice", "      2) 2"]
+    )
+
+    assert await run(storage, "XACK s g 1-1 1-3 9-9") == "(integer) 1"
+    history = await run(storage, "XREADGROUP GROUP g alice STREAMS s 0")
+    assert "1-2" in history and "1-1" not in history
+    assert (await run(storage, "XPENDING s g - + 10 alice")).endswith("(integer) 2")
+    assert await run(storage, "XREADGROUP GROUP nope alice STREAMS s >") == (
+        "NOGROUP No such key 's' or consumer group 'nope' in XREADGROUP with GROUP "
+        "option"
+    )
+    assert await run(storage, "XGROUP DELCONSUMER s g alice") == "(integer) 1"
+    assert await run(storage, "XPENDING s g") == "\n".join(
+        ["1) (integer) 0", "2) (nil)", "3) (nil)", "4) (nil)"]
+    )
+    assert await run(storage, "XGROUP DESTROY s g") == "(integer) 1"
+    assert await run(storage, "XGROUP DESTROY s g") == "(integer) 0"
+
+
+# Test a blocked XREADGROUP is woken by XADD and records the entry as pending
+@pytest.mark.asyncio
+async def test_xreadgroup_blocking(storage):
+    await run(storage, "XGROUP CREATE s g $ MKSTREAM")
+    blocked = asyncio.create_task(
+        run(storage, "XREADGROUP GROUP g alice BLOCK 1000 STREAMS s >")
+    )
+    await asyncio.sleep(0.01)
+    await run(storage, "XADD s 1-1 a 1")
+    assert "1-1" in await asyncio.wait_for(blocked, 1)
+    assert (await run(storage, "XPENDING s g")).startswith("1) (integer) 1")
+
+    # Destroying the group wakes up its blocked consumers with an error
+    blocked = asyncio.create_task(
+        run(storage, "XREADGROUP GROUP g alice BLOCK 0 STREAMS s >")
+    )
+    await asyncio.sleep(0.01)
+    await run(storage, "XGROUP DESTROY s g")
+    assert (await asyncio.wait_for(blocked, 1)).startswith("NOGROUP")
+
+    # So do deleting the stream and flushing its database
+    for command in ["DEL s", "FLUSHDB"]:
+        await run(storage, "XGROUP CREATE s g $ MKSTREAM")
+        blocked = asyncio.create_task(
+            run(storage, "XREADGROUP GROUP g alice BLOCK 0 STREAMS s >")
+        )
+        await asyncio.sleep(0.01)
+        await run(storage, command)
+        assert (await asyncio.wait_for(blocked, 1)).startswith("NOGROUP")
+    assert storage.waiters == {}
+
+
+# Test a client blocked on a database swapped away is woken by XADD to its new one
+@pytest.mark.asyncio
+async def test_xread_blocking_swapdb():
+    session = ClientSession([Storage(), Storage()])
+    blocked = asyncio.create_task(
+        process_command("XREAD BLOCK 1000 STREAMS s $", session.storage, session)
+    )
+    await asyncio.sleep(0.01)
+    assert await process_command("SWAPDB 0 1", session.storage, session) == "OK"
+    await process_command("XADD s 1-1 f v", session.storage, session)
+    assert "1-1" in await asyncio.wait_for(blocked, 1)
+    assert all(database.waiters == {} for database in session.databases)
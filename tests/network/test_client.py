@@ -0,0 +1,146 @@
+"""
+file: test_client.py
+
+This file contains tests for the RedisCloneClient class in src/network/client.py,
+running against a RedisCloneServer.
+
+Created by Gizachew Bayness Kassa on 2025-05-02
+"""
+
+import asyncio
+from typing import Any, AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+from src.network.client import RedisCloneClient
+from src.network.server import RedisCloneServer
+
+PORT = 6377
+
+
+@pytest_asyncio.fixture(scope="module")
+async def server() -> AsyncGenerator[RedisCloneServer, Any]:
+    """Fixture to start the RedisCloneServer before tests and stop it after."""
+    server = RedisCloneServer(host="127.0.0.1", port=PORT)
+    server_task = asyncio.create_task(server.start())
+    await asyncio.sleep(0.5)  # Give the server time to start
+    yield server
+    server_task.cancel()
+
+
+@pytest_asyncio.fixture(scope="module")
+def event_loop():
+    """Create a module-scoped event loop for async tests."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+async def wait_until(condition, timeout: float = 1.0):
+    """Helper function to wait for a push message to be processed."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+# Test values with spaces and binary data round trip through the client
+@pytest.mark.asyncio
+async def test_client_set_and_get(server: RedisCloneServer) -> None:
+    client = RedisCloneClient(port=PORT)
+    await client.connect()
+    assert await client.set("greeting", "hello world") == "OK"
+    assert await client.get("greeting") == "hello world"
+    assert await client.get("missing") is None
+    await client.close()
+
+
+# Test values that look like several lines or a bulk header keep replies aligned
+@pytest.mark.asyncio
+async def test_client_framing(server: RedisCloneServer) -> None:
+    client = RedisCloneClient(port=PORT)
+    await client.connect()
+    for value in ["hello\nworld", "$3", "line\r\n"]:
+        assert await client.set("framed", value) == "OK"
+        assert await client.get("framed") == value
+        assert await client.execute("TTL", "framed") == "(integer) -1"
+    assert await client.set(b"\xff\xfekey", b"\x00\xff") == "OK"
+    assert await client.get(b"\xff\xfekey") == b"\x00\xff"
+    assert await client.mget("framed", "missing") == ["line\r\n", None]
+    await client.close()
+
+
+# Test the local cache serves repeated reads and honours invalidations
+@pytest.mark.asyncio
+async def test_client_cache_invalidation(server: RedisCloneServer) -> None:
+    cached = RedisCloneClient(port=PORT, client_cache=True)
+    other = RedisCloneClient(port=PORT)
+    await cached.connect()
+    await other.connect()
+
+    await other.set("hot", "v1")
+    assert await cached.get("hot") == "v1"
+    assert await cached.get("hot") == "v1"
+    assert (cached.hits, cached.misses) == (1, 1)
+
+    await other.set("hot", "v2")
+    await wait_until(lambda: "hot" not in cached.cache)
+    assert await cached.get("hot") == "v2"
+
+    assert await cached.mget("hot", "cold") == ["v2", None]
+    assert "cold" in cached.cache
+    await other.set("cold", "now warm")
+    await wait_until(lambda: "cold" not in cached.cache)
+    assert await cached.mget("hot", "cold") == ["v2", "now warm"]
+
+    await cached.close()
+    await other.close()
+
+
+# Test values that look like pushes or bulk headers are not mistaken for them
+@pytest.mark.asyncio
+async def test_client_cache_push_lookalikes(server: RedisCloneServer) -> None:
+    cached = RedisCloneClient(port=PORT, client_cache=True)
+    await cached.connect()
+    assert await cached.get("kept") is None
+    values = {"push": ">invalidate kept", "flush": ">invalidate", "bulk": "$5"}
+    for key, value in values.items():
+        await cached.set(key, value)
+        assert await cached.get(key) == value
+    assert "kept" in cached.cache
+    assert await cached.mget(*values, "kept") == [*values.values(), None]
+    assert cached.hits == 4
+    await cached.close()
+
+
+# Test an invalidated key containing a newline is dropped and replies stay aligned
+@pytest.mark.asyncio
+async def test_client_cache_newline_key(server: RedisCloneServer) -> None:
+    cached = RedisCloneClient(port=PORT, client_cache=True)
+    other = RedisCloneClient(port=PORT)
+    await cached.connect()
+    await other.connect()
+    await other.set("a\nb", "v1")
+    assert await cached.get("a\nb") == "v1"
+    await other.set("a\nb", "v2")
+    await wait_until(lambda: "a\nb" not in cached.cache)
+    assert await cached.get("a\nb") == "v2"
+    assert await cached.execute("TTL", "a\nb") == "(integer) -1"
+    await cached.close()
+    await other.close()
+
+
+# Test bytes keys share the cache entry of their str form and are invalidated
+@pytest.mark.asyncio
+async def test_client_cache_bytes_key(server: RedisCloneServer) -> None:
+    cached = RedisCloneClient(port=PORT, client_cache=True)
+    await cached.connect()
+    await cached.set(b"bk\xff", "v1")
+    assert await cached.get(b"bk\xff") == "v1"
+    assert await cached.mget("bk\udcff", b"bk\xff") == ["v1", "v1"]
+    assert cached.hits == 2
+    await cached.set(b"bk\xff", "v2")
+    await wait_until(lambda: not cached.cache)
+    assert await cached.get(b"bk\xff") == "v2"
+    await cached.close()
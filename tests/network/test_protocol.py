@@ -0,0 +1,87 @@
+"""
+file: test_protocol.py
+
+This file contains tests for the RedisProtocol class in src/network/protocol.py.
+It feeds raw request bytes into a StreamReader and checks how they are framed.
+
+Created by Gizachew Bayness Kassa on 2025-04-22
+"""
+
+import asyncio
+
+import pytest
+
+from src.network.protocol import BULK_DECODE_LIMIT, ProtocolError, RedisProtocol
+
+
+def make_reader(data: bytes) -> asyncio.StreamReader:
+    """Helper function to build a StreamReader holding the given bytes."""
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+# Test that inline commands are split on spaces
+@pytest.mark.asyncio
+async def test_read_inline_command():
+    reader = make_reader(b"SET key value\n")
+    assert await RedisProtocol().read_command(reader) == ["SET", "key", "value"]
+
+
+# Test that multibulk commands may carry spaces and newlines in values
+@pytest.mark.asyncio
+async def test_read_multibulk_command():
+    reader = make_reader(b"*3\r\n$3\r\nSET\r\n$3\r\nkey\r\n$11\r\nhello\nworld\r\n")
+    assert await RedisProtocol().read_command(reader) == ["SET", "key", "hello\nworld"]
+
+
+# Test that large bulk values are kept as a single bytearray
+@pytest.mark.asyncio
+async def test_read_large_bulk_value():
+    value = b"x" * (BULK_DECODE_LIMIT * 4 + 3)
+    data = b"".join(RedisProtocol.encode_command("SET", "key", value))
+    args = await RedisProtocol().read_command(make_reader(data))
+    assert args[:2] == ["SET", "key"]
+    assert isinstance(args[2], bytearray)
+    assert args[2] == value
+
+
+# Test that small binary values are decoded to str and encode back to the same bytes
+@pytest.mark.asyncio
+async def test_read_binary_bulk_value():
+    value = b"\xff\x00\xfe"
+    data = b"".join(RedisProtocol.encode_command("SET", value, "x"))
+    args = await RedisProtocol().read_command(make_reader(data))
+    assert isinstance(args[1], str)
+    assert b"".join(RedisProtocol.encode_response(args[1])) == b"$3\n" + value + b"\n"
+    assert b"".join(RedisProtocol.encode_command(args[1]))[-5:] == value + b"\r\n"
+
+
+# Test that bulk values above proto_max_bulk_len are rejected
+@pytest.mark.asyncio
+async def test_read_bulk_too_large():
+    data = b"".join(RedisProtocol.encode_command("SET", "key", "0123456789"))
+    with pytest.raises(ProtocolError):
+        await RedisProtocol(proto_max_bulk_len=5).read_command(make_reader(data))
+
+
+# Test that a closed connection returns None
+@pytest.mark.asyncio
+async def test_read_eof():
+    assert await RedisProtocol().read_command(make_reader(b"")) is None
+    assert (
+        await RedisProtocol().read_command(make_reader(b"*2\r\n$3\r\nGET\r\n")) is None
+    )
+
+
+# Test that bytes-like replies and replies the line framing cannot carry are encoded
+# as bulk strings
+def test_encode_response():
+    assert RedisProtocol.encode_response("OK") == [b"OK\n"]
+    encoded = RedisProtocol.encode_response(bytearray(b"abc"))
+    assert b"".join(encoded) == b"$3\nabc\n"
+    encoded = RedisProtocol.encode_response("h\u00e9llo\nworld")
+    assert b"".join(encoded) == b"$12\nh\xc3\xa9llo\nworld\n"
+    assert b"".join(RedisProtocol.encode_response("$3")) == b"$2\n$3\n"
+    assert b"".join(RedisProtocol.encode_response(">x")) == b"$2\n>x\n"
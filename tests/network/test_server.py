@@ -14,6 +14,7 @@ from typing import Any, AsyncGenerator
 import pytest
 import pytest_asyncio
 
+from src.network.protocol import RedisProtocol
 from src.network.server import RedisCloneServer
 
 
@@ -186,3 +187,72 @@ async def test_expire_valid_key_ttl(server: RedisCloneServer) -> None:
     await send_message("SET mykey myvalue")
     response = await send_message("EXPIRE mykey 10")
     assert response == "(integer) 1"
+
+
+# Test that multi-megabyte values can be stored and read back as bulk strings
+@pytest.mark.asyncio
+async def test_set_and_get_large_value(server: RedisCloneServer) -> None:
+    value = bytes(range(256)) * (4 * 1024 * 16)  # 4 MiB of binary data
+    reader, writer = await asyncio.open_connection("127.0.0.1", 6378)
+    writer.writelines(RedisProtocol.encode_command("SET", "bigkey", value))
+    await writer.drain()
+    assert (await reader.readline()).decode().strip() == "OK"
+
+    writer.writelines(RedisProtocol.encode_command("GET", "bigkey"))
+    await writer.drain()
+    header = await reader.readline()
+    assert header == f"${len(value)}\n".encode()
+    assert await reader.readexactly(len(value) + 1) == value + b"\n"
+    writer.close()
+    await writer.wait_closed()
+
+
+# Test that SELECT only affects the connection that issued it
+@pytest.mark.asyncio
+async def test_select_is_per_connection(server: RedisCloneServer) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", 6378)
+    for command, expected in [
+        ("SELECT 5", "OK"),
+        ("SET dbkey five", "OK"),
+        ("GET dbkey", "five"),
+    ]:
+        writer.write((command + "\n").encode())
+        await writer.drain()
+        assert (await reader.readline()).decode().strip() == expected
+    writer.close()
+    await writer.wait_closed()
+
+    assert await send_message("GET dbkey") == "(nil)"
+
+
+# Test that a client disconnecting while blocked stops waiting on its keys
+@pytest.mark.asyncio
+async def test_blocked_client_disconnect(server: RedisCloneServer) -> None:
+    storage = server.databases[0]
+    reader, writer = await asyncio.open_connection("127.0.0.1", 6378)
+    writer.write(b"XREAD BLOCK 0 STREAMS blocked $\n")
+    await writer.drain()
+    for _ in range(100):
+        if "blocked" in storage.waiters:
+            break
+        await asyncio.sleep(0.01)
+    assert "blocked" in storage.waiters
+    writer.close()
+    await writer.wait_closed()
+    for _ in range(100):
+        if "blocked" not in storage.waiters:
+            break
+        await asyncio.sleep(0.01)
+    assert "blocked" not in storage.waiters
+
+
+# Test that a command pipelined behind a blocking one is answered after it
+@pytest.mark.asyncio
+async def test_pipelined_after_blocking_command(server: RedisCloneServer) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", 6378)
+    writer.write(b"XREAD BLOCK 50 STREAMS piped $\nSET piped value\n")
+    await writer.drain()
+    assert (await reader.readline()).decode().strip() == "(nil)"
+    assert (await reader.readline()).decode().strip() == "OK"
+    writer.close()
+    await writer.wait_closed()
@@ -0,0 +1,154 @@
+"""
+file: test_tracking.py
+
+This file contains tests for the TrackingTable class in src/network/tracking.py and the
+CLIENT command that configures it.
+
+Created by Gizachew Bayness Kassa on 2025-05-02
+"""
+
+import pytest
+
+from src.commands.command_processor import process_command
+from src.data.storage import Storage
+from src.network.client_handler import ClientSession
+from src.network.tracking import TrackingTable
+
+
+class RecordingWriter:
+    """A stand-in for StreamWriter that records the push messages it is sent, with
+    their length-prefixed key joined back onto the message line."""
+
+    def __init__(self):
+        self.messages = []
+        self.data = []  # The raw bytes of each push message
+
+    def write(self, data: bytes):
+        self.data.append(data)
+        message, _, key = data.decode().partition("\n")
+        if key:
+            message = f"{message.rsplit(' $', 1)[0]} {key[:-1]}"
+        self.messages.append(message)
+
+    def is_closing(self) -> bool:
+        return False
+
+
+@pytest.fixture
+def databases():
+    return [Storage(), Storage()]
+
+
+@pytest.fixture
+def tracking(databases):
+    return TrackingTable(databases, max_keys=3)
+
+
+def make_session(databases, tracking) -> ClientSession:
+    """Helper function to create a session that records its push messages."""
+    return ClientSession(databases, tracking, RecordingWriter())
+
+
+async def run(session: ClientSession, command: str) -> str:
+    """Helper function to run a command on behalf of a session."""
+    return await process_command(command, session.storage, session)
+
+
+# Test keys read with GET and MGET are invalidated when modified
+@pytest.mark.asyncio
+async def test_tracking_default_mode(databases, tracking):
+    reader = make_session(databases, tracking)
+    writer = make_session(databases, tracking)
+    assert await run(reader, "CLIENT TRACKING ON") == "OK"
+    await run(reader, "GET key1")
+    await run(reader, "MGET key2 key3")
+    await run(writer, "SET key1 value")
+    await run(writer, "SET key3 value")
+    await run(writer, "SET other value")
+    assert reader.writer.messages == [">invalidate key1", ">invalidate key3"]
+
+    # Invalidated keys are forgotten until they are read again
+    await run(writer, "DEL key1")
+    assert reader.writer.messages == [">invalidate key1", ">invalidate key3"]
+    assert writer.writer.messages == []
+
+
+# Test the tracking table is bounded and evicted keys are invalidated
+@pytest.mark.asyncio
+async def test_tracking_table_eviction(databases, tracking):
+    session = make_session(databases, tracking)
+    await run(session, "CLIENT TRACKING ON")
+    await run(session, "MGET a b c d")
+    assert list(tracking.keys) == ["b", "c", "d"]
+    assert session.writer.messages == [">invalidate a"]
+
+
+# Test BCAST mode notifies about every key matching a prefix
+@pytest.mark.asyncio
+async def test_tracking_bcast(databases, tracking):
+    session = make_session(databases, tracking)
+    result = await run(session, "CLIENT TRACKING ON BCAST PREFIX user: PREFIX cfg:")
+    assert result == "OK"
+    await run(session, "SET user:1 alice")
+    await run(session, "SET order:1 book")
+    await run(session, "EXPIRE cfg:x 10")  # Missing keys are not modified
+    await run(session, "SETBIT cfg:flags 3 1")
+    assert session.writer.messages == [">invalidate user:1", ">invalidate cfg:flags"]
+    assert tracking.keys == {}
+
+
+# Test OPTIN only tracks reads that follow CLIENT CACHING yes
+@pytest.mark.asyncio
+async def test_tracking_optin(databases, tracking):
+    session = make_session(databases, tracking)
+    await run(session, "CLIENT TRACKING ON OPTIN")
+    await run(session, "GET key1")
+    assert await run(session, "CLIENT CACHING yes") == "OK"
+    await run(session, "GET key2")
+    await run(session, "GET key3")
+    assert list(tracking.keys) == ["key2"]
+
+
+# Test FLUSHALL invalidates every key and disabling tracking detaches the table
+@pytest.mark.asyncio
+async def test_tracking_flush_and_off(databases, tracking):
+    session = make_session(databases, tracking)
+    await run(session, "CLIENT TRACKING ON")
+    assert databases[0].tracking is tracking
+    await run(session, "SET key1 value")
+    await run(session, "FLUSHALL")
+    assert session.writer.messages == [">invalidate"]
+    assert await run(session, "CLIENT TRACKING OFF") == "OK"
+    assert databases[0].tracking is None
+
+
+# Test invalid CLIENT TRACKING and CLIENT CACHING combinations
+@pytest.mark.asyncio
+async def test_tracking_invalid_options(databases, tracking):
+    session = make_session(databases, tracking)
+    result = await run(session, "CLIENT TRACKING ON PREFIX a")
+    assert result == "ERR PREFIX option requires BCAST mode to be enabled"
+    result = await run(session, "CLIENT TRACKING ON OPTIN OPTOUT")
+    assert result == "ERR You can't use both OPTIN and OPTOUT"
+    result = await run(session, "CLIENT CACHING yes")
+    assert result.startswith("ERR CLIENT CACHING can be called only")
+
+
+# Test DEBUG POPULATE invalidates the tracked keys it creates
+@pytest.mark.asyncio
+async def test_tracking_populate(databases, tracking):
+    session = make_session(databases, tracking)
+    assert await run(session, "CLIENT TRACKING ON") == "OK"
+    await run(session, "GET key:1")
+    assert await run(session, "DEBUG POPULATE 3") == "OK"
+    assert session.writer.messages == [">invalidate key:1"]
+
+
+# Test invalidated keys are length-prefixed so keys with newlines keep pushes framed
+@pytest.mark.asyncio
+async def test_tracking_newline_key(databases, tracking):
+    session = make_session(databases, tracking)
+    assert await run(session, "CLIENT TRACKING ON") == "OK"
+    await process_command(["GET", "a\nb"], session.storage, session)
+    await process_command(["SET", "a\nb", "v"], session.storage, session)
+    assert session.writer.data == [b">invalidate $3\na\nb\n"]